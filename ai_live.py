@@ -17,7 +17,7 @@ from chat import (
     analyze_with_text_input,
     clear_chat_history,
 )
-from azure_realtime import build_realtime_answer_instructions
+from azure_realtime import PREVIEW_DISCARD, build_realtime_answer_instructions
 from live_transcription import LiveAudioManager
 from overlay import DraggableOverlay, initialize_windows_ole, uninitialize_windows_ole
 
@@ -246,6 +246,14 @@ def initialize_live_audio():
                 flush=True,
             )
 
+    def answer_preview_callback(action, text):
+        if not overlay:
+            return
+        if action == PREVIEW_DISCARD:
+            _run_on_ui("clear_realtime_answer_preview")
+        else:
+            _run_on_ui("show_realtime_answer_preview", action, text)
+
     def session_reset_callback():
         _run_on_ui("clear_conversation_display", "Realtime session reconnected. Context was reset.")
         _run_on_ui("update_status", "Listening...", "#4CAF50")
@@ -263,6 +271,7 @@ def initialize_live_audio():
         session_reset_callback=session_reset_callback,
         status_callback=status_callback,
         instructions_provider=instructions_provider,
+        answer_preview_callback=answer_preview_callback,
     )
     result = audio_manager.start()
     if result:
@@ -0,0 +1,294 @@
+import sys
+import time
+import wave
+
+import numpy as np
+
+try:
+    import soundcard as sc
+except (ImportError, OSError):
+    # No usable audio backend, for example no PulseAudio on a headless box.
+    sc = None
+
+from azure_realtime import CHUNK_SIZE, SAMPLE_RATE
+
+
+def _synthetic_turn(rng, speech_samples, pause_samples, sample_rate):
+    t = np.arange(speech_samples) / sample_rate
+    pitch = rng.uniform(110, 220)
+    voiced = sum(np.sin(2 * np.pi * pitch * harmonic * t) / harmonic for harmonic in range(1, 5))
+    syllables = 0.55 + 0.45 * np.sin(2 * np.pi * rng.uniform(3.0, 5.0) * t) ** 2
+    speech = voiced * syllables * 6000 + rng.normal(0, 300, speech_samples)
+    pause = rng.normal(0, 40, pause_samples)
+    return np.clip(np.concatenate((speech, pause)), -32768, 32767).astype(np.int16).tobytes()
+
+
+def synthetic_speech(turns=10, speech_ms=1800, pause_ms=900, sample_rate=SAMPLE_RATE, seed=7):
+    """Generate speech-like PCM16: syllable-modulated harmonics separated by quiet pauses."""
+    rng = np.random.default_rng(seed)
+    speech_samples = int(sample_rate * speech_ms / 1000)
+    pause_samples = int(sample_rate * pause_ms / 1000)
+    return b"".join(_synthetic_turn(rng, speech_samples, pause_samples, sample_rate) for _ in range(turns))
+
+
+class PCM16Downmixer:
+    """Average interleaved PCM16 channels into mono PCM16 through reused int32 buffers that cannot wrap."""
+
+    def __init__(self, channels=2, frames=CHUNK_SIZE):
+        self.channels = max(1, int(channels))
+        self._allocate(frames)
+
+    def _allocate(self, frames):
+        self._wide = np.empty(frames, dtype=np.int32)
+        self._lane = np.empty(frames, dtype=np.int32)
+        self._pcm = np.empty(frames, dtype=np.int16)
+
+    def process(self, pcm_bytes):
+        if self.channels == 1:
+            return bytes(pcm_bytes)
+        interleaved = np.frombuffer(pcm_bytes, dtype=np.int16)
+        frames = len(interleaved) // self.channels
+        if frames > len(self._wide):
+            self._allocate(frames)
+        wide = self._wide[:frames]
+        lane = self._lane[:frames]
+        pcm = self._pcm[:frames]
+        by_channel = interleaved[: frames * self.channels].reshape(frames, self.channels)
+        np.copyto(wide, by_channel[:, 0])
+        for channel in range(1, self.channels):
+            np.copyto(lane, by_channel[:, channel])
+            np.add(wide, lane, out=wide)
+        np.floor_divide(wide, self.channels, out=wide)
+        np.copyto(pcm, wide, casting="unsafe")
+        return pcm.tobytes()
+
+
+class PCM16Converter:
+    """Downmix, clip and scale float capture frames into mono PCM16 through reused buffers."""
+
+    def __init__(self, channels=1, frames=CHUNK_SIZE):
+        self._set_channels(channels)
+        self._mono = np.empty(frames, dtype=np.float32)
+        self._pcm = np.empty(frames, dtype=np.int16)
+
+    def _set_channels(self, channels):
+        self.channels = max(1, int(channels))
+        self._downmix = np.full(self.channels, 1.0 / self.channels, dtype=np.float32)
+
+    def convert(self, audio_data):
+        audio_data = np.asarray(audio_data, dtype=np.float32)
+        frames = len(audio_data)
+        if frames > len(self._mono):
+            self._mono = np.empty(frames, dtype=np.float32)
+            self._pcm = np.empty(frames, dtype=np.int16)
+        mono = self._mono[:frames]
+        pcm = self._pcm[:frames]
+        if audio_data.ndim > 1 and audio_data.shape[1] > 1:
+            if audio_data.shape[1] != self.channels:
+                self._set_channels(audio_data.shape[1])
+            np.matmul(audio_data, self._downmix, out=mono)
+            np.clip(mono, -1.0, 1.0, out=mono)
+        else:
+            np.clip(audio_data.reshape(frames), -1.0, 1.0, out=mono)
+        np.multiply(mono, 32767, out=mono)
+        np.copyto(pcm, mono, casting="unsafe")
+        return pcm.tobytes()
+
+
+class AudioSource:
+    """A stream of mono PCM16 blocks for ``LiveAudioManager``.
+
+    ``read`` returns the next block or ``None`` at the end; ``realtime`` paces sources that can outrun a live capture.
+    """
+
+    name = "audio source"
+
+    def __init__(self, sample_rate=SAMPLE_RATE, block_frames=CHUNK_SIZE, realtime=True):
+        self.sample_rate = sample_rate
+        self.block_frames = block_frames
+        self.realtime = bool(realtime)
+        self.frames_read = 0
+        self._started_at = None
+
+    def open(self):
+        pass
+
+    def read(self):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def _pace(self, frames):
+        self.frames_read += frames
+        if not self.realtime:
+            return
+        now = time.perf_counter()
+        if self._started_at is None:
+            self._started_at = now - (self.frames_read - frames) / self.sample_rate
+        delay = self._started_at + self.frames_read / self.sample_rate - now
+        if delay > 0:
+            time.sleep(delay)
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, *_exc_info):
+        self.close()
+
+
+class FileAudioSource(AudioSource):
+    """Play a 16-bit WAV file, or raw mono PCM16 at ``sample_rate``, as captured audio, optionally on a ``loop``."""
+
+    def __init__(self, path, loop=False, **options):
+        super().__init__(**options)
+        self.path = str(path)
+        self.loop = bool(loop)
+        self.name = f"file {self.path}"
+        self._wav = None
+        self._raw = None
+        self._downmixer = None
+
+    def open(self):
+        if self.path.lower().endswith(".wav"):
+            self._wav = wave.open(self.path, "rb")
+            if self._wav.getsampwidth() != 2:
+                self.close()
+                raise ValueError(f"{self.path} must contain 16-bit PCM")
+            if self._wav.getframerate() != self.sample_rate:
+                self.close()
+                raise ValueError(f"{self.path} must be recorded at {self.sample_rate} Hz")
+            self._downmixer = PCM16Downmixer(self._wav.getnchannels(), self.block_frames)
+        else:
+            self._raw = open(self.path, "rb")
+
+    def _read_frames(self):
+        if self._wav is not None:
+            return self._downmixer.process(self._wav.readframes(self.block_frames))
+        data = self._raw.read(self.block_frames * 2)
+        return data[: len(data) - len(data) % 2]
+
+    def read(self):
+        block = self._read_frames()
+        if not block and self.loop:
+            if self._wav is not None:
+                self._wav.rewind()
+            else:
+                self._raw.seek(0)
+            block = self._read_frames()
+        if not block:
+            return None
+        self._pace(len(block) // 2)
+        return block
+
+    def close(self):
+        if self._wav is not None:
+            self._wav.close()
+            self._wav = None
+        if self._raw is not None:
+            self._raw.close()
+            self._raw = None
+
+
+class PipeAudioSource(AudioSource):
+    """Read raw mono PCM16 at ``sample_rate`` from stdin (``"-"``) or a named pipe, paced by the writer."""
+
+    def __init__(self, path="-", realtime=False, **options):
+        super().__init__(realtime=realtime, **options)
+        self.path = str(path)
+        self.name = "stdin" if self.path == "-" else f"pipe {self.path}"
+        self._stream = None
+        self._block = bytearray(self.block_frames * 2)
+
+    def open(self):
+        self._stream = sys.stdin.buffer if self.path == "-" else open(self.path, "rb")
+
+    def read(self):
+        view = memoryview(self._block)
+        filled = 0
+        while filled < len(view):
+            count = self._stream.readinto(view[filled:])
+            if not count:
+                break
+            filled += count
+        filled -= filled % 2
+        if not filled:
+            return None
+        self._pace(filled // 2)
+        return bytes(view[:filled])
+
+    def close(self):
+        if self._stream is not None and self.path != "-":
+            self._stream.close()
+        self._stream = None
+
+
+class SyntheticAudioSource(AudioSource):
+    """Generate the ``synthetic_speech`` signal as turns separated by pauses, endlessly unless ``turns`` is set."""
+
+    name = "synthetic speech"
+
+    def __init__(self, turns=None, speech_ms=1800, pause_ms=900, seed=7, **options):
+        super().__init__(**options)
+        self.turns = turns
+        self.speech_samples = int(self.sample_rate * speech_ms / 1000)
+        self.pause_samples = int(self.sample_rate * pause_ms / 1000)
+        self.seed = seed
+        self._rng = None
+        self._turn = b""
+        self._offset = 0
+        self._generated_turns = 0
+
+    def open(self):
+        self._rng = np.random.default_rng(self.seed)
+
+    def read(self):
+        block_bytes = self.block_frames * 2
+        parts = []
+        needed = block_bytes
+        while needed:
+            if self._offset >= len(self._turn):
+                if self.turns is not None and self._generated_turns >= self.turns:
+                    break
+                self._turn = _synthetic_turn(self._rng, self.speech_samples, self.pause_samples, self.sample_rate)
+                self._offset = 0
+                self._generated_turns += 1
+            part = self._turn[self._offset : self._offset + needed]
+            self._offset += len(part)
+            needed -= len(part)
+            parts.append(part)
+        block = b"".join(parts)
+        if not block:
+            return None
+        self._pace(len(block) // 2)
+        return block
+
+
+class MonitorAudioSource(AudioSource):
+    """Capture what the speakers play through a PulseAudio or PipeWire monitor of ``device``, or of the default sink."""
+
+    def __init__(self, device=None, **options):
+        super().__init__(realtime=False, **options)
+        self.device = device
+        self.name = f"monitor {device or 'of the default output'}"
+        self._recorder = None
+        self._converter = PCM16Converter(1, self.block_frames)
+
+    def open(self):
+        if sc is None:
+            raise RuntimeError("soundcard could not load an audio backend; is PulseAudio or PipeWire running?")
+        microphone = sc.get_microphone(self.device or sc.default_speaker().name, include_loopback=True)
+        self._recorder = microphone.recorder(samplerate=self.sample_rate, channels=1, blocksize=self.block_frames)
+        self._recorder.__enter__()
+        self.name = f"monitor {microphone.name}"
+
+    def read(self):
+        block = self._converter.convert(self._recorder.record(self.block_frames))
+        self._pace(self.block_frames)
+        return block
+
+    def close(self):
+        if self._recorder is not None:
+            self._recorder.__exit__(None, None, None)
+            self._recorder = None
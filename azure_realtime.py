@@ -1,7 +1,13 @@
 import asyncio
-import base64
+import binascii
+import collections
+import hashlib
 import json
+import math
 import os
+import random
+import re
+import socket
 import sys
 import threading
 import time
@@ -12,6 +18,16 @@ import websockets
 
 from env_loader import load_env_file
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 
 load_env_file()
 
@@ -50,14 +66,14 @@ def configure_console_encoding():
                 pass
 
 
-def parse_int_env(name, default):
+def parse_int_env(name, default, minimum=1):
     value = os.getenv(name)
     if value is None or value == "":
         return default
     try:
         parsed = int(value)
-        if parsed <= 0:
-            raise ValueError("must be positive")
+        if parsed < minimum:
+            raise ValueError(f"must be at least {minimum}")
         return parsed
     except ValueError:
         print(
@@ -84,6 +100,13 @@ def parse_float_env(name, default):
         return default
 
 
+def parse_bool_env(name, default=False):
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    return value.strip().lower() in {"1", "true", "yes", "on"}
+
+
 configure_console_encoding()
 
 SAMPLE_RATE = parse_int_env("SAMPLE_RATE", 24000)
@@ -100,12 +123,46 @@ CHUNK_SIZE = parse_int_env("CHUNK_SIZE", 1024)
 VAD_SILENCE_MS = parse_int_env("AZURE_OPENAI_VAD_SILENCE_MS", 350)
 VAD_PREFIX_PADDING_MS = parse_int_env("AZURE_OPENAI_VAD_PREFIX_PADDING_MS", 300)
 VAD_THRESHOLD = parse_float_env("AZURE_OPENAI_VAD_THRESHOLD", 0.5)
-LATENCY_LOG_ENABLED = os.getenv("AUTO_ANSWER_LATENCY_LOG", "false").strip().lower() in {
-    "1",
-    "true",
-    "yes",
-    "on",
-}
+AUDIO_COALESCE_MAX_MS = parse_int_env("AZURE_OPENAI_AUDIO_COALESCE_MAX_MS", 500)
+AUDIO_COALESCE_MAX_BYTES = parse_int_env("AZURE_OPENAI_AUDIO_COALESCE_MAX_BYTES", 0, minimum=0)
+AUDIO_BACKLOG_MAX_MS = parse_int_env("AZURE_OPENAI_AUDIO_BACKLOG_MAX_MS", 2000)
+AUDIO_RING_ENABLED = parse_bool_env("AZURE_OPENAI_AUDIO_RING", True)
+AUDIO_WAKE_WATERMARK_MS = parse_int_env("AZURE_OPENAI_AUDIO_WAKE_WATERMARK_MS", 40)
+AUDIO_WAKE_MAX_MS = parse_int_env("AZURE_OPENAI_AUDIO_WAKE_MAX_MS", 50)
+AUDIO_RING_IDLE_MS = 500
+EVENT_LOOP = os.getenv("AZURE_OPENAI_EVENT_LOOP", "").strip().lower() or "auto"
+PRIORITY_CONTROL_ENABLED = parse_bool_env("AZURE_OPENAI_PRIORITY_CONTROL", True)
+SEND_LOWAT_BYTES = parse_int_env("AZURE_OPENAI_SEND_LOWAT_BYTES", 8192, minimum=0)
+SPECULATIVE_RESPONSE_ENABLED = parse_bool_env("AZURE_OPENAI_SPECULATIVE_RESPONSE")
+SPECULATIVE_SILENCE_MS = parse_int_env("AZURE_OPENAI_SPECULATIVE_SILENCE_MS", 150)
+# Sent audio kept for an out-of-band speculative response: a lookback while
+# the server reports no speech, and a hard cap for turns that never stop.
+SPECULATIVE_LOOKBACK_MS = 2000
+SPECULATIVE_AUDIO_MAX_MS = 60000
+RECONNECT_BASE_MS = parse_int_env("AZURE_OPENAI_RECONNECT_BASE_MS", 250)
+RECONNECT_MAX_MS = parse_int_env("AZURE_OPENAI_RECONNECT_MAX_MS", 10000)
+STANDBY_CONNECTION_ENABLED = parse_bool_env("AZURE_OPENAI_STANDBY_CONNECTION")
+REHYDRATE_MAX_TOKENS = parse_int_env("AZURE_OPENAI_REHYDRATE_MAX_TOKENS", 2000)
+REHYDRATE_ITEM_OVERHEAD_TOKENS = 16
+CONTEXT_PRUNING_ENABLED = parse_bool_env("AZURE_OPENAI_CONTEXT_PRUNING", True)
+CONTEXT_AUDIO_TURNS = parse_int_env("AZURE_OPENAI_CONTEXT_AUDIO_TURNS", 3)
+CONTEXT_HISTORY_MAX_TOKENS = parse_int_env("AZURE_OPENAI_CONTEXT_HISTORY_MAX_TOKENS", 2000)
+TURN_STATE_RETENTION = 32
+PREVIEW_DISCARD = "discard"
+HEDGE_TURN_WINDOW_MS = parse_int_env("AZURE_OPENAI_HEDGE_TURN_WINDOW_MS", 750)
+LATENCY_LOG_ENABLED = parse_bool_env("AUTO_ANSWER_LATENCY_LOG")
+LATENCY_SPANS_ENABLED = parse_bool_env("AUTO_ANSWER_LATENCY_SPANS", True)
+LATENCY_SPAN_WINDOW = 256
+SPAN_STAGES = (
+    "audio_enqueued",
+    "audio_sent",
+    "speech_stopped",
+    "response_requested",
+    "response_created",
+    "first_delta",
+    "arguments_done",
+    "ui_applied",
+)
 
 
 def timestamp():
@@ -124,6 +181,72 @@ def latency_log(event, start_at=None, **fields):
     print(f"{timestamp()} latency realtime_answer.{event}{elapsed}{details}", flush=True)
 
 
+def percentile(values, fraction):
+    ordered = sorted(values)
+    if not ordered:
+        return math.nan
+    position = (len(ordered) - 1) * fraction
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    if lower == upper:
+        return ordered[lower]
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+class LatencyHistograms:
+    """Rolling p50/p95/p99 of the time between consecutive turn stages, folded in when a turn finishes."""
+
+    def __init__(self, window=LATENCY_SPAN_WINDOW):
+        self.window = window
+        self.turns = 0
+        self._samples = {}
+
+    def add(self, name, value_ms):
+        samples = self._samples.get(name)
+        if samples is None:
+            samples = self._samples[name] = collections.deque(maxlen=self.window)
+        samples.append(value_ms)
+
+    def record_turn(self, marks):
+        if not marks:
+            return
+        self.turns += 1
+        previous_stage = previous_at = None
+        for stage in SPAN_STAGES:
+            at = marks.get(stage)
+            if at is None:
+                continue
+            if previous_stage is not None:
+                self.add(f"{previous_stage}->{stage}", (at - previous_at) * 1000)
+            previous_stage, previous_at = stage, at
+        if "speech_stopped" in marks and "ui_applied" in marks:
+            self.add("speech_stopped->ui_applied", (marks["ui_applied"] - marks["speech_stopped"]) * 1000)
+
+    def summary(self):
+        def stage_order(name):
+            start, end = name.split("->")
+            return SPAN_STAGES.index(end) - SPAN_STAGES.index(start) > 1, SPAN_STAGES.index(end)
+
+        return {
+            name: {
+                "count": len(self._samples[name]),
+                "p50": percentile(self._samples[name], 0.50),
+                "p95": percentile(self._samples[name], 0.95),
+                "p99": percentile(self._samples[name], 0.99),
+            }
+            for name in sorted(self._samples, key=stage_order)
+        }
+
+    def format_report(self):
+        lines = [f"Realtime answer latency over {self.turns} turns (ms, last {self.window} per stage):"]
+        for name, stats in self.summary().items():
+            lines.append(
+                f"  {name:<40} n={stats['count']:<4} p50={stats['p50']:8.1f} "
+                f"p95={stats['p95']:8.1f} p99={stats['p99']:8.1f}"
+            )
+        return "\n".join(lines)
+
+
 def _required_env(name):
     value = os.getenv(name, "").strip()
     if not value:
@@ -140,6 +263,18 @@ def _realtime_url(deployment, endpoint=None):
     return f"wss://{host}/openai/v1/realtime?model={quote(deployment)}"
 
 
+def _coalesce_limit_bytes(sample_rate, max_ms, max_bytes):
+    limit = int(sample_rate * 2 * max_ms / 1000)
+    if max_bytes:
+        limit = min(limit, int(max_bytes))
+    return max(2, limit - limit % 2)
+
+
+def _config_fingerprint(config):
+    payload = json.dumps(config, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
 def _format_websocket_error(exc):
     response = getattr(exc, "response", None)
     if not response:
@@ -158,6 +293,25 @@ def _format_websocket_error(exc):
     return f"{exc}; status={status}; body={body}" if body else f"{exc}; status={status}"
 
 
+def hedge_session_options():
+    """URL, key, and deployment of the optional second Realtime deployment, or None."""
+    endpoint = os.getenv("AZURE_OPENAI_HEDGE_ENDPOINT", "").strip()
+    deployment = os.getenv("AZURE_OPENAI_HEDGE_DEPLOYMENT", "").strip()
+    if not endpoint and not deployment:
+        return None
+    deployment = deployment or os.getenv("AZURE_OPENAI_REALTIME_DEPLOYMENT", "").strip()
+    api_key = os.getenv("AZURE_OPENAI_HEDGE_API_KEY", "").strip() or os.getenv("AZURE_OPENAI_REALTIME_API_KEY", "").strip()
+    try:
+        url = _realtime_url(deployment, endpoint or None)
+    except RuntimeError as exc:
+        print(f"{timestamp()} Hedged Realtime deployment disabled: {exc}", flush=True)
+        return None
+    if not deployment or not api_key:
+        print(f"{timestamp()} Hedged Realtime deployment disabled: missing deployment or API key", flush=True)
+        return None
+    return {"url": url, "api_key": api_key, "deployment": deployment}
+
+
 async def _connect_websocket(url, api_key):
     headers = [("api-key", api_key)]
     try:
@@ -166,6 +320,93 @@ async def _connect_websocket(url, api_key):
         return await websockets.connect(url, extra_headers=headers, max_size=None)
 
 
+def _limit_unsent_bytes(websocket, limit):
+    option = getattr(socket, "TCP_NOTSENT_LOWAT", None)
+    transport = getattr(websocket, "transport", None)
+    sock = transport.get_extra_info("socket") if transport is not None else None
+    if option is None or sock is None:
+        return False
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, option, limit)
+    except OSError:
+        return False
+    # The kernel now holds at most ``limit`` unsent bytes, so drop the
+    # client-side write buffer too: every send waits for the transport to
+    # empty and little audio is ever committed ahead of a later control event.
+    transport.set_write_buffer_limits(0)
+    return True
+
+
+def reconnect_delay(attempt, base_ms=RECONNECT_BASE_MS, max_ms=RECONNECT_MAX_MS, rng=None):
+    """Full-jitter exponential backoff in seconds; attempt 0 reconnects immediately."""
+    if attempt <= 0:
+        return 0.0
+    ceiling_ms = min(max_ms, base_ms * 2 ** min(attempt - 1, 20))
+    return (rng or random.random)() * ceiling_ms / 1000
+
+
+def estimate_tokens(text):
+    return (len(text) + 3) // 4
+
+
+def resolve_event_loop(name=EVENT_LOOP):
+    """Return the loop implementation to run: ``"uvloop"`` when chosen and installed, else ``"asyncio"``."""
+    name = (name or "auto").strip().lower()
+    if name not in {"auto", "uvloop", "asyncio"}:
+        print(f"{timestamp()} Unknown event loop {name!r}; using asyncio", flush=True)
+        return "asyncio"
+    if name == "asyncio":
+        return "asyncio"
+    if uvloop is None:
+        if name == "uvloop":
+            print(f"{timestamp()} uvloop is not installed; using asyncio", flush=True)
+        return "asyncio"
+    return "uvloop"
+
+
+def new_event_loop(name=EVENT_LOOP):
+    if resolve_event_loop(name) == "uvloop":
+        return uvloop.new_event_loop()
+    return asyncio.new_event_loop()
+
+
+def decode_server_event(raw_message):
+    """Decode one server event with orjson when it is installed, else the stdlib parser."""
+    if orjson is not None:
+        return orjson.loads(raw_message)
+    return json.loads(raw_message)
+
+
+_EVENT_TYPE_PREFIX = re.compile(r'\{\s*"type"\s*:\s*"([^"\\]+)"')
+_EVENT_TYPE_PREFIX_BYTES = re.compile(rb'\{\s*"type"\s*:\s*"([^"\\]+)"')
+
+
+def sniff_event_type(raw_message):
+    """Return the event type when it leads the raw JSON object, without parsing the rest."""
+    if isinstance(raw_message, str):
+        if raw_message.startswith('{"type":"'):
+            end = raw_message.find('"', 9)
+            if end > 9 and raw_message.find("\\", 9, end) < 0:
+                return raw_message[9:end]
+        match = _EVENT_TYPE_PREFIX.match(raw_message)
+        return match.group(1) if match else None
+    match = _EVENT_TYPE_PREFIX_BYTES.match(raw_message)
+    return match.group(1).decode("ascii", "replace") if match else None
+
+
+def _websocket_open(websocket):
+    return getattr(websocket, "close_code", None) is None
+
+
+async def _close_websocket(websocket):
+    if websocket is None:
+        return
+    try:
+        await websocket.close()
+    except Exception:
+        pass
+
+
 def build_realtime_answer_instructions(resume_section=""):
     instructions = """
 You are a realtime interview answer assistant for a software engineering candidate.
@@ -231,6 +472,491 @@ def validate_answer_update(arguments):
     return action, text
 
 
+_JSON_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+_JSON_STRING_SPECIAL = re.compile(r'["\\]')
+_JSON_WHITESPACE = " \t\r\n"
+
+
+class AnswerPreviewParser:
+    """Incrementally extract action and text from streamed update_visible_answer arguments.
+
+    Anything but the tool's flat string object marks the parser failed, which only disables the preview.
+    """
+
+    def __init__(self):
+        self.action = None
+        self.text = ""
+        self.text_complete = False
+        self.failed = False
+        self._state = "start"
+        self._key = None
+        self._string_parts = []
+        self._string_is_key = False
+        self._escape = None
+        self._high_surrogate = None
+
+    def feed(self, delta):
+        """Consume one arguments delta; return True when action or text changed."""
+        if self.failed or self._state == "done":
+            return False
+        changed = False
+        index = 0
+        length = len(delta)
+        while index < length and not self.failed:
+            state = self._state
+            if state == "string":
+                index, piece_changed = self._feed_string(delta, index)
+                changed = changed or piece_changed
+                continue
+            char = delta[index]
+            index += 1
+            if char in _JSON_WHITESPACE:
+                continue
+            if state == "start":
+                self._expect(char == "{", "key")
+            elif state == "key":
+                if char == '"':
+                    self._start_string(is_key=True)
+                elif char == "}":
+                    self._state = "done"
+                elif char != ",":
+                    self.failed = True
+            elif state == "colon":
+                self._expect(char == ":", "value")
+            elif state == "value":
+                if char == '"':
+                    self._start_string(is_key=False)
+                elif char in "{[":
+                    self.failed = True
+                else:
+                    self._state = "scalar"
+            elif state == "scalar":
+                if char == ",":
+                    self._state = "key"
+                elif char == "}":
+                    self._state = "done"
+            elif state == "after_value":
+                if char == ",":
+                    self._state = "key"
+                elif char == "}":
+                    self._state = "done"
+                else:
+                    self.failed = True
+            else:
+                break
+        return changed and not self.failed
+
+    def _expect(self, matched, next_state):
+        if matched:
+            self._state = next_state
+        else:
+            self.failed = True
+
+    def _start_string(self, is_key):
+        self._state = "string"
+        self._string_is_key = is_key
+        self._string_parts = []
+
+    def _append_string(self, piece):
+        if self._high_surrogate is not None:
+            self._string_parts.append("\ufffd")
+            self._high_surrogate = None
+        if not piece:
+            return False
+        self._string_parts.append(piece)
+        if not self._string_is_key and self._key == "text":
+            self.text += piece
+            return True
+        return False
+
+    def _feed_string(self, delta, index):
+        changed = False
+        length = len(delta)
+        while index < length:
+            if self._escape is not None:
+                index, escaped = self._feed_escape(delta, index)
+                if escaped is not None:
+                    changed = self._append_string(escaped) or changed
+                if self.failed:
+                    return length, changed
+                continue
+            match = _JSON_STRING_SPECIAL.search(delta, index)
+            end = match.start() if match else length
+            if end > index:
+                changed = self._append_string(delta[index:end]) or changed
+            if match is None:
+                return length, changed
+            index = end + 1
+            if match.group() == "\\":
+                self._escape = ""
+                continue
+            changed = self._finish_string() or changed
+            return index, changed
+        return index, changed
+
+    def _feed_escape(self, delta, index):
+        char = delta[index]
+        if self._escape == "":
+            if char != "u":
+                self._escape = None
+                if char not in _JSON_ESCAPES:
+                    self.failed = True
+                    return index + 1, None
+                return index + 1, _JSON_ESCAPES[char]
+            self._escape = "u"
+            return index + 1, None
+        self._escape += char
+        if len(self._escape) < 5:
+            return index + 1, None
+        try:
+            code = int(self._escape[1:], 16)
+        except ValueError:
+            self.failed = True
+            return index + 1, None
+        self._escape = None
+        if 0xD800 <= code < 0xDC00:
+            self._high_surrogate = code
+            return index + 1, None
+        if 0xDC00 <= code < 0xE000 and self._high_surrogate is not None:
+            high, self._high_surrogate = self._high_surrogate, None
+            return index + 1, chr(0x10000 + ((high - 0xD800) << 10) + (code - 0xDC00))
+        return index + 1, chr(code)
+
+    def _finish_string(self):
+        value = "".join(self._string_parts)
+        self._string_parts = []
+        if self._string_is_key:
+            self._key = value
+            self._state = "colon"
+            return False
+        self._state = "after_value"
+        if self._key == "action":
+            self.action = value
+            return True
+        if self._key == "text":
+            self.text_complete = True
+            return True
+        return False
+
+
+class AudioAppendEncoder:
+    """Encode input_audio_buffer.append events into one reusable UTF-8 buffer.
+
+    The JSON envelope is written once; each chunk only replaces the base64 body
+    and closing suffix. The returned memoryview is valid until the next encode.
+    """
+
+    prefix = b'{"type":"input_audio_buffer.append","audio":"'
+    suffix = b'"}'
+
+    def __init__(self, audio_bytes=0):
+        self._buffer = bytearray()
+        self._view = memoryview(self._buffer)
+        self._reserve(audio_bytes)
+
+    @staticmethod
+    def encoded_size(audio_bytes):
+        return 4 * ((audio_bytes + 2) // 3)
+
+    def _reserve(self, audio_bytes):
+        size = len(self.prefix) + self.encoded_size(audio_bytes) + len(self.suffix)
+        if len(self._buffer) >= size:
+            return
+        self._buffer = bytearray(size)
+        self._buffer[: len(self.prefix)] = self.prefix
+        self._view = memoryview(self._buffer)
+
+    def encode(self, audio_chunk):
+        self._reserve(len(audio_chunk))
+        start = len(self.prefix)
+        end = start + self.encoded_size(len(audio_chunk))
+        self._buffer[start:end] = binascii.b2a_base64(audio_chunk, newline=False)
+        self._buffer[end : end + len(self.suffix)] = self.suffix
+        return self._view[: end + len(self.suffix)]
+
+
+class AudioRing:
+    """Preallocated single-producer, single-consumer ring of PCM bytes; the capture thread writes, the loop reads.
+
+    The writer wakes a parked reader only once ``watermark_bytes`` are unread; lapped audio is reported as dropped.
+    """
+
+    def __init__(self, capacity_bytes, watermark_bytes, max_wait_ms=AUDIO_WAKE_MAX_MS, loop=None):
+        self.capacity = max(2, int(capacity_bytes))
+        self.watermark_bytes = max(1, min(int(watermark_bytes), self.capacity))
+        self.max_wait_s = max_wait_ms / 1000
+        self.loop = loop or asyncio.get_running_loop()
+        self._buffer = bytearray(self.capacity)
+        self._view = memoryview(self._buffer)
+        self._written = 0
+        self._writing = 0
+        self._read = 0
+        self._last_write_at = -math.inf
+        self._ready = asyncio.Event()
+        self._parked = False
+        self._timed = False
+        self._expired = False
+        self._wake_scheduled = False
+        self.wakeups = 0
+        self.writer_wakeups = 0
+        self.timer_wakeups = 0
+
+    @property
+    def available(self):
+        return self._written - self._read
+
+    def write(self, audio_chunk):
+        """Copy ``audio_chunk`` into the ring. Called only from the capture thread."""
+        size = len(audio_chunk)
+        data = memoryview(audio_chunk)[max(0, size - self.capacity) :]
+        position = (self._written + size - len(data)) % self.capacity
+        first = min(len(data), self.capacity - position)
+        # Claim the bytes before copying so a concurrent read can tell what was overwritten.
+        self._writing = self._written + size
+        self._view[position : position + first] = data[:first]
+        if first < len(data):
+            self._view[: len(data) - first] = data[first:]
+        self._written = self._writing
+        self._last_write_at = time.perf_counter()
+        if self._parked and not self._wake_scheduled:
+            if not self._timed or self._written - self._read >= self.watermark_bytes:
+                self._wake_scheduled = True
+                self.writer_wakeups += 1
+                self.loop.call_soon_threadsafe(self._wake)
+
+    def _wake(self):
+        self._wake_scheduled = False
+        self._ready.set()
+
+    def _expire(self):
+        self._expired = True
+        self._ready.set()
+
+    def read(self):
+        """Return ``(audio, dropped_bytes)`` for everything unread. Called only on the loop."""
+        written = self._written
+        start = max(self._read, written - self.capacity)
+        position = start % self.capacity
+        end = position + written - start
+        if end <= self.capacity:
+            audio = self._buffer[position:end]
+        else:
+            audio = self._buffer[position:] + self._buffer[: end - self.capacity]
+        # The writer may have lapped the oldest bytes while they were copied.
+        overwritten = self._writing - self.capacity - start
+        if overwritten > 0:
+            del audio[:overwritten]
+            start += overwritten
+        dropped = start - self._read
+        self._read = written
+        return bytes(audio), dropped
+
+    async def wait(self):
+        """Return once ``watermark_bytes`` are unread, or when ``max_wait_ms`` passes with less than that."""
+        expired = False
+        while self.available < self.watermark_bytes and not (expired and self.available):
+            streaming = time.perf_counter() - self._last_write_at < AUDIO_RING_IDLE_MS / 1000
+            timer = self.loop.call_later(self.max_wait_s, self._expire) if streaming or self.available else None
+            self._ready.clear()
+            self._expired = False
+            self._timed = timer is not None
+            self._parked = True
+            # Re-check after parking: a write that landed before _parked was set did not wake us.
+            if self.available < self.watermark_bytes and (self._timed or not self.available):
+                await self._ready.wait()
+                self.wakeups += 1
+                if self._expired:
+                    self.timer_wakeups += 1
+            self._parked = False
+            if timer is not None:
+                timer.cancel()
+            expired = self._expired
+
+
+class AudioBacklog:
+    """Bounded audio queue keyed by audio time that evicts and counts the oldest audio first.
+
+    Used only on the session loop; with an ``AudioRing`` it collects the ring in ``chunk_bytes`` pieces on read.
+    """
+
+    def __init__(self, max_ms=AUDIO_BACKLOG_MAX_MS, sample_rate=SAMPLE_RATE, ring=None, chunk_bytes=CHUNK_SIZE * 2):
+        self.sample_rate = sample_rate
+        self.max_bytes = max(2, int(sample_rate * 2 * max_ms / 1000))
+        self.ring = ring
+        self.chunk_bytes = chunk_bytes
+        self._chunks = collections.deque()
+        self._queued_bytes = 0
+        self._next_offset = 0
+        self.taken_offset = 0
+        self._ready = asyncio.Event()
+        self.dropped_bytes = 0
+        self.dropped_chunks = 0
+        self._reported_dropped_bytes = 0
+
+    def _bytes_to_ms(self, byte_count):
+        return byte_count * 1000 / (self.sample_rate * 2)
+
+    @property
+    def backlog_ms(self):
+        unread = min(self.ring.available, self.ring.capacity) if self.ring is not None else 0
+        return self._bytes_to_ms(self._queued_bytes + unread)
+
+    @property
+    def dropped_ms(self):
+        return self._bytes_to_ms(self.dropped_bytes)
+
+    @property
+    def oldest_audio_ms(self):
+        if not self._chunks:
+            return None
+        return self._bytes_to_ms(self._chunks[0][0])
+
+    def qsize(self):
+        return len(self._chunks)
+
+    def end_offset(self):
+        """Byte offset just past the newest queued audio, counting audio still in the ring."""
+        return self._next_offset + (self.ring.available if self.ring is not None else 0)
+
+    def empty(self):
+        return not self._chunks and not (self.ring is not None and self.ring.available)
+
+    def _collect(self):
+        if self.ring is None or not self.ring.available:
+            return
+        audio, dropped = self.ring.read()
+        if dropped:
+            self.dropped_bytes += dropped
+            self.dropped_chunks += -(-dropped // self.chunk_bytes)
+            self._next_offset += dropped
+        for start in range(0, len(audio), self.chunk_bytes):
+            self.put_nowait(audio[start : start + self.chunk_bytes])
+
+    def put_nowait(self, audio_chunk):
+        self._chunks.append((self._next_offset, audio_chunk))
+        self._next_offset += len(audio_chunk)
+        self._queued_bytes += len(audio_chunk)
+        while self._queued_bytes > self.max_bytes and len(self._chunks) > 1:
+            _offset, evicted = self._chunks.popleft()
+            self._queued_bytes -= len(evicted)
+            self.dropped_bytes += len(evicted)
+            self.dropped_chunks += 1
+        self._ready.set()
+
+    async def put(self, audio_chunk):
+        self.put_nowait(audio_chunk)
+
+    def get_nowait(self):
+        if not self._chunks:
+            self._collect()
+        if not self._chunks:
+            raise asyncio.QueueEmpty
+        offset, audio_chunk = self._chunks.popleft()
+        self._queued_bytes -= len(audio_chunk)
+        self.taken_offset = offset + len(audio_chunk)
+        if not self._chunks:
+            self._ready.clear()
+        return audio_chunk
+
+    async def get(self):
+        while not self._chunks:
+            if self.ring is None:
+                await self._ready.wait()
+            else:
+                await self.ring.wait()
+                self._collect()
+        return self.get_nowait()
+
+    def task_done(self):
+        pass
+
+    def take_dropped_ms(self):
+        dropped = self.dropped_bytes - self._reported_dropped_bytes
+        self._reported_dropped_bytes = self.dropped_bytes
+        return self._bytes_to_ms(dropped)
+
+
+class TurnState:
+    """Protocol state for one answer turn and its in-flight response."""
+
+    __slots__ = (
+        "token",
+        "attempts",
+        "ignored",
+        "response_id",
+        "call_id",
+        "arguments",
+        "preview",
+        "preview_text",
+        "protocol_error",
+        "committed",
+        "out_of_band",
+        "marks",
+    )
+
+    def __init__(self, token):
+        self.token = token
+        self.attempts = 0
+        self.ignored = False
+        self.out_of_band = False
+        self.marks = {}
+        self.bind_response(None)
+
+    def bind_response(self, response_id):
+        self.response_id = response_id
+        self.start_call(None)
+        self.protocol_error = ""
+        self.committed = False
+
+    def start_call(self, call_id):
+        self.call_id = call_id
+        self.arguments = ""
+        self.preview = AnswerPreviewParser() if call_id is not None else None
+        self.preview_text = ""
+
+
+class ConversationItem:
+    """Server-side conversation item the session may later delete."""
+
+    __slots__ = ("item_id", "kind", "group", "tokens")
+
+    def __init__(self, item_id, kind, group, tokens=0):
+        self.item_id = item_id
+        self.kind = kind
+        self.group = group
+        self.tokens = tokens
+
+
+def conversation_item_from_event(item):
+    """Classify a Realtime conversation item as input audio or answer history."""
+    item_id = item.get("id")
+    if not item_id:
+        return None
+    item_type = item.get("type", "")
+    if item_type == "message" and item.get("role") == "user":
+        return ConversationItem(item_id, "audio", item_id)
+    if item_type in {"function_call", "function_call_output"}:
+        text = item.get("arguments") if item_type == "function_call" else item.get("output")
+        group = item.get("call_id") or item_id
+    else:
+        text = " ".join(
+            str(part.get("text") or part.get("transcript") or "")
+            for part in item.get("content") or []
+            if isinstance(part, dict)
+        )
+        group = item_id
+    return ConversationItem(item_id, "history", group, estimate_tokens(text or "") + REHYDRATE_ITEM_OVERHEAD_TOKENS)
+
+
+class SpeculativeTurn:
+    def __init__(self, turn_token, started_at):
+        self.turn_token = turn_token
+        self.started_at = started_at
+        self.held_update = None
+        self.held_done_event = None
+        self.timeout_handle = None
+
+
 class AzureRealtimeAnswerSession:
     def __init__(
         self,
@@ -240,45 +966,144 @@ class AzureRealtimeAnswerSession:
         instructions_provider=None,
         sample_rate=SAMPLE_RATE,
         chunk_size=CHUNK_SIZE,
+        url=None,
+        api_key=None,
+        deployment=None,
+        coalesce_max_ms=AUDIO_COALESCE_MAX_MS,
+        coalesce_max_bytes=AUDIO_COALESCE_MAX_BYTES,
+        backlog_max_ms=AUDIO_BACKLOG_MAX_MS,
+        audio_ring=AUDIO_RING_ENABLED,
+        wake_watermark_ms=AUDIO_WAKE_WATERMARK_MS,
+        wake_max_ms=AUDIO_WAKE_MAX_MS,
+        speculative_response=SPECULATIVE_RESPONSE_ENABLED,
+        standby_connection=STANDBY_CONNECTION_ENABLED,
+        reconnect_base_ms=RECONNECT_BASE_MS,
+        reconnect_max_ms=RECONNECT_MAX_MS,
+        rehydrate_max_tokens=REHYDRATE_MAX_TOKENS,
+        answer_preview_callback=None,
+        event_decoder=None,
+        latency_spans=LATENCY_SPANS_ENABLED,
+        answer_gate=None,
+        context_pruning=CONTEXT_PRUNING_ENABLED,
+        context_audio_turns=CONTEXT_AUDIO_TURNS,
+        context_history_max_tokens=CONTEXT_HISTORY_MAX_TOKENS,
+        priority_control=PRIORITY_CONTROL_ENABLED,
+        send_lowat_bytes=SEND_LOWAT_BYTES,
+        event_loop=EVENT_LOOP,
     ):
         self.answer_update_callback = answer_update_callback
+        self.answer_preview_callback = answer_preview_callback
+        self.answer_gate = answer_gate
+        self.event_decoder = event_decoder or decode_server_event
         self.session_reset_callback = session_reset_callback
         self.status_callback = status_callback
         self.instructions_provider = instructions_provider
         self.sample_rate = sample_rate
         self.chunk_size = chunk_size
+        self.backlog_max_ms = backlog_max_ms
+        self.audio_ring = bool(audio_ring)
+        self.wake_watermark_ms = wake_watermark_ms
+        self.wake_max_ms = wake_max_ms
+        self.speculative_response = bool(speculative_response)
+        self.standby_connection = bool(standby_connection)
+        self.reconnect_base_ms = reconnect_base_ms
+        self.reconnect_max_ms = reconnect_max_ms
+        self.rehydrate_max_tokens = rehydrate_max_tokens
+        self.latency_spans = bool(latency_spans)
+        self.context_pruning = bool(context_pruning)
+        self.context_audio_turns = context_audio_turns
+        self.context_history_max_tokens = context_history_max_tokens
+        self.priority_control = bool(priority_control)
+        self.send_lowat_bytes = send_lowat_bytes
+        self.event_loop = resolve_event_loop(event_loop)
 
         self.running = False
         self.auto_answer_enabled = False
         self.loop = None
         self.websocket = None
         self.audio_queue = None
+        self._audio_ring = None
+        self._handoff_calls = 0
         self.tasks = []
         self._thread = None
         self._send_lock = None
+        self._control_lock = None
+        self._control_idle = None
+        self._control_pending = 0
+        self._control_stats = collections.Counter()
+        self._control_wait_ms = collections.deque(maxlen=256)
         self._error_retries = 0
         self._connected_once = False
         self._intentional_reset = False
         self._last_audio_enqueue_at = None
+        self._audio_flushed_at = None
+        self._latency = LatencyHistograms()
+        self._session_fingerprint = None
+        self._applied_session = None
+        self._audio_encoder = AudioAppendEncoder(chunk_size * 2)
+        self._bytes_text_frames = None
+        self._append_max_bytes = _coalesce_limit_bytes(sample_rate, coalesce_max_ms, coalesce_max_bytes)
+        self._bounded_append_max_bytes = self._append_max_bytes
+        if self.priority_control and send_lowat_bytes:
+            # A control event can still wait behind one whole append, so keep
+            # a coalesced append within the send low-water mark once encoded.
+            self._bounded_append_max_bytes = _coalesce_limit_bytes(
+                sample_rate, coalesce_max_ms, min(coalesce_max_bytes or send_lowat_bytes, send_lowat_bytes * 3 // 4)
+            )
+        self.coalesce_max_bytes = self._append_max_bytes
+        self.send_bounded = False
+        self._coalesce_buffer = bytearray()
+        self._pending_audio = None
+        self._sent_audio_offset = 0
+        self._audio_barriers = collections.deque()
+        self._input_audio = bytearray()
+        self._audio_stats = collections.Counter()
+        self._chunks_per_send = collections.Counter()
 
         self._turn_counter = 0
         self._current_turn_token = None
         self._active_response_id = None
+        self._turns = collections.OrderedDict()
         self._response_turns = {}
-        self._ignored_turns = set()
-        self._call_arguments = {}
-        self._protocol_errors = {}
-        self._committed_responses = set()
-        self._retry_counts = {}
+        self._server_in_speech = False
+        self._speculation = None
+        self._speculation_stats = collections.Counter()
+        self._speculation_saved_ms = collections.deque(maxlen=256)
+        self._standby = None
+        self._standby_task = None
+        self._disconnected_at = None
+        self._connection_stats = collections.Counter()
+        self._recovery_ms = collections.deque(maxlen=256)
+        self._answer_log = []
+        self._adopted_answers = 0
+        self._preview_turn = None
+        self._event_stats = collections.Counter()
+        self._conversation = collections.OrderedDict()
+        self._context_stats = collections.Counter()
+        self._event_handlers = {
+            "input_audio_buffer.speech_started": self._handle_speech_started,
+            "input_audio_buffer.speech_stopped": self._handle_speech_stopped,
+            "response.created": self._handle_response_created,
+            "response.function_call_arguments.delta": self._handle_arguments_delta,
+            "response.function_call_arguments.done": self._handle_function_done,
+            "response.output_text.delta": self._handle_output_text,
+            "response.output_text.done": self._handle_output_text,
+            "response.done": self._handle_response_done,
+            "conversation.item.added": self._handle_item_added,
+            "conversation.item.created": self._handle_item_added,
+            "conversation.item.done": self._handle_item_added,
+            "conversation.item.deleted": self._handle_item_deleted,
+            "error": self._handle_error,
+        }
 
         try:
-            self.api_key = _required_env("AZURE_OPENAI_REALTIME_API_KEY")
-            self.realtime_deployment = _required_env("AZURE_OPENAI_REALTIME_DEPLOYMENT")
-            self.url = _realtime_url(self.realtime_deployment)
+            self.api_key = api_key or _required_env("AZURE_OPENAI_REALTIME_API_KEY")
+            self.realtime_deployment = deployment or _required_env("AZURE_OPENAI_REALTIME_DEPLOYMENT")
+            self.url = url or _realtime_url(self.realtime_deployment)
         except RuntimeError as exc:
             print(f"{timestamp()} {exc}", flush=True)
             self.api_key = None
-            self.realtime_deployment = REALTIME_DEPLOYMENT
+            self.realtime_deployment = deployment or REALTIME_DEPLOYMENT
             self.url = None
 
     def _instructions(self):
@@ -289,6 +1114,22 @@ class AzureRealtimeAnswerSession:
                 print(f"{timestamp()} Could not load realtime answer instructions: {exc}", flush=True)
         return build_realtime_answer_instructions()
 
+    def _create_send_lanes(self):
+        self._send_lock = asyncio.Lock()
+        self._control_lock = asyncio.Lock()
+        self._control_idle = asyncio.Event()
+        self._control_idle.set()
+
+    async def _connect(self):
+        websocket = await _connect_websocket(self.url, self.api_key)
+        # Smaller appends and an unbuffered transport only pay off when the
+        # kernel bounds unsent bytes, which needs TCP_NOTSENT_LOWAT.
+        self.send_bounded = bool(
+            self.priority_control and self.send_lowat_bytes and _limit_unsent_bytes(websocket, self.send_lowat_bytes)
+        )
+        self.coalesce_max_bytes = self._bounded_append_max_bytes if self.send_bounded else self._append_max_bytes
+        return websocket
+
     async def _send_event(self, event):
         websocket = self.websocket
         if websocket is None:
@@ -296,74 +1137,235 @@ class AzureRealtimeAnswerSession:
         payload = json.dumps(event)
         if self._send_lock is None:
             await websocket.send(payload)
-        else:
+        elif not self.priority_control:
             async with self._send_lock:
                 await websocket.send(payload)
+        else:
+            # Control lane: never queue behind the audio lane's lock, which an
+            # append holds while websockets drains a congested transport.
+            requested_at = time.perf_counter()
+            if self._send_lock.locked():
+                self._control_stats["overtakes"] += 1
+            self._control_pending += 1
+            self._control_idle.clear()
+            try:
+                async with self._control_lock:
+                    await websocket.send(payload)
+            finally:
+                self._control_pending -= 1
+                if not self._control_pending:
+                    self._control_idle.set()
+            self._control_stats["sends"] += 1
+            self._control_wait_ms.append((time.perf_counter() - requested_at) * 1000)
         return True
 
-    def _session_update_event(self):
+    async def _send_audio(self, audio_chunk):
+        websocket = self.websocket
+        if websocket is None:
+            return False
+        payload = self._audio_encoder.encode(audio_chunk)
+        if self._send_lock is None:
+            await self._send_text_payload(websocket, payload)
+        else:
+            async with self._send_lock:
+                if self.priority_control and self._control_pending:
+                    await self._control_idle.wait()
+                await self._send_text_payload(websocket, payload)
+        return True
+
+    async def _send_text_payload(self, websocket, payload):
+        if self._bytes_text_frames is not False:
+            try:
+                await websocket.send(payload, text=True)
+                self._bytes_text_frames = True
+                return
+            except TypeError:
+                if self._bytes_text_frames:
+                    raise
+                self._bytes_text_frames = False
+        await websocket.send(str(payload, "ascii"))
+
+    def _session_config(self):
         return {
-            "type": "session.update",
-            "session": {
-                "type": "realtime",
-                "model": self.realtime_deployment,
-                "output_modalities": ["text"],
-                "instructions": self._instructions(),
-                "max_output_tokens": 2048,
-                "parallel_tool_calls": False,
-                "tools": [ANSWER_UPDATE_TOOL],
-                "tool_choice": {"type": "function", "name": ANSWER_TOOL_NAME},
-                "audio": {
-                    "input": {
-                        "format": {"type": "audio/pcm", "rate": self.sample_rate},
-                        "turn_detection": {
-                            "type": "server_vad",
-                            "threshold": VAD_THRESHOLD,
-                            "prefix_padding_ms": VAD_PREFIX_PADDING_MS,
-                            "silence_duration_ms": VAD_SILENCE_MS,
-                            "create_response": False,
-                            "interrupt_response": False,
-                        },
-                    }
-                },
+            "type": "realtime",
+            "model": self.realtime_deployment,
+            "output_modalities": ["text"],
+            "instructions": self._instructions(),
+            "max_output_tokens": 2048,
+            "parallel_tool_calls": False,
+            "tools": [ANSWER_UPDATE_TOOL],
+            "tool_choice": {"type": "function", "name": ANSWER_TOOL_NAME},
+            "audio": {
+                "input": {
+                    "format": {"type": "audio/pcm", "rate": self.sample_rate},
+                    "turn_detection": {
+                        "type": "server_vad",
+                        "threshold": VAD_THRESHOLD,
+                        "prefix_padding_ms": VAD_PREFIX_PADDING_MS,
+                        "silence_duration_ms": VAD_SILENCE_MS,
+                        "create_response": False,
+                        "interrupt_response": False,
+                    },
+                }
             },
         }
 
-    async def configure_session(self):
-        await self._send_event(self._session_update_event())
+    def _session_update_event(self):
+        return {"type": "session.update", "session": self._session_config()}
 
-    def _response_create_event(self, turn_token, attempt):
-        return {
-            "type": "response.create",
-            "response": {
-                "conversation": "auto",
-                "output_modalities": ["text"],
-                "instructions": self._instructions(),
-                "max_output_tokens": 2048,
-                "parallel_tool_calls": False,
-                "tools": [ANSWER_UPDATE_TOOL],
-                "tool_choice": {"type": "function", "name": ANSWER_TOOL_NAME},
-                "metadata": {
-                    "client_turn_id": turn_token,
-                    "attempt": str(attempt),
-                },
-            },
+    async def configure_session(self, force=False):
+        config = self._session_config()
+        fingerprint = _config_fingerprint(config)
+        if not force and fingerprint == self._session_fingerprint:
+            return False
+        if not await self._send_event({"type": "session.update", "session": config}):
+            return False
+        self._session_fingerprint = fingerprint
+        self._applied_session = config
+        latency_log("session_updated", chars=len(config["instructions"]))
+        return True
+
+    def _forget_session_config(self):
+        self._session_fingerprint = None
+        self._applied_session = None
+
+    def _response_create_event(self, turn_token, attempt, input_audio=None):
+        response = {"conversation": "auto"}
+        if input_audio is not None:
+            # Out of band: the turn's audio travels with the request and nothing is added to the conversation.
+            response["conversation"] = "none"
+            response["input"] = [{"type": "item_reference", "id": item_id} for item_id in self._conversation]
+            audio = binascii.b2a_base64(input_audio, newline=False).decode("ascii")
+            response["input"].append(
+                {"type": "message", "role": "user", "content": [{"type": "input_audio", "audio": audio}]}
+            )
+        applied = self._applied_session or {}
+        overrides = {
+            "output_modalities": ["text"],
+            "instructions": applied.get("instructions") or self._instructions(),
+            "max_output_tokens": 2048,
+            "parallel_tool_calls": False,
+            "tools": [ANSWER_UPDATE_TOOL],
+            "tool_choice": {"type": "function", "name": ANSWER_TOOL_NAME},
+        }
+        for key, value in overrides.items():
+            if applied.get(key) != value:
+                response[key] = value
+        response["metadata"] = {
+            "client_turn_id": turn_token,
+            "attempt": str(attempt),
         }
+        return {"type": "response.create", "response": response}
 
-    async def _create_response(self, turn_token):
-        if not self.auto_answer_enabled or turn_token in self._ignored_turns:
+    async def _create_response(self, turn_token, input_audio=None):
+        turn = self._turns.get(turn_token)
+        if not self.auto_answer_enabled or turn is None or turn.ignored:
             return
         await self.configure_session()
-        attempt = self._retry_counts.get(turn_token, 0)
-        await self._send_event(self._response_create_event(turn_token, attempt))
-        latency_log("response_requested", self._last_audio_enqueue_at, turn=turn_token, attempt=attempt)
+        turn.out_of_band = input_audio is not None
+        await self._send_event(self._response_create_event(turn_token, turn.attempts, input_audio))
+        self._mark(turn, "response_requested")
+        latency_log("response_requested", self._last_audio_enqueue_at, turn=turn_token, attempt=turn.attempts)
         if self.status_callback:
             self.status_callback("Answering...", "#FFA500")
 
+    def _next_turn_token(self):
+        self._turn_counter += 1
+        turn_token = f"turn-{self._turn_counter}"
+        turn = self._turns[turn_token] = TurnState(turn_token)
+        if self.latency_spans and self._audio_flushed_at is not None:
+            turn.marks["audio_enqueued"], turn.marks["audio_sent"] = self._audio_flushed_at
+        while len(self._turns) > TURN_STATE_RETENTION:
+            _, evicted = self._turns.popitem(last=False)
+            self._response_turns.pop(evicted.response_id, None)
+        return turn_token
+
+    def _finish_turn(self, turn):
+        self._turns.pop(turn.token, None)
+        self._response_turns.pop(turn.response_id, None)
+        if self.latency_spans:
+            self._latency.record_turn(turn.marks)
+
+    def _mark(self, turn, stage):
+        if self.latency_spans and turn is not None and stage not in turn.marks:
+            turn.marks[stage] = time.perf_counter()
+
+    async def _start_speculative_response(self):
+        if not (self.speculative_response and self.auto_answer_enabled and self._server_in_speech):
+            return
+        if self._speculation is not None or self._current_turn_token is not None:
+            return
+        turn_token = self._next_turn_token()
+        self._current_turn_token = turn_token
+        speculation = SpeculativeTurn(turn_token, time.perf_counter())
+        self._speculation = speculation
+        self._speculation_stats["attempts"] += 1
+        if self.loop is not None:
+            speculation.timeout_handle = self.loop.call_later(
+                (VAD_SILENCE_MS + 500) / 1000,
+                self._speculation_timed_out,
+                speculation,
+            )
+        if not await self._wait_for_queued_audio():
+            return
+        if self._speculation is not speculation:
+            return
+        await self._create_response(turn_token, input_audio=bytes(self._input_audio))
+        latency_log("speculative_response_requested", turn=turn_token, audio_bytes=len(self._input_audio))
+
+    def _speculation_timed_out(self, speculation):
+        asyncio.ensure_future(self._promote_speculation(speculation, timed_out=True))
+
+    async def _promote_speculation(self, speculation=None, timed_out=False):
+        current = self._speculation
+        if current is None or (speculation is not None and speculation is not current):
+            return
+        self._speculation = None
+        if current.timeout_handle is not None:
+            current.timeout_handle.cancel()
+        saved_ms = 0.0 if timed_out else (time.perf_counter() - current.started_at) * 1000
+        self._speculation_stats["timeouts" if timed_out else "hits"] += 1
+        self._speculation_saved_ms.append(saved_ms)
+        latency_log("speculative_response_promoted", turn=current.turn_token, saved_ms=f"{saved_ms:.0f}")
+        if current.held_update is not None and current.turn_token == self._current_turn_token:
+            await self._apply_answer_update(*current.held_update)
+        if current.held_done_event is not None:
+            await self._handle_response_done(current.held_done_event)
+
+    async def _abandon_speculation(self):
+        current = self._speculation
+        if current is None:
+            return
+        self._speculation = None
+        if current.timeout_handle is not None:
+            current.timeout_handle.cancel()
+        self._speculation_stats["misses"] += 1
+        latency_log("speculative_response_abandoned", turn=current.turn_token)
+        if current.turn_token == self._current_turn_token:
+            await self._cancel_current_response()
+        if current.held_done_event is not None:
+            await self._handle_response_done(current.held_done_event)
+
+    def predict_end_of_turn(self):
+        self._run_on_loop(self._start_speculative_response)
+
+    def retract_end_of_turn(self):
+        self._run_on_loop(self._abandon_speculation)
+
+    def _run_on_loop(self, coroutine_function):
+        if not (self.loop and self.running) or self.loop.is_closed():
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(coroutine_function(), self.loop)
+        except RuntimeError:
+            pass
+
     async def _cancel_current_response(self):
         turn_token = self._current_turn_token
-        if turn_token:
-            self._ignored_turns.add(turn_token)
+        turn = self._turns.get(turn_token)
+        if turn is not None:
+            turn.ignored = True
+        self._discard_preview()
         response_id = self._active_response_id
         if response_id or turn_token:
             event = {"type": "response.cancel"}
@@ -389,39 +1391,52 @@ class AzureRealtimeAnswerSession:
         )
 
     def _turn_for_response(self, response_id, response=None):
-        turn_token = self._response_turns.get(response_id)
-        if turn_token:
-            return turn_token
+        turn = self._response_turns.get(response_id)
+        if turn is not None:
+            return turn
         metadata = (response or {}).get("metadata") or {}
-        turn_token = metadata.get("client_turn_id")
-        if turn_token and response_id:
-            self._response_turns[response_id] = turn_token
-        return turn_token
+        turn = self._turns.get(metadata.get("client_turn_id"))
+        if turn is not None and response_id:
+            return self._bind_response(turn, response_id)
+        return turn
+
+    def _bind_response(self, turn, response_id):
+        if turn.response_id == response_id:
+            return turn
+        if turn.response_id is not None:
+            return None
+        turn.bind_response(response_id)
+        self._response_turns[response_id] = turn
+        return turn
+
+    def _release_response(self, turn):
+        self._response_turns.pop(turn.response_id, None)
+        turn.bind_response(None)
 
     async def _handle_response_created(self, event):
         response = event.get("response") or {}
         response_id = response.get("id") or event.get("response_id")
-        turn_token = self._turn_for_response(response_id, response) or self._current_turn_token
-        if response_id and turn_token:
-            self._response_turns[response_id] = turn_token
-        if turn_token in self._ignored_turns:
+        turn = self._turn_for_response(response_id, response)
+        if turn is None and response_id and self._current_turn_token in self._turns:
+            turn = self._bind_response(self._turns[self._current_turn_token], response_id)
+        if turn is not None and turn.ignored:
             if response_id:
                 await self._send_event({"type": "response.cancel", "response_id": response_id})
             return
+        self._mark(turn, "response_created")
         self._active_response_id = response_id
 
     async def _handle_function_done(self, event):
         response_id = event.get("response_id")
-        turn_token = self._turn_for_response(response_id)
+        turn = self._turn_for_response(response_id)
         call_id = event.get("call_id", "")
-        if not turn_token or turn_token in self._ignored_turns or turn_token != self._current_turn_token:
-            return
-        if response_id in self._committed_responses:
+        if turn is None or turn.ignored or turn.token != self._current_turn_token or turn.committed:
             return
+        self._mark(turn, "arguments_done")
 
         arguments = event.get("arguments")
-        if not arguments:
-            arguments = self._call_arguments.get(call_id, "")
+        if not arguments and turn.call_id == call_id:
+            arguments = turn.arguments
 
         try:
             if event.get("name") != ANSWER_TOOL_NAME:
@@ -429,34 +1444,139 @@ class AzureRealtimeAnswerSession:
             action, text = validate_answer_update(arguments)
         except ValueError as exc:
             message = str(exc)
-            self._protocol_errors[response_id] = message
+            turn.protocol_error = message
+            self._discard_preview(turn.token)
             print(f"{timestamp()} Invalid realtime answer update: {message}", flush=True)
-            await self._send_function_output(
-                call_id,
-                {
-                    "status": "error",
-                    "error": message,
-                    "instruction": "Call update_visible_answer once with valid action and text arguments.",
-                },
-            )
+            if not turn.out_of_band:
+                await self._send_function_output(
+                    call_id,
+                    {
+                        "status": "error",
+                        "error": message,
+                        "instruction": "Call update_visible_answer once with valid action and text arguments.",
+                    },
+                )
             return
 
+        speculation = self._speculation
+        if speculation is not None and speculation.turn_token == turn.token:
+            speculation.held_update = (response_id, call_id, action, text)
+            return
+        await self._apply_answer_update(response_id, call_id, action, text)
+
+    async def _apply_answer_update(self, response_id, call_id, action, text):
+        turn = self._response_turns.get(response_id)
+        if self.answer_gate is not None and not self.answer_gate(self, turn, action, text):
+            if turn is not None:
+                turn.ignored = True
+                self._discard_preview(turn.token)
+            if turn is None or not turn.out_of_band:
+                await self._send_function_output(call_id, {"status": "superseded", "action": action})
+            latency_log("answer_superseded", response_id=response_id, action=action)
+            return
+        self._preview_turn = None
         if self.answer_update_callback:
             self.answer_update_callback(action, text)
-        await self._send_function_output(call_id, {"status": "applied", "action": action})
-        self._committed_responses.add(response_id)
+        self._mark(turn, "ui_applied")
+        self._log_answer_update(action, text)
+        if turn is not None and turn.out_of_band:
+            # The out-of-band call is not in the conversation, so add it with its output.
+            await self._send_answer_items(call_id, action, text)
+        else:
+            await self._send_function_output(call_id, {"status": "applied", "action": action})
+        if turn is not None:
+            turn.committed = True
         latency_log("answer_committed", response_id=response_id, action=action, chars=len(text))
         if self.status_callback:
             self.status_callback("Listening...", "#4CAF50")
 
+    def _show_preview(self, turn):
+        """Forward completed words of a streaming answer as a provisional preview."""
+        preview = turn.preview
+        if self.answer_preview_callback is None or preview.action not in {"append", "reset"}:
+            return
+        if turn.token != self._current_turn_token or turn.committed:
+            return
+        if self._speculation is not None and self._speculation.turn_token == turn.token:
+            return
+        text = preview.text
+        if not preview.text_complete:
+            text = text[: max(text.rfind(" "), text.rfind("\n"), 0)]
+        text = text.strip()
+        if not text or text == turn.preview_text:
+            return
+        if self._preview_turn is None:
+            latency_log("answer_preview_shown", self._last_audio_enqueue_at, turn=turn.token)
+        turn.preview_text = text
+        self._preview_turn = turn.token
+        self.answer_preview_callback(preview.action, text)
+
+    def _discard_preview(self, turn_token=None):
+        if self._preview_turn is None or (turn_token is not None and turn_token != self._preview_turn):
+            return
+        self._preview_turn = None
+        if self.answer_preview_callback:
+            self.answer_preview_callback(PREVIEW_DISCARD, "")
+
+    def _log_answer_update(self, action, text):
+        if action == "reset":
+            self._answer_log.clear()
+        if action != "no_update":
+            self._answer_log.append((action, text))
+            self._answer_log[:] = self._rehydration_entries()
+
+    def _rehydration_entries(self):
+        """Newest committed answer updates that fit the rehydration token budget, oldest first."""
+        budget = self.rehydrate_max_tokens
+        entries = []
+        for action, text in reversed(self._answer_log):
+            cost = estimate_tokens(text) + REHYDRATE_ITEM_OVERHEAD_TOKENS
+            if cost > budget:
+                break
+            budget -= cost
+            entries.append((action, text))
+        entries.reverse()
+        return entries
+
+    async def _send_answer_items(self, call_id, action, text):
+        await self._send_event(
+            {
+                "type": "conversation.item.create",
+                "item": {
+                    "type": "function_call",
+                    "call_id": call_id,
+                    "name": ANSWER_TOOL_NAME,
+                    "arguments": json.dumps({"action": action, "text": text}),
+                },
+            }
+        )
+        await self._send_function_output(call_id, {"status": "applied", "action": action})
+
+    async def _rehydrate_answer_context(self):
+        entries = self._rehydration_entries()
+        for index, (action, text) in enumerate(entries, start=1):
+            await self._send_answer_items(f"rehydrated_{index}", action, text)
+        if entries:
+            latency_log("answer_context_rehydrated", items=len(entries))
+        return bool(entries)
+
     async def _handle_response_done(self, event):
         response = event.get("response") or {}
         response_id = response.get("id") or event.get("response_id")
-        turn_token = self._turn_for_response(response_id, response)
+        turn = self._turn_for_response(response_id, response)
+        turn_token = turn.token if turn is not None else None
+        speculation = self._speculation
+        if speculation is not None and speculation.turn_token == turn_token:
+            speculation.held_done_event = event
+            return
         status = response.get("status", "")
-        ignored = not turn_token or turn_token in self._ignored_turns
-        committed = response_id in self._committed_responses
-        protocol_error = self._protocol_errors.pop(response_id, "")
+        ignored = turn is None or turn.ignored
+        committed = turn is not None and turn.committed
+        protocol_error = turn.protocol_error if turn is not None else ""
+        if turn is not None:
+            self._release_response(turn)
+            if not committed:
+                self._discard_preview(turn_token)
 
         if not ignored and status == "completed" and not committed and not protocol_error:
             protocol_error = "response completed without update_visible_answer"
@@ -468,9 +1588,8 @@ class AzureRealtimeAnswerSession:
             and turn_token == self._current_turn_token
             and self.auto_answer_enabled
         ):
-            attempts = self._retry_counts.get(turn_token, 0)
-            if attempts < 1:
-                self._retry_counts[turn_token] = attempts + 1
+            if turn.attempts < 1:
+                turn.attempts += 1
                 self._active_response_id = None
                 print(f"{timestamp()} Retrying realtime answer after protocol error", flush=True)
                 await self._create_response(turn_token)
@@ -484,87 +1603,283 @@ class AzureRealtimeAnswerSession:
         if response_id == self._active_response_id:
             self._active_response_id = None
 
-        self._response_turns.pop(response_id, None)
-        self._committed_responses.discard(response_id)
-        if turn_token:
-            self._retry_counts.pop(turn_token, None)
-            self._ignored_turns.discard(turn_token)
+        if turn is not None:
+            self._finish_turn(turn)
+        if self._current_turn_token is None:
+            await self._prune_conversation()
 
-    async def handle_server_event(self, event):
-        event_type = event.get("type", "")
-
-        if event_type == "input_audio_buffer.speech_started":
-            await self._cancel_current_response()
-            if self.status_callback:
-                self.status_callback("Listening...", "#4CAF50")
+    async def _handle_item_added(self, event):
+        item = conversation_item_from_event(event.get("item") or {})
+        if item is None:
             return
-
-        if event_type == "input_audio_buffer.speech_stopped":
-            if self.auto_answer_enabled:
-                self._turn_counter += 1
-                self._current_turn_token = f"turn-{self._turn_counter}"
-                self._retry_counts[self._current_turn_token] = 0
-                await self._create_response(self._current_turn_token)
-            return
-
-        if event_type == "response.created":
-            await self._handle_response_created(event)
-            return
-
-        if event_type == "response.function_call_arguments.delta":
-            response_id = event.get("response_id")
-            turn_token = self._turn_for_response(response_id)
-            if turn_token and turn_token not in self._ignored_turns:
-                call_id = event.get("call_id", "")
-                self._call_arguments[call_id] = self._call_arguments.get(call_id, "") + event.get("delta", "")
+        if event.get("type") == "conversation.item.done" and item.item_id not in self._conversation:
             return
+        self._conversation[item.item_id] = item
+        if item.kind == "audio" and self._current_turn_token is None:
+            await self._prune_conversation()
+
+    async def _handle_item_deleted(self, event):
+        self._conversation.pop(event.get("item_id"), None)
+
+    def _stale_conversation_items(self):
+        """Input audio beyond the newest turns and answer history beyond the token budget, oldest first."""
+        audio = [item for item in self._conversation.values() if item.kind == "audio"]
+        stale = audio[: max(0, len(audio) - self.context_audio_turns)]
+        groups = collections.OrderedDict()
+        for item in self._conversation.values():
+            if item.kind == "history":
+                groups.setdefault(item.group, []).append(item)
+        budget = self.context_history_max_tokens
+        newest_first = list(reversed(groups.values()))
+        for index, items in enumerate(newest_first):
+            cost = sum(item.tokens for item in items)
+            if index and cost > budget:
+                for older in reversed(newest_first[index:]):
+                    stale.extend(older)
+                break
+            budget -= cost
+        return stale
 
-        if event_type == "response.function_call_arguments.done":
-            await self._handle_function_done(event)
+    async def _prune_conversation(self):
+        if not self.context_pruning or self._speculation is not None:
             return
+        stale = self._stale_conversation_items()
+        for item in stale:
+            self._conversation.pop(item.item_id, None)
+            await self._send_event({"type": "conversation.item.delete", "item_id": item.item_id})
+        if stale:
+            self._context_stats["deleted"] += len(stale)
+            self._context_stats["prunes"] += 1
+            latency_log("conversation_pruned", items=len(stale), kept=len(self._conversation))
+
+    async def _handle_speech_started(self, _event):
+        self._server_in_speech = True
+        if self._speculation is not None:
+            await self._abandon_speculation()
+        await self._cancel_current_response()
+        if self.status_callback:
+            self.status_callback("Listening...", "#4CAF50")
 
-        if event_type in {"response.output_text.delta", "response.output_text.done"}:
-            response_id = event.get("response_id")
-            turn_token = self._turn_for_response(response_id)
-            if turn_token and turn_token not in self._ignored_turns:
-                self._protocol_errors[response_id] = "unexpected free-form text output"
+    async def _handle_speech_stopped(self, _event):
+        stopped_at = time.perf_counter()
+        self._server_in_speech = False
+        # The server commits this turn's audio; a later speculation starts from the next onset.
+        self._input_audio.clear()
+        if self._speculation is not None:
+            self._mark_turn_stopped(self._speculation.turn_token, stopped_at)
+            await self._promote_speculation()
             return
-
-        if event_type == "response.done":
-            await self._handle_response_done(event)
+        if self.auto_answer_enabled:
+            self._current_turn_token = self._next_turn_token()
+            self._mark_turn_stopped(self._current_turn_token, stopped_at)
+            await self._create_response(self._current_turn_token)
+
+    def _mark_turn_stopped(self, turn_token, stopped_at):
+        turn = self._turns.get(turn_token)
+        if turn is not None:
+            turn.marks.setdefault("speech_stopped", stopped_at)
+
+    async def _handle_arguments_delta(self, event):
+        turn = self._turn_for_response(event.get("response_id"))
+        if turn is None or turn.ignored:
             return
+        call_id = event.get("call_id", "")
+        delta = event.get("delta", "")
+        if turn.call_id != call_id:
+            turn.start_call(call_id)
+            self._mark(turn, "first_delta")
+        turn.arguments += delta
+        if turn.preview.feed(delta):
+            self._show_preview(turn)
+
+    async def _handle_output_text(self, event):
+        turn = self._turn_for_response(event.get("response_id"))
+        if turn is not None and not turn.ignored:
+            turn.protocol_error = "unexpected free-form text output"
+
+    async def _handle_error(self, event):
+        print(f"{timestamp()} Azure Realtime error: {event.get('error', {})}", flush=True)
 
-        if event_type == "error":
-            print(f"{timestamp()} Azure Realtime error: {event.get('error', {})}", flush=True)
+    async def handle_server_event(self, event):
+        handler = self._event_handlers.get(event.get("type", ""))
+        if handler is not None:
+            await handler(event)
+
+    def _drain_queued_audio(self, audio_chunk):
+        if self.audio_queue.empty() or len(audio_chunk) >= self.coalesce_max_bytes:
+            return audio_chunk, 1
+
+        merged = self._coalesce_buffer
+        merged.clear()
+        merged += audio_chunk
+        chunk_count = 1
+        while len(merged) < self.coalesce_max_bytes:
+            try:
+                queued_chunk = self.audio_queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            self.audio_queue.task_done()
+            if len(merged) + len(queued_chunk) > self.coalesce_max_bytes:
+                self._pending_audio = queued_chunk
+                break
+            merged += queued_chunk
+            chunk_count += 1
+        return merged, chunk_count
+
+    async def _wait_for_queued_audio(self):
+        """Wait until every append queued so far is on the wire; False if it was discarded instead."""
+        backlog = self.audio_queue
+        if not isinstance(backlog, AudioBacklog):
+            return self.websocket is not None
+        offset = backlog.end_offset()
+        if offset <= self._sent_audio_offset:
+            return self.websocket is not None
+        waiter = asyncio.get_running_loop().create_future()
+        self._audio_barriers.append((offset, waiter))
+        return await waiter
+
+    def _release_audio_barriers(self):
+        while self._audio_barriers and self._audio_barriers[0][0] <= self._sent_audio_offset:
+            _offset, waiter = self._audio_barriers.popleft()
+            if not waiter.done():
+                waiter.set_result(True)
+
+    def _keep_input_audio(self, payload):
+        """Remember sent audio for out-of-band speculative responses."""
+        audio = self._input_audio
+        audio += payload
+        keep_ms = SPECULATIVE_AUDIO_MAX_MS if self._server_in_speech else SPECULATIVE_LOOKBACK_MS
+        excess = len(audio) - int(keep_ms * self.sample_rate / 1000) * 2
+        if excess > 0:
+            del audio[:excess]
 
     async def send_audio_to_azure(self):
         while self.running:
-            audio_chunk = await self.audio_queue.get()
-            try:
-                await self._send_event(
-                    {
-                        "type": "input_audio_buffer.append",
-                        "audio": base64.b64encode(audio_chunk).decode("ascii"),
-                    }
-                )
-            finally:
+            if self._pending_audio is not None:
+                audio_chunk, self._pending_audio = self._pending_audio, None
+            else:
+                audio_chunk = await self.audio_queue.get()
                 self.audio_queue.task_done()
+            payload, chunk_count = self._drain_queued_audio(audio_chunk)
+            if not await self._send_audio(payload):
+                continue
+            self._audio_stats["sends"] += 1
+            self._audio_stats["chunks"] += chunk_count
+            self._audio_stats["bytes"] += len(payload)
+            self._chunks_per_send[chunk_count] += 1
+            if self.speculative_response:
+                self._keep_input_audio(payload)
+            if isinstance(self.audio_queue, AudioBacklog):
+                self._sent_audio_offset = self.audio_queue.taken_offset - len(self._pending_audio or b"")
+                if self._audio_barriers:
+                    self._release_audio_barriers()
+            if self._pending_audio is None and self.audio_queue.empty():
+                self._audio_flushed_at = (self._last_audio_enqueue_at, time.perf_counter())
+            if chunk_count > 1:
+                latency_log("audio_coalesced", chunks=chunk_count, bytes=len(payload))
+            if self.audio_queue.empty() and isinstance(self.audio_queue, AudioBacklog):
+                dropped_ms = self.audio_queue.take_dropped_ms()
+                if dropped_ms:
+                    print(f"{timestamp()} Dropped {dropped_ms:.0f}ms of stale desktop audio after a stall", flush=True)
+
+    def get_metrics(self):
+        saved_ms = sorted(self._speculation_saved_ms)
+        recovery_ms = sorted(self._recovery_ms)
+        control_wait_ms = list(self._control_wait_ms)
+        attempts = self._speculation_stats["attempts"]
+        sends = self._audio_stats["sends"]
+        chunks_per_send = dict(self._chunks_per_send)
+        backlog = self.audio_queue if isinstance(self.audio_queue, AudioBacklog) else None
+        ring = self._audio_ring
+        return {
+            "audio": {
+                "backlog_ms": backlog.backlog_ms if backlog else 0.0,
+                "dropped_ms": backlog.dropped_ms if backlog else 0.0,
+                "dropped_chunks": backlog.dropped_chunks if backlog else 0,
+                "sends": sends,
+                "chunks": self._audio_stats["chunks"],
+                "bytes": self._audio_stats["bytes"],
+                "coalesced_sends": sum(count for merged, count in chunks_per_send.items() if merged > 1),
+                "max_chunks_per_send": max(chunks_per_send, default=0),
+                "chunks_per_send": chunks_per_send,
+                "handoff": "ring" if ring is not None else "call_soon",
+                "loop_wakeups": ring.wakeups if ring is not None else self._handoff_calls,
+                "writer_wakeups": ring.writer_wakeups if ring is not None else self._handoff_calls,
+                "timer_wakeups": ring.timer_wakeups if ring is not None else 0,
+            },
+            "speculation": {
+                "attempts": attempts,
+                "hits": self._speculation_stats["hits"],
+                "misses": self._speculation_stats["misses"],
+                "timeouts": self._speculation_stats["timeouts"],
+                "hit_rate": self._speculation_stats["hits"] / attempts if attempts else 0.0,
+                "median_saved_ms": saved_ms[len(saved_ms) // 2] if saved_ms else 0.0,
+            },
+            "control": {
+                "sends": self._control_stats["sends"],
+                "overtakes": self._control_stats["overtakes"],
+                "send_bounded": self.send_bounded,
+                "p50_wait_ms": percentile(control_wait_ms, 0.50),
+                "p95_wait_ms": percentile(control_wait_ms, 0.95),
+            },
+            "latency": self._latency.summary(),
+            "events": {
+                "decoded": self._event_stats["decoded"],
+                "skipped": self._event_stats["skipped"],
+            },
+            "conversation": {
+                "items": len(self._conversation),
+                "audio_items": sum(1 for item in self._conversation.values() if item.kind == "audio"),
+                "history_tokens": sum(item.tokens for item in self._conversation.values() if item.kind == "history"),
+                "deleted": self._context_stats["deleted"],
+                "prunes": self._context_stats["prunes"],
+            },
+            "connection": {
+                "connects": self._connection_stats["connects"],
+                "drops": self._connection_stats["drops"],
+                "failed_attempts": self._connection_stats["failed_attempts"],
+                "standby_promotions": self._connection_stats["standby_promotions"],
+                "standby_ready": self._standby is not None,
+                "last_recovery_ms": self._recovery_ms[-1] if self._recovery_ms else 0.0,
+                "median_recovery_ms": recovery_ms[len(recovery_ms) // 2] if recovery_ms else 0.0,
+            },
+        }
 
     async def process_responses(self):
+        handlers = self._event_handlers
+        stats = self._event_stats
         async for raw_message in self.websocket:
-            await self.handle_server_event(json.loads(raw_message))
+            event_type = sniff_event_type(raw_message)
+            if event_type is None:
+                stats["decoded"] += 1
+                await self.handle_server_event(self.event_decoder(raw_message))
+                continue
+            handler = handlers.get(event_type)
+            if handler is None:
+                stats["skipped"] += 1
+                continue
+            stats["decoded"] += 1
+            await handler(self.event_decoder(raw_message))
 
     def _clear_response_state(self):
+        if self._speculation is not None and self._speculation.timeout_handle is not None:
+            self._speculation.timeout_handle.cancel()
+        self._speculation = None
+        self._server_in_speech = False
+        self._input_audio.clear()
         self._current_turn_token = None
         self._active_response_id = None
+        self._discard_preview()
+        self._turns.clear()
         self._response_turns.clear()
-        self._ignored_turns.clear()
-        self._call_arguments.clear()
-        self._protocol_errors.clear()
-        self._committed_responses.clear()
-        self._retry_counts.clear()
+        self._conversation.clear()
 
     def _discard_queued_audio(self):
+        self._pending_audio = None
+        while self._audio_barriers:
+            _offset, waiter = self._audio_barriers.popleft()
+            if not waiter.done():
+                waiter.set_result(False)
         if self.audio_queue is None:
             return
         while True:
@@ -573,6 +1888,8 @@ class AzureRealtimeAnswerSession:
                 self.audio_queue.task_done()
             except asyncio.QueueEmpty:
                 break
+        if isinstance(self.audio_queue, AudioBacklog):
+            self._sent_audio_offset = self.audio_queue.taken_offset
 
     async def _run_connection(self):
         send_task = asyncio.create_task(self.send_audio_to_azure())
@@ -582,29 +1899,99 @@ class AzureRealtimeAnswerSession:
         for task in pending:
             task.cancel()
         await asyncio.gather(*pending, return_exceptions=True)
-        for task in done:
-            if task.cancelled():
-                continue
-            exception = task.exception()
+        exceptions = [task.exception() for task in done if not task.cancelled()]
+        for exception in exceptions:
             if exception:
                 raise exception
 
+    async def _open_standby(self):
+        websocket = None
+        try:
+            websocket = await self._connect()
+            config = self._session_config()
+            await websocket.send(json.dumps({"type": "session.update", "session": config}))
+        except asyncio.CancelledError:
+            await _close_websocket(websocket)
+            raise
+        except Exception as exc:
+            print(
+                f"{timestamp()} Azure Realtime standby connection failed: {_format_websocket_error(exc)}",
+                flush=True,
+            )
+            await _close_websocket(websocket)
+            return
+        if not self.running:
+            await _close_websocket(websocket)
+            return
+        self._standby = (websocket, _config_fingerprint(config), config)
+        latency_log("standby_ready")
+
+    def _ensure_standby(self):
+        if not self.standby_connection or not self.running or self._standby is not None:
+            return
+        if self._standby_task is not None and not self._standby_task.done():
+            return
+        self._standby_task = asyncio.create_task(self._open_standby())
+
+    def _take_standby(self):
+        standby, self._standby = self._standby, None
+        if standby is None or not _websocket_open(standby[0]):
+            return None
+        return standby
+
+    async def _close_standby(self):
+        if self._standby_task is not None:
+            self._standby_task.cancel()
+            await asyncio.gather(self._standby_task, return_exceptions=True)
+            self._standby_task = None
+        standby, self._standby = self._standby, None
+        if standby is not None:
+            await _close_websocket(standby[0])
+
+    def _record_connected(self):
+        self._connection_stats["connects"] += 1
+        if self._disconnected_at is None:
+            return
+        recovery_ms = (time.perf_counter() - self._disconnected_at) * 1000
+        self._disconnected_at = None
+        self._recovery_ms.append(recovery_ms)
+        latency_log("reconnected", recovery_ms=f"{recovery_ms:.0f}")
+
     async def run(self):
         if not self.api_key or not self.url:
             print(f"{timestamp()} Cannot start Azure Realtime answering without credentials", flush=True)
             return
 
-        self.audio_queue = asyncio.Queue(maxsize=100)
-        self._send_lock = asyncio.Lock()
+        if self.audio_ring:
+            bytes_per_ms = self.sample_rate * 2 / 1000
+            self._audio_ring = AudioRing(
+                capacity_bytes=int(self.backlog_max_ms * bytes_per_ms) + self.chunk_size * 2,
+                watermark_bytes=int(self.wake_watermark_ms * bytes_per_ms),
+                max_wait_ms=self.wake_max_ms,
+                loop=asyncio.get_running_loop(),
+            )
+        self.audio_queue = AudioBacklog(
+            self.backlog_max_ms, self.sample_rate, ring=self._audio_ring, chunk_bytes=self.chunk_size * 2
+        )
+        self._sent_audio_offset = 0
+        self._create_send_lanes()
         while self.running:
+            connected_at = None
             try:
                 was_reconnect = self._connected_once
                 intentional_reconnect = self._intentional_reset
-                self.websocket = await _connect_websocket(self.url, self.api_key)
+                standby = self._take_standby()
+                if standby is None:
+                    self.websocket = await self._connect()
+                    self._forget_session_config()
+                else:
+                    self.websocket, self._session_fingerprint, self._applied_session = standby
+                    self._connection_stats["standby_promotions"] += 1
                 self._clear_response_state()
                 self._discard_queued_audio()
                 await self.configure_session()
-                self._error_retries = 0
+                connected_at = time.perf_counter()
+                self._record_connected()
                 self._connected_once = True
                 self._intentional_reset = False
                 print(
@@ -612,8 +1999,10 @@ class AzureRealtimeAnswerSession:
                     f"with deployment {self.realtime_deployment!r}",
                     flush=True,
                 )
-                if was_reconnect and not intentional_reconnect and self.session_reset_callback:
-                    self.session_reset_callback()
+                if was_reconnect and not intentional_reconnect:
+                    if not await self._rehydrate_answer_context() and self.session_reset_callback:
+                        self.session_reset_callback()
+                self._ensure_standby()
                 await self._run_connection()
             except asyncio.CancelledError:
                 break
@@ -624,27 +2013,42 @@ class AzureRealtimeAnswerSession:
                         f"{self.realtime_deployment!r}: {_format_websocket_error(exc)}",
                         flush=True,
                     )
-                    if not self._intentional_reset:
-                        self._error_retries += 1
             finally:
                 for task in self.tasks:
                     if not task.done():
                         task.cancel()
-                if self.websocket:
-                    try:
-                        await self.websocket.close()
-                    except Exception:
-                        pass
+                await _close_websocket(self.websocket)
                 self.websocket = None
                 print(f"{timestamp()} Azure desktop Realtime answer session closed", flush=True)
 
             if not self.running:
                 break
-            if not self._intentional_reset and self._error_retries > 3:
-                print(f"{timestamp()} Azure Realtime reconnect limit reached", flush=True)
-                break
-            await asyncio.sleep(1)
+            if connected_at is not None and self._intentional_reset:
+                continue
+
+            if connected_at is None:
+                self._connection_stats["failed_attempts"] += 1
+            else:
+                self._connection_stats["drops"] += 1
+                backoff_ceiling = reconnect_delay(
+                    self._error_retries, self.reconnect_base_ms, self.reconnect_max_ms, rng=lambda: 1.0
+                )
+                if time.perf_counter() - connected_at >= backoff_ceiling:
+                    self._error_retries = 0
+            if self._disconnected_at is None:
+                self._disconnected_at = time.perf_counter()
+            self._error_retries += 1
+            if self._standby is not None and _websocket_open(self._standby[0]):
+                continue
+            delay = reconnect_delay(self._error_retries, self.reconnect_base_ms, self.reconnect_max_ms)
+            print(
+                f"{timestamp()} Azure Realtime reconnecting in {delay * 1000:.0f}ms "
+                f"(attempt {self._error_retries})",
+                flush=True,
+            )
+            await asyncio.sleep(delay)
 
+        await self._close_standby()
         self.running = False
 
     def add_audio_chunk(self, audio_chunk):
@@ -652,14 +2056,13 @@ class AzureRealtimeAnswerSession:
             return
         self._last_audio_enqueue_at = time.perf_counter()
 
-        def enqueue():
-            try:
-                self.audio_queue.put_nowait(audio_chunk)
-            except asyncio.QueueFull:
-                pass
-
         try:
-            self.loop.call_soon_threadsafe(enqueue)
+            ring = self._audio_ring
+            if ring is not None:
+                ring.write(audio_chunk)
+            else:
+                self._handoff_calls += 1
+                self.loop.call_soon_threadsafe(self.audio_queue.put_nowait, audio_chunk)
         except RuntimeError:
             pass
 
@@ -678,13 +2081,13 @@ class AzureRealtimeAnswerSession:
         print(
             f"{timestamp()} Azure desktop Realtime config: chunk_size={self.chunk_size} "
             f"vad_silence_ms={VAD_SILENCE_MS} vad_threshold={VAD_THRESHOLD} "
-            f"vad_prefix_padding_ms={VAD_PREFIX_PADDING_MS}",
+            f"vad_prefix_padding_ms={VAD_PREFIX_PADDING_MS} event_loop={self.event_loop}",
             flush=True,
         )
         self.running = True
 
         def run_async_loop():
-            self.loop = asyncio.new_event_loop()
+            self.loop = new_event_loop(self.event_loop)
             asyncio.set_event_loop(self.loop)
             try:
                 self.loop.run_until_complete(self.run())
@@ -713,6 +2116,7 @@ class AzureRealtimeAnswerSession:
                 pass
 
     async def _reset_connection(self):
+        self._answer_log.clear()
         self._clear_response_state()
         self._discard_queued_audio()
         if self.websocket:
@@ -735,6 +2139,162 @@ class AzureRealtimeAnswerSession:
                 pass
         print(f"{timestamp()} Azure desktop Realtime answer session stopped", flush=True)
 
+    def current_turn_stopped_at(self):
+        turn = self._turns.get(self._current_turn_token)
+        return turn.marks.get("speech_stopped") if turn is not None else None
+
+    def supersede_turn(self, stopped_before, action, text):
+        """Cancel the turn another session already answered and adopt that answer as context."""
+        self._run_on_loop(lambda: self._supersede_turn(stopped_before, action, text))
+
+    async def _supersede_turn(self, stopped_before, action, text):
+        turn = self._turns.get(self._current_turn_token)
+        if turn is not None and turn.marks.get("speech_stopped", stopped_before) <= stopped_before:
+            await self._cancel_current_response()
+        self._log_answer_update(action, text)
+        self._adopted_answers += 1
+        await self._send_answer_items(f"adopted_{self._adopted_answers}", action, text)
+
+    def latency_report(self):
+        return self._latency.format_report()
+
     def cleanup(self):
         self.stop()
+        if self._latency.turns:
+            print(f"{timestamp()} {self.latency_report()}", flush=True)
         print(f"{timestamp()} Azure desktop Realtime answer session cleaned up", flush=True)
+
+
+class HedgeRound:
+    __slots__ = ("opened_at", "winner", "turns")
+
+    def __init__(self, opened_at):
+        self.opened_at = opened_at
+        self.winner = None
+        self.turns = {}
+
+
+class HedgedAnswerCoordinator:
+    """First valid answer per interviewer turn wins across sessions fed the same audio.
+
+    Turns are paired into rounds by ``speech_stopped`` time; losing sessions cancel and adopt the winning answer.
+    """
+
+    def __init__(self, answer_preview_callback=None, turn_window_ms=HEDGE_TURN_WINDOW_MS, clock=time.perf_counter):
+        self.answer_preview_callback = answer_preview_callback
+        self.turn_window_ms = turn_window_ms
+        self.clock = clock
+        self.sessions = []
+        self.rounds = 0
+        self._lock = threading.Lock()
+        self._recent_rounds = collections.deque(maxlen=8)
+        self._labels = {}
+        self._stats = {}
+        self._latency_ms = {}
+        self._lost_before = {}
+        self._preview_owner = None
+
+    @staticmethod
+    def session_label(session):
+        host = urlparse(session.url or "").hostname or "unknown"
+        return f"{session.realtime_deployment}@{host}"
+
+    def attach(self, session):
+        label = self.session_label(session)
+        if label in self._stats:
+            label = f"{label}#{len(self.sessions) + 1}"
+        self.sessions.append(session)
+        self._labels[id(session)] = label
+        self._stats[label] = collections.Counter()
+        self._latency_ms[label] = collections.deque(maxlen=LATENCY_SPAN_WINDOW)
+        return label
+
+    def _round_for(self, label, turn_token, stopped_at):
+        window = self.turn_window_ms / 1000
+        for hedge_round in reversed(self._recent_rounds):
+            if abs(stopped_at - hedge_round.opened_at) > window:
+                continue
+            if hedge_round.turns.setdefault(label, turn_token) != turn_token:
+                continue
+            return hedge_round, hedge_round is self._recent_rounds[-1]
+        if self._recent_rounds and stopped_at < self._recent_rounds[-1].opened_at:
+            return None, False
+        hedge_round = HedgeRound(stopped_at)
+        hedge_round.turns[label] = turn_token
+        self._recent_rounds.append(hedge_round)
+        self.rounds += 1
+        return hedge_round, True
+
+    def admit_answer(self, session, turn, action, text):
+        now = self.clock()
+        stopped_at = turn.marks.get("speech_stopped", now) if turn is not None else now
+        label = self._labels.get(id(session)) or self.attach(session)
+        with self._lock:
+            stats = self._stats[label]
+            stats["answers"] += 1
+            self._latency_ms[label].append((now - stopped_at) * 1000)
+            hedge_round, newest = self._round_for(label, turn.token if turn is not None else None, stopped_at)
+            if hedge_round is None or not newest:
+                stats["stale"] += 1
+                return False
+            if hedge_round.winner is not None:
+                stats["late"] += 1
+                return False
+            hedge_round.winner = label
+            stats["wins"] += 1
+            self._preview_owner = None
+            stopped_before = stopped_at + self.turn_window_ms / 1000
+            losers = [other for other in self.sessions if other is not session]
+            for other in losers:
+                self._lost_before[self._labels[id(other)]] = stopped_before
+        latency_log("hedge_won", deployment=label, action=action)
+        for other in losers:
+            other.supersede_turn(stopped_before, action, text)
+        return True
+
+    def preview_callback(self, session_index):
+        """Preview callback for the session attached ``session_index``-th; the first session previewing a round is shown."""
+
+        def forward(action, text):
+            with self._lock:
+                owner = self._preview_owner
+                if action != PREVIEW_DISCARD and self._lost_round(session_index):
+                    return
+                if action == PREVIEW_DISCARD:
+                    if owner != session_index:
+                        return
+                    self._preview_owner = None
+                elif owner is None:
+                    self._preview_owner = session_index
+                elif owner != session_index:
+                    return
+            if self.answer_preview_callback:
+                self.answer_preview_callback(action, text)
+
+        return forward
+
+    def _lost_round(self, session_index):
+        if session_index >= len(self.sessions):
+            return False
+        session = self.sessions[session_index]
+        lost_before = self._lost_before.get(self._labels[id(session)])
+        if lost_before is None:
+            return False
+        stopped_at = session.current_turn_stopped_at()
+        return (self.clock() if stopped_at is None else stopped_at) <= lost_before
+
+    def get_metrics(self):
+        with self._lock:
+            deployments = {}
+            for label, stats in self._stats.items():
+                latency_ms = list(self._latency_ms[label])
+                deployments[label] = {
+                    "answers": stats["answers"],
+                    "wins": stats["wins"],
+                    "late": stats["late"],
+                    "stale": stats["stale"],
+                    "win_rate": stats["wins"] / self.rounds if self.rounds else 0.0,
+                    "p50_ms": percentile(latency_ms, 0.50),
+                    "p95_ms": percentile(latency_ms, 0.95),
+                }
+            return {"rounds": self.rounds, "deployments": deployments}
@@ -0,0 +1,70 @@
+"""Allocation and CPU cost of encoding input_audio_buffer.append events.
+
+Run from the repository root:
+
+    python -m benchmarks.audio_append_encoder --seconds 600
+
+Compares the original dict + base64 str + json.dumps path with
+``AudioAppendEncoder`` for the configured chunk size. Allocation is the peak
+transient memory traced while encoding one event, scaled by events per audio
+second; CPU is process time per second of audio.
+"""
+
+import argparse
+import base64
+import json
+import os
+import time
+import tracemalloc
+
+from azure_realtime import CHUNK_SIZE, SAMPLE_RATE, AudioAppendEncoder
+
+
+def legacy_append(audio_chunk):
+    return json.dumps(
+        {
+            "type": "input_audio_buffer.append",
+            "audio": base64.b64encode(audio_chunk).decode("ascii"),
+        }
+    )
+
+
+def measure(label, encode, chunk, events_per_second, seconds):
+    encode(chunk)
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline, _ = tracemalloc.get_traced_memory()
+    payload = encode(chunk)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del payload
+
+    events = int(events_per_second * seconds)
+    started_at = time.process_time()
+    for _ in range(events):
+        encode(chunk)
+    cpu_seconds = time.process_time() - started_at
+
+    transient = peak - baseline
+    print(
+        f"{label:>8}: {transient:6d} B/event  {transient * events_per_second / 1024:8.1f} KiB allocated/audio-s  "
+        f"{cpu_seconds / seconds * 1e6:7.1f} us CPU/audio-s"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=600, help="seconds of audio to encode")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="samples per append event")
+    args = parser.parse_args(argv)
+
+    chunk = os.urandom(args.chunk_size * 2)
+    events_per_second = SAMPLE_RATE / args.chunk_size
+    encoder = AudioAppendEncoder(len(chunk))
+    print(f"{events_per_second:.1f} append events per audio second, {len(chunk)} PCM bytes each")
+    measure("before", legacy_append, chunk, events_per_second, args.seconds)
+    measure("after", encoder.encode, chunk, events_per_second, args.seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Loop wakeups and capture-thread jitter of the capture-to-session audio handoff.
+
+Run from the repository root:
+
+    python -m benchmarks.audio_handoff --seconds 20
+    python -m benchmarks.audio_handoff --seconds 20 --block-ms 10
+
+A capture thread hands real-time silence to ``add_audio_chunk`` in blocks of
+``--block-ms`` while the session streams to the local stand-in server. The
+call_soon row is the handoff used before the ring: one
+``call_soon_threadsafe`` per block. The ring rows write into ``AudioRing``,
+which wakes the loop once the given watermark of audio is waiting. For each row the benchmark reports loop wakeups
+per second and how many of them the capture thread caused, the time the
+capture thread spends inside ``add_audio_chunk``, how late it reaches each
+block's deadline, and the handoff delay from ``add_audio_chunk`` until the
+block is handed to the WebSocket.
+"""
+
+import argparse
+import time
+
+from azure_realtime import (
+    AUDIO_WAKE_WATERMARK_MS,
+    SAMPLE_RATE,
+    AzureRealtimeAnswerSession,
+    build_realtime_answer_instructions,
+    percentile,
+)
+from benchmarks.turn_latency import wait_for
+from local_realtime_server import LocalRealtimeServer
+
+
+def capture_loop(session, block, block_seconds, seconds, written_at):
+    """Call ``add_audio_chunk`` on a fixed schedule; return per-block call times and lateness in microseconds."""
+    call_us = []
+    late_us = []
+    started_at = time.perf_counter()
+    for index in range(int(seconds / block_seconds)):
+        due = started_at + index * block_seconds
+        delay = due - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        before = time.perf_counter()
+        late_us.append(max(0.0, before - due) * 1e6)
+        written_at.append(before)
+        session.add_audio_chunk(block)
+        call_us.append((time.perf_counter() - before) * 1e6)
+    return call_us, late_us
+
+
+def track_handoff_delay(session, block_bytes, written_at):
+    """Wrap ``session._send_audio`` to record when each captured block reaches the WebSocket."""
+    send_audio = session._send_audio
+    delays_ms = []
+    sent = [0]
+
+    async def timed_send(payload):
+        now = time.perf_counter()
+        first_block = sent[0] // block_bytes
+        sent[0] += len(payload)
+        for index in range(first_block, sent[0] // block_bytes):
+            delays_ms.append((now - written_at[index]) * 1000)
+        return await send_audio(payload)
+
+    session._send_audio = timed_send
+    return delays_ms
+
+
+def run_handoff(audio_ring, watermark_ms, block_ms, seconds):
+    with LocalRealtimeServer() as server:
+        session = AzureRealtimeAnswerSession(
+            instructions_provider=build_realtime_answer_instructions,
+            url=server.url,
+            api_key="benchmark",
+            deployment="local-realtime",
+            audio_ring=audio_ring,
+            wake_watermark_ms=watermark_ms,
+        )
+        try:
+            if not session.start():
+                raise RuntimeError("Realtime session did not start")
+            if not wait_for(lambda: session.websocket is not None and session.audio_queue is not None, 5.0):
+                raise RuntimeError("Realtime session did not connect to the stand-in server")
+            block_samples = max(1, int(SAMPLE_RATE * block_ms / 1000))
+            written_at = []
+            delays_ms = track_handoff_delay(session, block_samples * 2, written_at)
+            before = session.get_metrics()["audio"]
+            block = bytes(block_samples * 2)
+            call_us, late_us = capture_loop(session, block, block_samples / SAMPLE_RATE, seconds, written_at)
+            wait_for(lambda: session.audio_queue.empty(), 5.0)
+            audio = session.get_metrics()["audio"]
+        finally:
+            session.cleanup()
+            if session._thread is not None:
+                session._thread.join(5.0)
+    return {
+        "wakeups_per_s": (audio["loop_wakeups"] - before["loop_wakeups"]) / seconds,
+        "writer_wakeups_per_s": (audio["writer_wakeups"] - before["writer_wakeups"]) / seconds,
+        "call_us": call_us,
+        "late_us": late_us,
+        "delay_ms": delays_ms,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=20, help="seconds of capture per row")
+    parser.add_argument("--block-ms", type=float, default=1024 / 24, help="capture block length")
+    parser.add_argument(
+        "--watermarks", type=int, nargs="+", default=[AUDIO_WAKE_WATERMARK_MS], help="ring wake watermarks in ms"
+    )
+    args = parser.parse_args(argv)
+
+    rows = [("call_soon", False, AUDIO_WAKE_WATERMARK_MS)] + [(f"ring {ms}ms", True, ms) for ms in args.watermarks]
+    for label, audio_ring, watermark_ms in rows:
+        result = run_handoff(audio_ring, watermark_ms, args.block_ms, args.seconds)
+        call_us, late_us, delay_ms = result["call_us"], result["late_us"], result["delay_ms"]
+        print(
+            f"{label:>10}: {result['wakeups_per_s']:5.1f} loop wakeups/s ({result['writer_wakeups_per_s']:5.1f} by capture)  "
+            f"add_audio_chunk p50 {percentile(call_us, 0.50):5.1f}us p99 {percentile(call_us, 0.99):6.1f}us  "
+            f"lateness p99 {percentile(late_us, 0.99) / 1000:5.2f}ms  "
+            f"handoff p50 {percentile(delay_ms, 0.50):5.2f}ms p99 {percentile(delay_ms, 0.99):5.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Cancel-to-wire latency of AzureRealtimeAnswerSession under a saturated uplink.
+
+Run from the repository root:
+
+    python -m benchmarks.cancel_latency --uplink-kbps 256 --cancels 20
+
+The stand-in server delivers client bytes no faster than ``--uplink-kbps``
+while the session streams 24 kHz noise, which still needs roughly 400 kbit/s
+after base64 and permessage-deflate, so the audio backlog fills and appends
+are coalesced up to the session limit. A ``response.cancel`` is issued from the
+session loop at a fixed interval; latency is measured from that call until the
+server reads the event. The shared-lock mode is the single send lock every
+event used before the control lane existed. The low-water mark only takes
+effect where the socket supports ``TCP_NOTSENT_LOWAT`` (Linux and macOS, not
+Windows); elsewhere the lane+lowat row matches two-lane.
+"""
+
+import argparse
+import asyncio
+import socket
+import threading
+import time
+
+import numpy as np
+
+from azure_realtime import CHUNK_SIZE, SEND_LOWAT_BYTES, AzureRealtimeAnswerSession, build_realtime_answer_instructions
+from benchmarks.common import iter_chunks, summarize_ms
+from benchmarks.turn_latency import wait_for
+from local_realtime_server import UPLINK_SOCKET_BUFFER_BYTES, LocalRealtimeServer
+
+
+def stream_audio(session, pcm, stop, sample_rate=24000):
+    """Feed ``pcm`` in a loop at real time until ``stop`` is set."""
+    chunk_seconds = CHUNK_SIZE / sample_rate
+    started_at = time.perf_counter()
+    sent = 0
+    while not stop.is_set():
+        for chunk in iter_chunks(pcm, CHUNK_SIZE):
+            if stop.is_set():
+                return
+            session.add_audio_chunk(chunk)
+            sent += 1
+            delay = started_at + sent * chunk_seconds - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+
+def run_cancels(pcm, priority_control, send_lowat_bytes, uplink_kbps=256, cancels=20, interval_ms=400, warmup_ms=1500):
+    latencies = []
+    with LocalRealtimeServer(uplink_kbps=uplink_kbps) as server:
+        session = AzureRealtimeAnswerSession(
+            instructions_provider=build_realtime_answer_instructions,
+            url=server.url,
+            api_key="benchmark",
+            deployment="local-realtime",
+            priority_control=priority_control,
+            send_lowat_bytes=send_lowat_bytes,
+        )
+        stop = threading.Event()
+        feeder = threading.Thread(target=stream_audio, args=(session, pcm, stop), daemon=True)
+        try:
+            if not session.start():
+                raise RuntimeError("Realtime session did not start")
+            if not wait_for(lambda: session.websocket is not None and session.audio_queue is not None, 5.0):
+                raise RuntimeError("Realtime session did not connect to the stand-in server")
+            sock = session.websocket.transport.get_extra_info("socket")
+            if sock is not None:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, UPLINK_SOCKET_BUFFER_BYTES)
+
+            feeder.start()
+            time.sleep(warmup_ms / 1000)
+            for index in range(cancels):
+                received = server.received_at["response.cancel"]
+                issued_at = time.perf_counter()
+                asyncio.run_coroutine_threadsafe(session._send_event({"type": "response.cancel"}), session.loop)
+                if not wait_for(lambda: len(received) > index, 30.0):
+                    raise RuntimeError("response.cancel never reached the stand-in server")
+                latencies.append((received[index] - issued_at) * 1000)
+                time.sleep(interval_ms / 1000)
+            metrics = session.get_metrics()
+        finally:
+            stop.set()
+            session.cleanup()
+            if session._thread is not None:
+                session._thread.join(5.0)
+            if feeder.is_alive():
+                feeder.join()
+    return {"latencies_ms": latencies, "audio": metrics["audio"], "control": metrics["control"]}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--uplink-kbps", type=float, default=256, help="stand-in read rate for client events")
+    parser.add_argument("--cancels", type=int, default=20, help="response.cancel events per mode")
+    parser.add_argument("--send-lowat-bytes", type=int, default=SEND_LOWAT_BYTES, help="unsent bytes the kernel may hold")
+    parser.add_argument("--interval-ms", type=float, default=400, help="pause between cancels")
+    args = parser.parse_args(argv)
+
+    pcm = np.random.default_rng(7).integers(-3000, 3000, size=24000 * 5, dtype=np.int16).tobytes()
+    modes = (
+        ("shared-lock", False, None),
+        ("two-lane", True, None),
+        ("lane+lowat", True, args.send_lowat_bytes),
+    )
+    for label, priority_control, send_lowat_bytes in modes:
+        result = run_cancels(
+            pcm,
+            priority_control,
+            send_lowat_bytes,
+            uplink_kbps=args.uplink_kbps,
+            cancels=args.cancels,
+            interval_ms=args.interval_ms,
+        )
+        audio = result["audio"]
+        print(summarize_ms(f"{label:>11} response.cancel -> server read", result["latencies_ms"]))
+        print(
+            f"{'':>11} audio sends: {audio['sends']}  max chunks/send: {audio['max_chunks_per_send']}  "
+            f"dropped: {audio['dropped_ms']:.0f} ms  control overtakes: {result['control']['overtakes']}  "
+            f"send bounded: {result['control']['send_bounded']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
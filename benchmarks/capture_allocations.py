@@ -0,0 +1,134 @@
+"""Per-block allocation and CPU cost of reading and converting desktop capture audio.
+
+Run from the repository root:
+
+    python -m benchmarks.capture_allocations --blocks 2000
+
+A simulated WASAPI recorder serves float32 packets of one device period
+through the same private ``_Recorder`` calls the capture loop uses. The
+``soundcard`` row follows ``_Recorder.record``: each packet is copied out of
+the device buffer, packets are concatenated and split, the channel map is
+reindexed, and ``float_audio_to_pcm16_bytes`` converts the block. The reused
+row reads with ``LoopbackBlockReader`` and converts with ``PCM16Converter``.
+The PyAudio rows downmix one stereo PCM16 callback buffer, first with the
+per-chunk ``np.mean(..., dtype=np.int16)`` the blocking fallback used, then
+with ``PCM16Downmixer``. Allocation is the peak transient memory traced
+while producing one block; the returned ``bytes`` are counted in every row.
+"""
+
+import argparse
+import time
+import tracemalloc
+import types
+
+import numpy as np
+
+import live_transcription
+from benchmarks.common import float_audio_to_pcm16_bytes
+from live_transcription import CHUNK, RATE, LoopbackBlockReader, PCM16Converter, PCM16Downmixer
+
+
+SIMULATED_MEDIAFOUNDATION = types.SimpleNamespace(
+    _ffi=types.SimpleNamespace(NULL=None, buffer=lambda data, size: memoryview(data)[:size]),
+    _ole32=types.SimpleNamespace(AUDCLNT_BUFFERFLAGS_DATA_DISCONTINUITY=0x1, AUDCLNT_BUFFERFLAGS_SILENT=0x2),
+)
+
+
+class SimulatedWasapiRecorder:
+    """Endless capture device that always has one ``period_frames`` packet ready."""
+
+    def __init__(self, channels, period_frames, sample_rate=RATE):
+        self.channelmap = list(range(channels))
+        self.samplerate = sample_rate
+        self.deviceperiod = (period_frames / sample_rate, period_frames / sample_rate)
+        self._idle_start_time = None
+        self._pending_chunk = np.zeros([0], dtype="float32")
+        rng = np.random.default_rng(5)
+        self._packet = (0.3 * rng.standard_normal(period_frames * channels)).astype(np.float32).tobytes()
+        self._frames = period_frames
+
+    def _capture_available_frames(self):
+        return self._frames
+
+    def _capture_buffer(self):
+        return self._packet, self._frames, 0
+
+    def _capture_release(self, _frames):
+        pass
+
+
+def soundcard_record(recorder, numframes):
+    """``soundcard.mediafoundation._Recorder.record`` with the capture calls above."""
+    channels = len(set(recorder.channelmap))
+    recorded_data = [recorder._pending_chunk]
+    recorded_frames = len(recorder._pending_chunk)
+    required_frames = numframes * channels
+    while recorded_frames < required_frames:
+        data_ptr, frames, _flags = recorder._capture_buffer()
+        packet = SIMULATED_MEDIAFOUNDATION._ffi.buffer(data_ptr, frames * 4 * channels)
+        chunk = np.frombuffer(packet, dtype="float32").copy()
+        recorder._capture_release(frames)
+        recorded_data.append(chunk)
+        recorded_frames += len(chunk)
+    recorder._pending_chunk = np.zeros([0], dtype="float32")
+    if recorded_frames > required_frames:
+        to_split = -int(recorded_frames - required_frames)
+        recorded_data[-1], recorder._pending_chunk = np.split(recorded_data[-1], [to_split])
+    data = np.reshape(np.concatenate(recorded_data), [-1, channels])
+    return data[:, recorder.channelmap]
+
+
+def measure(label, produce_block, blocks):
+    for _ in range(8):
+        produce_block()
+    tracemalloc.start()
+    peak_bytes = 0
+    for _ in range(32):
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        block = produce_block()
+        _, peak = tracemalloc.get_traced_memory()
+        peak_bytes = max(peak_bytes, peak - baseline)
+        del block
+    tracemalloc.stop()
+
+    started_at = time.process_time()
+    for _ in range(blocks):
+        produce_block()
+    cpu_us = (time.process_time() - started_at) / blocks * 1e6
+    print(f"{label:>10}: {peak_bytes:7d} B allocated/block  {cpu_us:7.1f} us CPU/block")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--blocks", type=int, default=2000, help="blocks to time per row")
+    parser.add_argument("--channels", type=int, default=1, help="channels delivered by the recorder")
+    parser.add_argument("--period-frames", type=int, default=RATE // 100, help="frames per WASAPI packet")
+    args = parser.parse_args(argv)
+
+    original = live_transcription._sc_mediafoundation
+    live_transcription._sc_mediafoundation = SIMULATED_MEDIAFOUNDATION
+    try:
+        recorder = SimulatedWasapiRecorder(args.channels, args.period_frames)
+        measure("soundcard", lambda: float_audio_to_pcm16_bytes(soundcard_record(recorder, CHUNK)), args.blocks)
+
+        reader = LoopbackBlockReader(SimulatedWasapiRecorder(args.channels, args.period_frames), CHUNK)
+        converter = PCM16Converter(args.channels, CHUNK)
+        measure("reused", lambda: converter.convert(reader.read()), args.blocks)
+    finally:
+        live_transcription._sc_mediafoundation = original
+
+    stereo = np.random.default_rng(6).integers(-20000, 20000, size=CHUNK * 2, dtype=np.int16).tobytes()
+
+    def mean_downmix():
+        frames = np.frombuffer(stereo, dtype=np.int16).reshape(-1, 2)
+        return np.mean(frames, axis=1, dtype=np.int16).tobytes()
+
+    downmixer = PCM16Downmixer(2, CHUNK)
+    measure("np.mean", mean_downmix, args.blocks)
+    measure("downmixer", lambda: downmixer.process(stereo), args.blocks)
+    print(f"{CHUNK} frames per block, {args.channels} channel(s), {args.period_frames}-frame packets")
+
+
+if __name__ == "__main__":
+    main()
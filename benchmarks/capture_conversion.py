@@ -0,0 +1,59 @@
+"""CPU cost of turning captured float frames into 24 kHz mono PCM16.
+
+Run from the repository root:
+
+    python -m benchmarks.capture_conversion --seconds 60
+
+The baseline is the default capture path, where WASAPI has already converted
+the mix to 24 kHz mono and the client only clips and scales it. The native
+rows feed stereo frames at common engine mix rates through
+``PolyphaseResampler`` in capture-sized blocks, which is the work
+``AUDIO_CAPTURE_NATIVE_FORMAT`` moves from the audio engine into the client.
+Conversion done inside the Windows audio engine is not visible to this process,
+so the baseline row is a lower bound for the default path.
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.common import float_audio_to_pcm16_bytes
+from live_transcription import CHUNK, RATE, PolyphaseResampler
+
+
+def capture_frames(sample_rate, seconds, channels):
+    t = np.arange(int(sample_rate * seconds)) / sample_rate
+    signal = 0.3 * np.sin(2 * np.pi * 440 * t) + 0.05 * np.random.default_rng(3).standard_normal(len(t))
+    return np.repeat(signal.astype(np.float32)[:, None], channels, axis=1)
+
+
+def cpu_ms_per_audio_second(convert, frames, block_frames, seconds):
+    started_at = time.process_time()
+    for start in range(0, len(frames), block_frames):
+        convert(frames[start : start + block_frames])
+    return (time.process_time() - started_at) * 1000 / seconds
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=60, help="seconds of audio to convert per row")
+    parser.add_argument("--channels", type=int, default=2, help="channels in the native mix format")
+    args = parser.parse_args(argv)
+
+    frames = capture_frames(RATE, args.seconds, 1)
+    cost = cpu_ms_per_audio_second(float_audio_to_pcm16_bytes, frames, CHUNK, args.seconds)
+    print(f"{'24000 Hz x1 (engine-converted)':>32}: {cost:6.2f} ms CPU per audio second")
+    for native_rate in (44100, 48000, 96000):
+        resampler = PolyphaseResampler(native_rate, RATE, args.channels)
+        frames = capture_frames(native_rate, args.seconds, args.channels)
+        block_frames = round(CHUNK * native_rate / RATE)
+        cost = cpu_ms_per_audio_second(resampler.process, frames, block_frames, args.seconds)
+        print(
+            f"{f'{native_rate} Hz x{args.channels} (native)':>32}: {cost:6.2f} ms CPU per audio second  "
+            f"({resampler.up}/{resampler.down}, {resampler.taps} taps per output)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Replay a recorded capture session against the local Realtime stand-in server.
+
+Record an interview by setting ``AUDIO_CAPTURE_RECORD_DIR`` before starting the
+app, then run from the repository root:
+
+    python -m benchmarks.capture_replay captures/capture-20260301-101500.wav --save before.json
+    python -m benchmarks.capture_replay captures/capture-20260301-101500.wav --speed 4 --baseline before.json
+
+Captures hold the audio from before preprocessing, so the replayer publishes
+each recorded block at its recorded offset divided by ``--speed`` through the
+same noise gate, AGC, end-of-turn predictor and silence gate as the app. Set
+the same ``AUDIO_*`` variables the recorded session used to reproduce what it
+uploaded; stalls and bursts in the original capture are reproduced too. Without a capture path a
+synthetic recording with a capture stall every few turns is generated.
+``--save`` writes the latency summary as JSON and ``--baseline`` prints the
+change against a summary saved from another build.
+"""
+
+import argparse
+import json
+import os
+import tempfile
+
+from azure_realtime import CHUNK_SIZE, percentile
+from benchmarks.common import iter_chunks, summarize_ms, synthetic_speech
+from benchmarks.turn_latency import run_turn_latency
+from capture_recording import CaptureRecorder, CaptureRecording
+
+
+SUMMARY_FIELDS = ("answer_ms", "first_preview_ms")
+
+
+def write_synthetic_capture(path, turns=10, sample_rate=24000, stall_every=3, stall_ms=400):
+    """Record synthetic speech on a capture schedule with a stall, then a burst, every few turns."""
+    pcm = synthetic_speech(turns=turns, sample_rate=sample_rate)
+    chunk_seconds = CHUNK_SIZE / sample_rate
+    turn_chunks = max(1, int(2.7 * sample_rate / CHUNK_SIZE))
+    clock_value = [0.0]
+    with CaptureRecorder(path, sample_rate, clock=lambda: clock_value[0]) as recorder:
+        for index, chunk in enumerate(iter_chunks(pcm, CHUNK_SIZE)):
+            due = index * chunk_seconds
+            stalled = stall_every and (index // turn_chunks) % stall_every == stall_every - 1
+            if stalled and index % turn_chunks < stall_ms / 1000 / chunk_seconds:
+                due = (index - index % turn_chunks) * chunk_seconds + stall_ms / 1000
+            clock_value[0] = max(clock_value[0], due)
+            recorder.write(chunk)
+    return path
+
+
+def summarize(result, capture, speed):
+    def stats(values):
+        return {
+            "n": len(values),
+            "p50": percentile(values, 0.50) if values else None,
+            "p95": percentile(values, 0.95) if values else None,
+            "p99": percentile(values, 0.99) if values else None,
+            "max": max(values) if values else None,
+        }
+
+    return {
+        "capture": capture.path,
+        "duration_s": capture.duration_s,
+        "speed": speed,
+        "turns": result["turns"],
+        "unmatched": len(result["unmatched"]),
+        "replay_lag_ms": result["replay_lag_ms"],
+        "answer_ms": stats(result["latencies_ms"]),
+        "first_preview_ms": stats(result["first_preview_ms"]),
+    }
+
+
+def compare(summary, baseline):
+    lines = []
+    for field in SUMMARY_FIELDS:
+        for key in ("p50", "p95", "p99"):
+            current, previous = summary[field][key], baseline.get(field, {}).get(key)
+            if current is None or previous is None:
+                continue
+            change = (current - previous) / previous if previous else 0.0
+            lines.append(f"  {field} {key}: {previous:.1f}ms -> {current:.1f}ms ({change:+.1%})")
+    if summary["turns"] != baseline.get("turns"):
+        lines.append(f"  turns detected: {baseline.get('turns')} -> {summary['turns']}")
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("capture", nargs="?", help="capture WAV written by AUDIO_CAPTURE_RECORD_DIR")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed as a multiple of real time")
+    parser.add_argument("--turns", type=int, default=10, help="synthetic turns when no capture is given")
+    parser.add_argument("--response-delay-ms", type=float, default=80)
+    parser.add_argument("--prefill-us-per-token", type=float, default=0)
+    parser.add_argument("--save", help="write the latency summary to this JSON file")
+    parser.add_argument("--baseline", help="JSON summary from an earlier run to compare against")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as scratch:
+        path = args.capture or write_synthetic_capture(os.path.join(scratch, "synthetic.wav"), turns=args.turns)
+        capture = CaptureRecording(path)
+        result = run_turn_latency(
+            None,
+            speed=args.speed,
+            capture=capture,
+            sample_rate=capture.sample_rate,
+            response_delay_ms=args.response_delay_ms,
+            prefill_us_per_token=args.prefill_us_per_token,
+        )
+        summary = summarize(result, capture, args.speed)
+
+    print(f"{len(capture.index)} blocks, {summary['duration_s']:.1f}s of capture at {args.speed:g}x")
+    print(summarize_ms("speech_stopped -> answer_update_callback", result["latencies_ms"]))
+    print(summarize_ms("speech_stopped -> first preview word", result["first_preview_ms"]))
+    print(
+        f"turns detected: {summary['turns']}  unmatched answers: {summary['unmatched']}  "
+        f"worst replay lag: {summary['replay_lag_ms']:.1f}ms"
+    )
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+        print(f"against {args.baseline}:")
+        for line in compare(summary, baseline):
+            print(line)
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as save_file:
+            json.dump(summary, save_file, indent=2)
+        print(f"saved summary to {args.save}")
+
+
+if __name__ == "__main__":
+    main()
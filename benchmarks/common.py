@@ -0,0 +1,54 @@
+import wave
+
+import numpy as np
+
+from audio_sources import synthetic_speech
+from azure_realtime import percentile
+
+
+SAMPLE_RATE = 24000
+
+
+def load_pcm16(path, sample_rate=SAMPLE_RATE):
+    """Load mono PCM16 from a WAV file or a raw 24 kHz mono PCM16 file."""
+    if str(path).lower().endswith(".wav"):
+        with wave.open(str(path), "rb") as wav_file:
+            if wav_file.getsampwidth() != 2:
+                raise ValueError(f"{path} must contain 16-bit PCM")
+            if wav_file.getframerate() != sample_rate:
+                raise ValueError(f"{path} must be recorded at {sample_rate} Hz")
+            channels = wav_file.getnchannels()
+            frames = wav_file.readframes(wav_file.getnframes())
+        if channels == 1:
+            return frames
+        samples = np.frombuffer(frames, dtype=np.int16).reshape(-1, channels)
+        return samples.mean(axis=1).astype(np.int16).tobytes()
+
+    with open(path, "rb") as raw_file:
+        data = raw_file.read()
+    return data[: len(data) - len(data) % 2]
+
+
+def float_audio_to_pcm16_bytes(audio_data):
+    """Downmix and convert float capture frames to PCM16 the way the capture loop did before PCM16Converter."""
+    if len(audio_data.shape) > 1 and audio_data.shape[1] > 1:
+        audio_data = np.mean(audio_data, axis=1)
+    audio_data = np.asarray(audio_data, dtype=np.float32).flatten()
+    audio_data = np.clip(audio_data, -1.0, 1.0)
+    return (audio_data * 32767).astype(np.int16).tobytes()
+
+
+def iter_chunks(pcm, chunk_size):
+    chunk_bytes = chunk_size * 2
+    for start in range(0, len(pcm) - chunk_bytes + 1, chunk_bytes):
+        yield pcm[start : start + chunk_bytes]
+
+
+def summarize_ms(label, values):
+    if not values:
+        return f"{label}: no samples"
+    return (
+        f"{label}: n={len(values)} p50={percentile(values, 0.50):.1f}ms "
+        f"p95={percentile(values, 0.95):.1f}ms p99={percentile(values, 0.99):.1f}ms "
+        f"max={max(values):.1f}ms"
+    )
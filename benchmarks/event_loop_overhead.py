@@ -0,0 +1,161 @@
+"""Event-loop CPU cost of the Realtime worker thread, per audio second and per server event.
+
+Run from the repository root:
+
+    python -m benchmarks.event_loop_overhead --audio-seconds 10 --turns 500
+
+For each available loop implementation (asyncio, and uvloop when installed)
+the session streams real-time audio to the local stand-in server, then
+receives a burst of synthetic server events over a local WebSocket. CPU time
+is read with ``time.thread_time`` on the session's own loop thread, so the
+stand-in and the feeding thread are not counted.
+"""
+
+import argparse
+import asyncio
+import threading
+import time
+
+import websockets
+
+from azure_realtime import AzureRealtimeAnswerSession, build_realtime_answer_instructions, uvloop
+from benchmarks.common import synthetic_speech
+from benchmarks.event_replay import synthetic_stream
+from benchmarks.turn_latency import feed_pcm, wait_for
+from local_realtime_server import LocalRealtimeServer
+
+
+class EventBurstServer:
+    """WebSocket server that sends a fixed list of raw events once ``burst`` is called, then reads until close."""
+
+    def __init__(self, messages):
+        self.messages = messages
+        self.url = None
+        self.loop = None
+        self._ready = threading.Event()
+        self._stop = None
+        self._go = None
+        self._thread = None
+
+    def burst(self):
+        self.loop.call_soon_threadsafe(self._go.set)
+
+    async def _handle(self, websocket, *_args):
+        await self._go.wait()
+        for message in self.messages:
+            await websocket.send(message)
+        async for _message in websocket:
+            pass
+
+    async def _serve(self):
+        self._stop = self.loop.create_future()
+        self._go = asyncio.Event()
+        async with websockets.serve(self._handle, "127.0.0.1", 0, max_size=None) as server:
+            self.url = f"ws://127.0.0.1:{server.sockets[0].getsockname()[1]}/openai/v1/realtime"
+            self._ready.set()
+            await self._stop
+
+    def __enter__(self):
+        def run():
+            self.loop = asyncio.new_event_loop()
+            self.loop.run_until_complete(self._serve())
+            self.loop.close()
+
+        self._thread = threading.Thread(target=run, daemon=True)
+        self._thread.start()
+        self._ready.wait(5.0)
+        return self
+
+    def __exit__(self, *_exc_info):
+        self.loop.call_soon_threadsafe(self._stop.set_result, None)
+        self._thread.join(5.0)
+
+
+def on_loop(session, function):
+    async def call():
+        return function()
+
+    return asyncio.run_coroutine_threadsafe(call(), session.loop).result(5.0)
+
+
+def loop_cpu_seconds(session):
+    return on_loop(session, time.thread_time)
+
+
+def start_session(url, event_loop):
+    session = AzureRealtimeAnswerSession(
+        instructions_provider=build_realtime_answer_instructions,
+        url=url,
+        api_key="benchmark",
+        deployment="local-realtime",
+        event_loop=event_loop,
+    )
+    if not session.start():
+        raise RuntimeError("Realtime session did not start")
+    if not wait_for(lambda: session.websocket is not None and session.audio_queue is not None, 5.0):
+        raise RuntimeError("Realtime session did not connect")
+    return session
+
+
+def stop_session(session):
+    session.cleanup()
+    session._thread.join(5.0)
+
+
+def audio_cost_ms(event_loop, pcm, sample_rate=24000):
+    with LocalRealtimeServer(sample_rate=sample_rate) as server:
+        session = start_session(server.url, event_loop)
+        try:
+            wait_for(lambda: server.received_counts["session.update"] >= 1, 5.0)
+            cpu_before = loop_cpu_seconds(session)
+            feed_pcm(session, pcm, sample_rate=sample_rate)
+            wait_for(lambda: session.audio_queue.empty() and not session._pending_audio, 5.0)
+            cpu_ms = (loop_cpu_seconds(session) - cpu_before) * 1000
+            sends = session.get_metrics()["audio"]["sends"]
+        finally:
+            stop_session(session)
+    return cpu_ms / (len(pcm) / 2 / sample_rate), sends
+
+
+def event_cost_us(event_loop, messages):
+    with EventBurstServer(messages) as server:
+        session = start_session(server.url, event_loop)
+        try:
+            cpu_before = loop_cpu_seconds(session)
+            server.burst()
+
+            def processed():
+                events = on_loop(session, lambda: dict(session._event_stats))
+                return events.get("decoded", 0) + events.get("skipped", 0) >= len(messages)
+
+            if not wait_for(processed, 60.0):
+                raise RuntimeError("session did not process every server event")
+            cpu_us = (loop_cpu_seconds(session) - cpu_before) * 1e6
+        finally:
+            stop_session(session)
+    return cpu_us / len(messages)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--audio-seconds", type=float, default=10.0, help="real-time audio streamed per loop")
+    parser.add_argument("--turns", type=int, default=500, help="synthetic answered turns in the event burst")
+    args = parser.parse_args(argv)
+
+    pcm = synthetic_speech(turns=max(1, int(args.audio_seconds / 2.7 + 0.999)))
+    pcm = pcm[: int(args.audio_seconds * 24000) * 2]
+    messages = synthetic_stream(args.turns)
+    loops = ["asyncio"] + (["uvloop"] if uvloop is not None else [])
+    if uvloop is None:
+        print("uvloop is not installed; measuring asyncio only")
+    for event_loop in loops:
+        per_audio_second_ms, sends = audio_cost_ms(event_loop, pcm)
+        per_event_us = event_cost_us(event_loop, messages)
+        print(
+            f"{event_loop:>8}: {per_audio_second_ms:6.2f} ms CPU per audio second ({sends} appends)  "
+            f"{per_event_us:6.1f} us CPU per server event ({len(messages)} events)"
+        )
+
+
+if __name__ == "__main__":
+    main()
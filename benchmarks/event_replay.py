@@ -0,0 +1,169 @@
+"""Server event throughput of AzureRealtimeAnswerSession.process_responses.
+
+Run from the repository root:
+
+    python -m benchmarks.event_replay --turns 2000
+    python -m benchmarks.turn_latency --turns 10 --record-events events.jsonl
+    python -m benchmarks.event_replay --events events.jsonl --repeat 200
+
+Replays a recorded JSONL stream of raw server events, or a synthetic stream
+shaped like a Realtime answer turn, through the session. The full-parse modes
+decode every event before dispatch; the fast path sniffs the leading
+``"type"`` and skips events the session has no handler for.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from azure_realtime import (
+    ANSWER_TOOL_NAME,
+    AzureRealtimeAnswerSession,
+    build_realtime_answer_instructions,
+    decode_server_event,
+    orjson,
+)
+
+
+class ReplayWebSocket:
+    def __init__(self, raw_messages):
+        self._messages = iter(raw_messages)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._messages)
+        except StopIteration:
+            raise StopAsyncIteration from None
+
+    async def send(self, _payload, text=None):
+        return None
+
+    async def close(self):
+        return None
+
+
+def _event(event_type, **fields):
+    return json.dumps({"type": event_type, "event_id": "event_0", **fields}, separators=(",", ":"))
+
+
+def synthetic_stream(turns, answer_chars=600, delta_chars=16):
+    """Server events for ``turns`` answered interviewer turns, in Realtime order."""
+    session_payload = {"type": "realtime", "instructions": build_realtime_answer_instructions()}
+    messages = [_event("session.created", session=session_payload), _event("session.updated", session=session_payload)]
+    answer = ("I would start with the simplest design that meets the constraints. " * 20)[:answer_chars]
+    for index in range(1, turns + 1):
+        item_id = f"item_{index}"
+        response_id = f"resp_{index}"
+        call_id = f"call_{index}"
+        arguments = json.dumps({"action": "append", "text": answer})
+        function_item = {"id": f"fc_{index}", "type": "function_call", "name": ANSWER_TOOL_NAME, "call_id": call_id}
+        messages.extend(
+            [
+                _event("input_audio_buffer.speech_started", item_id=item_id, audio_start_ms=index * 4000),
+                _event("input_audio_buffer.speech_stopped", item_id=item_id, audio_end_ms=index * 4000 + 2500),
+                _event("input_audio_buffer.committed", item_id=item_id),
+                _event("conversation.item.added", item={"id": item_id, "type": "message", "role": "user"}),
+                _event("conversation.item.done", item={"id": item_id, "type": "message", "role": "user"}),
+                _event(
+                    "response.created",
+                    response={"id": response_id, "status": "in_progress", "metadata": {"client_turn_id": f"turn-{index}"}},
+                ),
+                _event("rate_limits.updated", rate_limits=[{"name": "tokens", "limit": 100000, "remaining": 99000}]),
+                _event("response.output_item.added", response_id=response_id, item=function_item),
+                _event("conversation.item.added", item=function_item),
+            ]
+        )
+        for start in range(0, len(arguments), delta_chars):
+            messages.append(
+                _event(
+                    "response.function_call_arguments.delta",
+                    response_id=response_id,
+                    item_id=function_item["id"],
+                    call_id=call_id,
+                    delta=arguments[start : start + delta_chars],
+                )
+            )
+        messages.extend(
+            [
+                _event(
+                    "response.function_call_arguments.done",
+                    response_id=response_id,
+                    item_id=function_item["id"],
+                    call_id=call_id,
+                    name=ANSWER_TOOL_NAME,
+                    arguments=arguments,
+                ),
+                _event("response.output_item.done", response_id=response_id, item={**function_item, "arguments": arguments}),
+                _event("conversation.item.done", item={**function_item, "arguments": arguments}),
+                _event(
+                    "response.done",
+                    response={
+                        "id": response_id,
+                        "status": "completed",
+                        "usage": {"input_tokens": 1800, "output_tokens": 160},
+                    },
+                ),
+            ]
+        )
+    return messages
+
+
+async def full_parse(session, messages, decoder):
+    async for raw_message in ReplayWebSocket(messages):
+        await session.handle_server_event(decoder(raw_message))
+
+
+async def fast_path(session, messages):
+    session.websocket = ReplayWebSocket(messages)
+    await session.process_responses()
+
+
+def replay(messages, mode):
+    session = AzureRealtimeAnswerSession(
+        instructions_provider=build_realtime_answer_instructions,
+        url="ws://replay.invalid",
+        api_key="benchmark",
+        deployment="local-realtime",
+    )
+    session.websocket = ReplayWebSocket([])
+    session.auto_answer_enabled = True
+    if mode == "stdlib":
+        coroutine = full_parse(session, messages, json.loads)
+    elif mode == "orjson":
+        coroutine = full_parse(session, messages, orjson.loads)
+    else:
+        coroutine = fast_path(session, messages)
+    started_at = time.perf_counter()
+    asyncio.run(coroutine)
+    return time.perf_counter() - started_at, session.get_metrics()["events"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", help="JSONL file of raw server events; synthetic turns when omitted")
+    parser.add_argument("--turns", type=int, default=2000, help="synthetic answered turns")
+    parser.add_argument("--repeat", type=int, default=1, help="times to replay the recorded stream")
+    args = parser.parse_args(argv)
+
+    if args.events:
+        with open(args.events, encoding="utf-8") as events_file:
+            recorded = [line.rstrip("\n") for line in events_file if line.strip()]
+        messages = recorded * args.repeat
+    else:
+        messages = synthetic_stream(args.turns)
+    total_bytes = sum(len(message) for message in messages)
+    print(f"{len(messages)} events, {total_bytes / 1024:.0f} KiB, decoder={decode_server_event.__module__}:{'orjson' if orjson else 'json'}")
+
+    modes = ["stdlib"] + (["orjson"] if orjson is not None else []) + ["fast-path"]
+    for mode in modes:
+        elapsed, events = replay(messages, mode)
+        detail = f"  decoded={events['decoded']} skipped={events['skipped']}" if mode == "fast-path" else ""
+        print(f"{mode:>10}: {len(messages) / elapsed:10.0f} events/s  {elapsed * 1000:8.1f} ms{detail}")
+
+
+if __name__ == "__main__":
+    main()
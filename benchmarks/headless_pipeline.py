@@ -0,0 +1,120 @@
+"""Headless run of the whole LiveAudioManager pipeline against the local stand-in server.
+
+Run from the repository root:
+
+    python -m benchmarks.headless_pipeline --turns 10
+    python -m benchmarks.headless_pipeline --source file:interview.wav
+    python -m benchmarks.headless_pipeline --turns 60 --max-speed
+
+The manager starts exactly as the overlay starts it, so the silence gate,
+speculative turn prediction and capture recording follow the environment,
+but its audio comes from ``--source`` (an ``AUDIO_SOURCE`` spec, synthetic
+speech by default) and the primary session connects to the stand-in server.
+No audio device or Windows loopback is needed. Latency is measured from
+``input_audio_buffer.speech_stopped`` to the manager's answer callback, and
+the capture line shows how long reads blocked and how far capture fell
+behind the wall clock.
+``--max-speed`` reads the source as fast as the pipeline accepts it; the
+session's bounded backlog then drops audio and later turns supersede earlier
+answers, so it measures capture-side throughput rather than answer latency.
+"""
+
+import argparse
+import threading
+import time
+
+from audio_sources import SyntheticAudioSource
+from benchmarks.common import summarize_ms
+from benchmarks.turn_latency import wait_for
+from live_transcription import LiveAudioManager, create_audio_source
+from local_realtime_server import LocalRealtimeServer
+
+
+def run_pipeline(source, settle_seconds=5.0):
+    latencies = []
+    unmatched = []
+    lock = threading.Lock()
+
+    with LocalRealtimeServer() as server:
+
+        def answer_update(action, text):
+            applied_at = time.perf_counter()
+            turn = server.turn_for_answer(text)
+            with lock:
+                if turn is None or turn.speech_stopped_at is None:
+                    unmatched.append((action, text))
+                else:
+                    latencies.append((applied_at - turn.speech_stopped_at) * 1000)
+
+        manager = LiveAudioManager(
+            answer_update_callback=answer_update,
+            audio_source=source,
+            session_options={"url": server.url, "api_key": "local-benchmark", "deployment": "local-realtime"},
+        )
+        if not manager.start():
+            raise RuntimeError("Realtime session did not start")
+        try:
+            session = manager.realtime_session
+            if not wait_for(lambda: session.websocket is not None and session.audio_queue is not None, 5.0):
+                raise RuntimeError("Realtime session did not connect to the stand-in server")
+            manager.set_auto_answer_enabled(True)
+            started_at = time.perf_counter()
+            manager.capture_thread.join()
+            wall_seconds = time.perf_counter() - started_at
+
+            def settled():
+                stopped = sum(1 for turn in server.turns if turn.speech_stopped_at is not None)
+                with lock:
+                    return len(latencies) + len(unmatched) >= stopped
+
+            wait_for(settled, settle_seconds)
+            metrics = manager.get_metrics()
+        finally:
+            manager.cleanup()
+            session._thread.join(5.0)
+
+        return {
+            "latencies_ms": latencies,
+            "unmatched": unmatched,
+            "turns": len(server.turns),
+            "audio_seconds": source.frames_read / source.sample_rate,
+            "wall_seconds": wall_seconds,
+            "metrics": metrics,
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--source", default="synthetic", help="AUDIO_SOURCE spec to capture from")
+    parser.add_argument("--turns", type=int, default=10, help="turns of synthetic speech")
+    parser.add_argument("--max-speed", action="store_true", help="read file and synthetic sources without pacing")
+    args = parser.parse_args(argv)
+
+    realtime = not args.max_speed
+    if args.source == "synthetic":
+        source = SyntheticAudioSource(turns=args.turns, realtime=realtime)
+    else:
+        source = create_audio_source(args.source, realtime=realtime)
+        if source is None:
+            parser.error("--source must name a file, pipe, synthetic or monitor source")
+
+    result = run_pipeline(source)
+    audio = result["metrics"].get("audio", {})
+    print(f"source: {source.name}")
+    print(
+        f"streamed {result['audio_seconds']:.1f}s of audio in {result['wall_seconds']:.1f}s "
+        f"({result['audio_seconds'] / max(result['wall_seconds'], 1e-9):.1f}x real time), "
+        f"{audio.get('sends', 0)} appends, {audio.get('dropped_ms', 0.0):.0f}ms dropped"
+    )
+    print(f"turns detected by the stand-in: {result['turns']}, unmatched answers: {len(result['unmatched'])}")
+    print(summarize_ms("speech_stopped -> answer", result["latencies_ms"]))
+    capture = result["metrics"].get("capture", {})
+    if "read_ms" in capture:
+        print(
+            f"capture: read p99 {capture['read_ms']['p99']:.1f}ms max {capture['read_ms']['max']:.1f}ms, "
+            f"lag max {capture['lag_ms']['max']:.1f}ms, {capture['stalls']} stalls"
+        )
+
+
+if __name__ == "__main__":
+    main()
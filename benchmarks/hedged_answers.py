@@ -0,0 +1,146 @@
+"""Answer latency from one Realtime deployment versus two hedged deployments.
+
+Run from the repository root:
+
+    python -m benchmarks.hedged_answers --turns 20 --jitter-ms 150
+
+Each deployment is a local stand-in server with the same base response delay
+and an exponentially distributed extra delay, seeded differently per server,
+so the two regions are equally fast on average but have independent slow
+turns. Latency is measured from the first ``speech_stopped`` either server
+sent for a turn to ``answer_update_callback``.
+"""
+
+import argparse
+import contextlib
+import threading
+import time
+
+from azure_realtime import AzureRealtimeAnswerSession, HedgedAnswerCoordinator, build_realtime_answer_instructions
+from benchmarks.common import summarize_ms, synthetic_speech
+from benchmarks.turn_latency import feed_pcm, wait_for
+from local_realtime_server import LocalRealtimeServer
+
+
+class FanOut:
+    def __init__(self, sessions):
+        self.sessions = sessions
+
+    def add_audio_chunk(self, chunk):
+        for session in self.sessions:
+            session.add_audio_chunk(chunk)
+
+
+def answer_script(turn_index):
+    return "append", f"Answer for interviewer turn {turn_index}."
+
+
+def run_hedged(pcm, deployments, response_delay_ms=80, jitter_ms=150, speed=1.0, settle_seconds=5.0):
+    latencies = []
+    updates = []
+    lock = threading.Lock()
+    coordinator = HedgedAnswerCoordinator() if deployments > 1 else None
+
+    with contextlib.ExitStack() as stack:
+        servers = [
+            stack.enter_context(
+                LocalRealtimeServer(
+                    response_delay_ms=response_delay_ms,
+                    response_jitter_ms=jitter_ms,
+                    seed=index,
+                    answer_script=answer_script,
+                )
+            )
+            for index in range(1, deployments + 1)
+        ]
+
+        def answer_update(action, text):
+            with lock:
+                updates.append(text)
+                index = int(text.rstrip(".").rsplit(" ", 1)[-1])
+                stopped = [
+                    server.turns[index - 1].speech_stopped_at
+                    for server in servers
+                    if len(server.turns) >= index and server.turns[index - 1].speech_stopped_at is not None
+                ]
+                if stopped:
+                    latencies.append((time.perf_counter() - min(stopped)) * 1000)
+
+        sessions = []
+        for index, server in enumerate(servers, start=1):
+            session = AzureRealtimeAnswerSession(
+                answer_update_callback=answer_update,
+                instructions_provider=build_realtime_answer_instructions,
+                url=server.url,
+                api_key="benchmark",
+                deployment=f"region-{index}",
+                answer_gate=coordinator.admit_answer if coordinator else None,
+            )
+            if coordinator is not None:
+                coordinator.attach(session)
+            sessions.append(session)
+        try:
+            for session in sessions:
+                if not session.start():
+                    raise RuntimeError("Realtime session did not start")
+            if not wait_for(lambda: all(s.websocket is not None and s.audio_queue is not None for s in sessions), 5.0):
+                raise RuntimeError("Realtime sessions did not connect to the stand-in servers")
+            for session in sessions:
+                session.set_auto_answer_enabled(True)
+            feed_pcm(FanOut(sessions), pcm, speed=speed, sample_rate=servers[0].sample_rate)
+
+            def settled():
+                stopped = sum(1 for turn in servers[0].turns if turn.speech_stopped_at is not None)
+                with lock:
+                    return len(updates) >= stopped
+
+            wait_for(settled, settle_seconds)
+        finally:
+            for session in sessions:
+                session.cleanup()
+            for session in sessions:
+                session._thread.join(5.0)
+
+        return {
+            "latencies_ms": latencies,
+            "answers": len(updates),
+            "duplicates": len(updates) - len(set(updates)),
+            "turns": len(servers[0].turns),
+            "cancels": sum(server.received_counts["response.cancel"] for server in servers),
+            "hedge": coordinator.get_metrics() if coordinator else None,
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=20, help="synthetic interviewer turns")
+    parser.add_argument("--response-delay-ms", type=float, default=80)
+    parser.add_argument("--jitter-ms", type=float, default=150, help="mean of the exponential extra response delay")
+    parser.add_argument("--speed", type=float, default=1.0, help="feed speed as a multiple of real time")
+    args = parser.parse_args(argv)
+
+    pcm = synthetic_speech(turns=args.turns)
+    for deployments in (1, 2):
+        result = run_hedged(
+            pcm,
+            deployments,
+            response_delay_ms=args.response_delay_ms,
+            jitter_ms=args.jitter_ms,
+            speed=args.speed,
+        )
+        label = "single" if deployments == 1 else "hedged"
+        print(summarize_ms(f"{label:>6} speech_stopped -> answer_update_callback", result["latencies_ms"]))
+        print(
+            f"{'':>6} turns: {result['turns']}  answers: {result['answers']}  "
+            f"duplicates: {result['duplicates']}  response.cancel sent: {result['cancels']}"
+        )
+        if result["hedge"]:
+            for name, stats in result["hedge"]["deployments"].items():
+                print(
+                    f"{'':>6} {name}: win_rate={stats['win_rate']:.0%} answers={stats['answers']} "
+                    f"p50={stats['p50_ms']:.0f}ms p95={stats['p95_ms']:.0f}ms"
+                )
+
+
+if __name__ == "__main__":
+    main()
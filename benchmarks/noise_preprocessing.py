@@ -0,0 +1,139 @@
+"""False response cancels from background noise, with and without the noise gate and AGC.
+
+Run from the repository root:
+
+    python -m benchmarks.noise_preprocessing --turns 8
+    python -m benchmarks.noise_preprocessing --speech-db -6 --noise-dbfs -36
+    python -m benchmarks.noise_preprocessing captures/capture-20260301-101500.wav
+
+A quiet synthetic interviewer (``--speech-db`` relative to the benchmark
+speech) is mixed with fan noise: pink noise above 50 Hz, a 120 Hz blade tone
+and a slow +-3 dB swell at ``--noise-dbfs``. The mix is recorded as a capture
+with a noise-only lead-in, then each row runs every block through that
+row's preprocessing and replays the result against the stand-in server at
+real time. The stand-in's energy VAD reacts to noise the way a real VAD does
+to fans and codec artifacts: spurious ``speech_started`` events cancel
+in-flight answers and noise swells hold turns open. Clean speech replayed at
+real time causes no cancels, so every ``response.cancel`` the stand-in
+receives counts as a false cancel. With a capture path the recorded audio is
+used as is, and the detected turn count has no ground truth to compare with.
+Captures are recorded before the noise gate, AGC and silence gate run, so a
+capture made with preprocessing enabled is still processed only once here.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from audio_sources import synthetic_speech
+from azure_realtime import CHUNK_SIZE, percentile
+from benchmarks.turn_latency import run_turn_latency
+from capture_recording import CaptureRecorder, CaptureRecording
+from live_transcription import AutomaticGainControl, SpectralNoiseGate
+
+
+SAMPLE_RATE = 24000
+ROWS = (
+    ("unprocessed", ()),
+    ("agc", (AutomaticGainControl,)),
+    ("noise gate", (SpectralNoiseGate,)),
+    ("noise gate + agc", (SpectralNoiseGate, AutomaticGainControl)),
+)
+
+
+def fan_noise(samples, dbfs, sample_rate=SAMPLE_RATE, seed=3):
+    rng = np.random.default_rng(seed)
+    spectrum = np.fft.rfft(rng.standard_normal(samples))
+    freqs = np.fft.rfftfreq(samples, 1 / sample_rate)
+    spectrum *= np.where(freqs < 50, 0.0, 1 / np.sqrt(np.maximum(freqs, 50) / 50))
+    noise = np.fft.irfft(spectrum, samples)
+    noise /= noise.std()
+    t = np.arange(samples) / sample_rate
+    noise += 0.5 * np.sin(2 * np.pi * 120 * t) + 0.25 * np.sin(2 * np.pi * 240 * t)
+    noise *= 10 ** (3 * np.sin(2 * np.pi * t / 7.0) / 20)
+    return noise / noise.std() * 32768 * 10 ** (dbfs / 20)
+
+
+def noisy_interview(turns, speech_db, noise_dbfs, lead_in_s=2.0, sample_rate=SAMPLE_RATE):
+    speech = np.frombuffer(synthetic_speech(turns=turns, sample_rate=sample_rate), dtype=np.int16)
+    speech = np.concatenate((np.zeros(int(lead_in_s * sample_rate)), speech * 10 ** (speech_db / 20)))
+    mixed = speech + fan_noise(len(speech), noise_dbfs, sample_rate)
+    return np.clip(mixed, -32768, 32767).astype(np.int16).tobytes()
+
+
+def write_capture(path, blocks, sample_rate=SAMPLE_RATE):
+    """Record ``(seconds, block)`` pairs as a capture with those block offsets."""
+    clock_value = [0.0]
+    with CaptureRecorder(path, sample_rate, clock=lambda: clock_value[0]) as recorder:
+        for seconds, block in blocks:
+            clock_value[0] = seconds
+            recorder.write(block)
+    return path
+
+
+def preprocess_capture(capture, stage_classes, path):
+    """Run every block through fresh instances of ``stage_classes``; return per-block CPU microseconds."""
+    stages = [stage_class(sample_rate=capture.sample_rate) for stage_class in stage_classes]
+    cpu_us = []
+    processed = []
+    for seconds, block in capture.blocks():
+        started_at = time.thread_time()
+        for stage in stages:
+            block = stage.process(block)
+        cpu_us.append((time.thread_time() - started_at) * 1e6)
+        processed.append((seconds, block))
+    write_capture(path, processed, capture.sample_rate)
+    return cpu_us
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("capture", nargs="?", help="capture WAV written by AUDIO_CAPTURE_RECORD_DIR")
+    parser.add_argument("--turns", type=int, default=8, help="synthetic interviewer turns")
+    parser.add_argument("--speech-db", type=float, default=-14.0, help="interviewer level relative to the benchmark speech")
+    parser.add_argument("--noise-dbfs", type=float, default=-40.0, help="fan noise RMS level")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed; above 1, later turns supersede answers")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as scratch:
+        if args.capture:
+            source = CaptureRecording(args.capture)
+            expected_turns = None
+        else:
+            pcm = noisy_interview(args.turns, args.speech_db, args.noise_dbfs)
+            chunk_seconds = CHUNK_SIZE / SAMPLE_RATE
+            blocks = [
+                (index * chunk_seconds, pcm[start : start + CHUNK_SIZE * 2])
+                for index, start in enumerate(range(0, len(pcm) - CHUNK_SIZE * 2 + 1, CHUNK_SIZE * 2))
+            ]
+            source = CaptureRecording(write_capture(os.path.join(scratch, "noisy.wav"), blocks))
+            expected_turns = args.turns
+            print(f"{args.turns} turns at {args.speech_db:+g} dB under {args.noise_dbfs:g} dBFS fan noise")
+
+        for label, stage_classes in ROWS:
+            path = os.path.join(scratch, f"{label.replace(' ', '_').replace('+', 'and')}.wav")
+            cpu_us = preprocess_capture(source, stage_classes, path)
+            capture = CaptureRecording(path)
+            result = run_turn_latency(
+                None, speed=args.speed, capture=capture, capture_stages=False, sample_rate=capture.sample_rate
+            )
+            cancels = result["received_counts"].get("response.cancel", 0)
+            reference = expected_turns or max(1, result["turns"])
+            cost = ""
+            if stage_classes:
+                block_ms = CHUNK_SIZE * 1000 / capture.sample_rate
+                cost = (
+                    f"  CPU p50 {percentile(cpu_us, 0.50):5.0f}us p99 {percentile(cpu_us, 0.99):5.0f}us "
+                    f"per {block_ms:.1f}ms block"
+                )
+            print(
+                f"{label:>17}: {result['turns']:3d} turns detected, {len(result['latencies_ms']):3d} answered, "
+                f"{cancels:3d} cancels ({cancels / reference:.2f} per turn){cost}"
+            )
+
+
+if __name__ == "__main__":
+    main()
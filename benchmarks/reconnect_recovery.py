@@ -0,0 +1,109 @@
+"""Time to recover from a dropped Realtime WebSocket against the local stand-in server.
+
+Run from the repository root:
+
+    python -m benchmarks.reconnect_recovery --drops 10 --handshake-ms 300
+
+Silence is streamed through ``add_audio_chunk`` at real time while the stand-in
+aborts the active connection. Recovery is measured from the abort to the first
+audio append the server receives on another connection, once with a fresh
+reconnect and once with the hot-standby connection. ``--handshake-ms`` models
+the TLS/WebSocket handshake cost of a remote region.
+"""
+
+import argparse
+import threading
+import time
+
+from azure_realtime import CHUNK_SIZE, AzureRealtimeAnswerSession, build_realtime_answer_instructions
+from benchmarks.common import summarize_ms
+from benchmarks.turn_latency import wait_for
+from local_realtime_server import LocalRealtimeServer
+
+
+def stream_silence(session, stop_event, chunk_size=CHUNK_SIZE, sample_rate=24000):
+    chunk = bytes(chunk_size * 2)
+    chunk_seconds = chunk_size / sample_rate
+    started_at = time.perf_counter()
+    index = 0
+    while not stop_event.is_set():
+        session.add_audio_chunk(chunk)
+        index += 1
+        delay = started_at + index * chunk_seconds - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+
+def audio_resumed_at(server, dropped_at):
+    resumed = [
+        connection.first_audio_at
+        for connection in server.connection_history
+        if connection.first_audio_at is not None and connection.first_audio_at > dropped_at
+    ]
+    return min(resumed) if resumed else None
+
+
+def run_recovery(drops, standby, handshake_ms=0, settle_seconds=0.5, timeout=30.0):
+    recoveries = []
+    with LocalRealtimeServer(handshake_delay_ms=handshake_ms) as server:
+        session = AzureRealtimeAnswerSession(
+            instructions_provider=build_realtime_answer_instructions,
+            url=server.url,
+            api_key="benchmark",
+            deployment="local-realtime",
+            standby_connection=standby,
+        )
+        stop_event = threading.Event()
+        feeder = threading.Thread(target=stream_silence, args=(session, stop_event), daemon=True)
+        try:
+            if not session.start():
+                raise RuntimeError("Realtime session did not start")
+            if not wait_for(lambda: session.websocket is not None and session.audio_queue is not None, timeout):
+                raise RuntimeError("Realtime session did not connect to the stand-in server")
+            feeder.start()
+            for _ in range(drops):
+                if standby and not wait_for(lambda: session.get_metrics()["connection"]["standby_ready"], timeout):
+                    raise RuntimeError("Standby connection never became ready")
+                time.sleep(settle_seconds)
+                dropped_at = time.perf_counter()
+                server.drop_connections(limit=1)
+                if not wait_for(lambda: audio_resumed_at(server, dropped_at) is not None, timeout):
+                    raise RuntimeError("Audio never resumed after the dropped connection")
+                recoveries.append((audio_resumed_at(server, dropped_at) - dropped_at) * 1000)
+            metrics = session.get_metrics()["connection"]
+        finally:
+            stop_event.set()
+            session.cleanup()
+            if session._thread is not None:
+                session._thread.join(5.0)
+            if feeder.is_alive():
+                feeder.join(1.0)
+    return {"recoveries_ms": recoveries, "connections": server.connection_count, "metrics": metrics}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--drops", type=int, default=10, help="connections to abort per mode")
+    parser.add_argument("--handshake-ms", type=int, default=0, help="stand-in delay added to every handshake")
+    parser.add_argument(
+        "--mode",
+        choices=("both", "reconnect", "standby"),
+        default="both",
+        help="recovery strategy to measure",
+    )
+    args = parser.parse_args(argv)
+
+    modes = ("reconnect", "standby") if args.mode == "both" else (args.mode,)
+    for mode in modes:
+        result = run_recovery(args.drops, mode == "standby", handshake_ms=args.handshake_ms)
+        metrics = result["metrics"]
+        print(summarize_ms(f"{mode:>9} drop -> audio resumed", result["recoveries_ms"]))
+        print(
+            f"{'':>9} connections opened: {result['connections']}  "
+            f"standby promotions: {metrics['standby_promotions']}  "
+            f"client-side median recovery: {metrics['median_recovery_ms']:.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
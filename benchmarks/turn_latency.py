@@ -0,0 +1,219 @@
+"""End-to-end turn latency against the local Realtime stand-in server.
+
+Run from the repository root:
+
+    python -m benchmarks.turn_latency --turns 20
+    python -m benchmarks.turn_latency --pcm interview.wav --speed 2
+    python -m benchmarks.turn_latency --turns 60 --speed 4 --prefill-us-per-token 200
+
+Latency is measured from the moment the stand-in server sends
+``input_audio_buffer.speech_stopped`` to the moment the session invokes
+``answer_update_callback`` for that turn, and to the first provisional
+``answer_preview_callback`` word for that turn.
+"""
+
+import argparse
+import threading
+import time
+
+from azure_realtime import CHUNK_SIZE, AzureRealtimeAnswerSession, build_realtime_answer_instructions
+from benchmarks.common import iter_chunks, load_pcm16, summarize_ms, synthetic_speech
+from capture_recording import replay_capture
+from local_realtime_server import LocalRealtimeServer
+
+
+def wait_for(predicate, timeout):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+def feed_pcm(session, pcm, chunk_size=CHUNK_SIZE, speed=1.0, sample_rate=24000, turn_predictor=None):
+    """Feed PCM through add_audio_chunk at real time divided by ``speed``."""
+    chunk_seconds = chunk_size / sample_rate / speed
+    started_at = time.perf_counter()
+    for index, chunk in enumerate(iter_chunks(pcm, chunk_size)):
+        if turn_predictor is not None:
+            prediction = turn_predictor.process(chunk)
+            if prediction == "end":
+                session.predict_end_of_turn()
+            elif prediction == "resume":
+                session.retract_end_of_turn()
+        session.add_audio_chunk(chunk)
+        delay = started_at + (index + 1) * chunk_seconds - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+
+def run_turn_latency(
+    pcm,
+    chunk_size=CHUNK_SIZE,
+    speed=1.0,
+    settle_seconds=5.0,
+    session_options=None,
+    capture=None,
+    capture_stages=True,
+    **server_options,
+):
+    latencies = []
+    first_preview = {}
+    unmatched = []
+    replay_lag_ms = 0.0
+    lock = threading.Lock()
+
+    with LocalRealtimeServer(**server_options) as server:
+
+        def answer_update(action, text):
+            applied_at = time.perf_counter()
+            turn = server.turn_for_answer(text)
+            with lock:
+                if turn is None or turn.speech_stopped_at is None:
+                    unmatched.append((action, text))
+                else:
+                    latencies.append((applied_at - turn.speech_stopped_at) * 1000)
+
+        def answer_preview(action, _text):
+            shown_at = time.perf_counter()
+            stopped = [turn for turn in server.turns if turn.speech_stopped_at is not None]
+            if action == "discard" or not stopped:
+                return
+            with lock:
+                first_preview.setdefault(stopped[-1].index, (shown_at - stopped[-1].speech_stopped_at) * 1000)
+
+        session = AzureRealtimeAnswerSession(
+            answer_update_callback=answer_update,
+            answer_preview_callback=answer_preview,
+            instructions_provider=build_realtime_answer_instructions,
+            url=server.url,
+            api_key="local-benchmark",
+            deployment="local-realtime",
+            chunk_size=chunk_size,
+            **(session_options or {}),
+        )
+        if not session.start():
+            raise RuntimeError("Realtime session did not start")
+        try:
+            if not wait_for(lambda: session.websocket is not None and session.audio_queue is not None, 5.0):
+                raise RuntimeError("Realtime session did not connect to the stand-in server")
+            session.set_auto_answer_enabled(True)
+            turn_predictor = None
+            if session.speculative_response:
+                from live_transcription import EndOfTurnPredictor
+
+                turn_predictor = EndOfTurnPredictor(sample_rate=server.sample_rate)
+            if capture is not None:
+                from live_transcription import LiveAudioManager
+
+                # Captures hold audio from before preprocessing and the silence gate, so replay it
+                # through the same stages the app runs, configured from the same environment.
+                manager = LiveAudioManager()
+                manager.realtime_session = session
+                manager.turn_predictor = turn_predictor
+                if not capture_stages:
+                    manager.noise_gate = manager.agc = manager.silence_gate = None
+                replay_lag_ms = replay_capture(manager._publish_audio, capture, speed=speed)
+            else:
+                feed_pcm(
+                    session,
+                    pcm,
+                    chunk_size=chunk_size,
+                    speed=speed,
+                    sample_rate=server.sample_rate,
+                    turn_predictor=turn_predictor,
+                )
+
+            def settled():
+                stopped = sum(1 for turn in server.turns if turn.speech_stopped_at is not None)
+                with lock:
+                    return len(latencies) + len(unmatched) >= stopped
+
+            wait_for(settled, settle_seconds)
+        finally:
+            session.cleanup()
+            session._thread.join(5.0)
+
+        return {
+            "latencies_ms": latencies,
+            "first_preview_ms": list(first_preview.values()),
+            "unmatched": unmatched,
+            "turns": len(server.turns),
+            "received_counts": dict(server.received_counts),
+            "received_bytes": dict(server.received_bytes),
+            "session_metrics": session.get_metrics(),
+            "sent_events": list(server.sent_events),
+            "prompt_tokens": list(server.prompt_tokens),
+            "replay_lag_ms": replay_lag_ms,
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pcm", help="24 kHz PCM16 WAV or raw mono file; synthetic speech when omitted")
+    parser.add_argument("--turns", type=int, default=10, help="synthetic interviewer turns")
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="feed speed as a multiple of real time; faster feeds shorten wall-clock pauses between turns",
+    )
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--response-delay-ms", type=float, default=80)
+    parser.add_argument("--first-delta-delay-ms", type=float, default=40)
+    parser.add_argument("--delta-interval-ms", type=float, default=5)
+    parser.add_argument("--vad-event-delay-ms", type=float, default=0)
+    parser.add_argument("--vad-silence-ms", type=int, default=None)
+    parser.add_argument(
+        "--prefill-us-per-token",
+        type=float,
+        default=0,
+        help="stand-in response delay per conversation token, to model prompt growth",
+    )
+    parser.add_argument("--speculative", action="store_true", help="start responses on predicted end of turn")
+    parser.add_argument("--no-context-pruning", action="store_true", help="keep every conversation item on the server")
+    parser.add_argument("--record-events", help="write the stand-in's server events as JSONL for event_replay")
+    args = parser.parse_args(argv)
+
+    pcm = load_pcm16(args.pcm) if args.pcm else synthetic_speech(turns=args.turns)
+    result = run_turn_latency(
+        pcm,
+        chunk_size=args.chunk_size,
+        speed=args.speed,
+        response_delay_ms=args.response_delay_ms,
+        first_delta_delay_ms=args.first_delta_delay_ms,
+        delta_interval_ms=args.delta_interval_ms,
+        vad_event_delay_ms=args.vad_event_delay_ms,
+        vad_silence_ms=args.vad_silence_ms,
+        prefill_us_per_token=args.prefill_us_per_token,
+        record_events=bool(args.record_events),
+        session_options={"speculative_response": args.speculative, "context_pruning": not args.no_context_pruning},
+    )
+
+    print(summarize_ms("speech_stopped -> answer_update_callback", result["latencies_ms"]))
+    print(summarize_ms("speech_stopped -> first preview word", result["first_preview_ms"]))
+    print(f"turns detected: {result['turns']}  unmatched answers: {len(result['unmatched'])}")
+    speculation = result["session_metrics"]["speculation"]
+    if speculation["attempts"]:
+        print(
+            f"speculation: attempts={speculation['attempts']} hit_rate={speculation['hit_rate']:.0%} "
+            f"misses={speculation['misses']} median_saved={speculation['median_saved_ms']:.0f}ms"
+        )
+    prompt_tokens = result["prompt_tokens"]
+    if prompt_tokens:
+        conversation = result["session_metrics"]["conversation"]
+        print(
+            f"prompt tokens: first={prompt_tokens[0]} last={prompt_tokens[-1]} max={max(prompt_tokens)}  "
+            f"conversation items deleted: {conversation['deleted']}"
+        )
+    for event_type, count in sorted(result["received_counts"].items()):
+        print(f"  sent {event_type}: {count} events, {result['received_bytes'][event_type]} bytes")
+    if args.record_events:
+        with open(args.record_events, "w", encoding="utf-8") as events_file:
+            events_file.writelines(f"{payload}\n" for payload in result["sent_events"])
+        print(f"recorded {len(result['sent_events'])} server events to {args.record_events}")
+
+
+if __name__ == "__main__":
+    main()
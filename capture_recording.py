@@ -0,0 +1,160 @@
+import os
+import struct
+import threading
+import time
+import wave
+from datetime import datetime
+
+import numpy as np
+
+
+CAPTURE_INDEX_SUFFIX = ".blocks"
+# One record per block handed to add_audio_chunk: seconds since the recording
+# started and the block's length in samples.
+CAPTURE_INDEX_DTYPE = np.dtype([("t", "<f8"), ("samples", "<u4")])
+# Flush both files this often so a killed session leaves a replayable prefix.
+CAPTURE_FLUSH_BLOCKS = 50
+
+
+def timestamp():
+    return f"[{datetime.now().strftime('%H:%M:%S')}]"
+
+
+def capture_path(directory, started=None):
+    started = started or datetime.now()
+    return os.path.join(directory, f"capture-{started.strftime('%Y%m%d-%H%M%S')}.wav")
+
+
+class CaptureRecorder:
+    """Write captured PCM16 blocks to a WAV file, with a ``.blocks`` sidecar of their timing."""
+
+    def __init__(self, path, sample_rate, clock=time.perf_counter):
+        self.path = path
+        self.sample_rate = sample_rate
+        self.clock = clock
+        self.blocks = 0
+        self.samples = 0
+        self._lock = threading.Lock()
+        self._started_at = None
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "wb")
+        self._wav = wave.open(self._file, "wb")
+        self._wav.setnchannels(1)
+        self._wav.setsampwidth(2)
+        self._wav.setframerate(sample_rate)
+        self._index = open(path + CAPTURE_INDEX_SUFFIX, "wb")
+        self._record = np.zeros(1, dtype=CAPTURE_INDEX_DTYPE)
+
+    def write(self, pcm_bytes):
+        now = self.clock()
+        with self._lock:
+            if self._wav is None:
+                return
+            if self._started_at is None:
+                self._started_at = now
+            self._record["t"] = now - self._started_at
+            self._record["samples"] = len(pcm_bytes) // 2
+            self._wav.writeframesraw(pcm_bytes)
+            self._index.write(self._record.tobytes())
+            self.blocks += 1
+            self.samples += len(pcm_bytes) // 2
+            if self.blocks % CAPTURE_FLUSH_BLOCKS == 0:
+                self._file.flush()
+                self._index.flush()
+
+    def close(self):
+        with self._lock:
+            if self._wav is None:
+                return
+            self._wav.close()
+            self._file.close()
+            self._index.close()
+            self._wav = None
+        print(
+            f"{timestamp()} Recorded {self.blocks} audio blocks "
+            f"({self.samples / self.sample_rate:.1f}s) to {self.path}",
+            flush=True,
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exc_info):
+        self.close()
+
+
+def _unfinished_wav_data(path, header_bytes):
+    """PCM after the data chunk header when the file holds more than the header admits, else None."""
+    with open(path, "rb") as wav_file:
+        wav_file.seek(12)
+        while len(chunk_header := wav_file.read(8)) == 8:
+            chunk_id, size = struct.unpack("<4sI", chunk_header)
+            if chunk_id == b"data":
+                pcm = wav_file.read()
+                return pcm[: len(pcm) - len(pcm) % 2] if len(pcm) > header_bytes else None
+            wav_file.seek(size + size % 2, os.SEEK_CUR)
+    return None
+
+
+class CaptureRecording:
+    """A recording made by ``CaptureRecorder``, loaded for replay.
+
+    A session that was killed before closing its recorder is replayed up to the last block found in both files.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with wave.open(path, "rb") as wav_file:
+            if wav_file.getsampwidth() != 2 or wav_file.getnchannels() != 1:
+                raise ValueError(f"{path} must contain mono 16-bit PCM")
+            self.sample_rate = wav_file.getframerate()
+            self.pcm = wav_file.readframes(wav_file.getnframes())
+        with open(path + CAPTURE_INDEX_SUFFIX, "rb") as index_file:
+            index = index_file.read()
+        whole_records = len(index) - len(index) % CAPTURE_INDEX_DTYPE.itemsize
+        self.index = np.frombuffer(index[:whole_records], dtype=CAPTURE_INDEX_DTYPE)
+        self.recovered = False
+        unfinished = _unfinished_wav_data(path, len(self.pcm))
+        if unfinished is not None:
+            block_ends = np.cumsum(self.index["samples"], dtype=np.int64) * 2
+            blocks = int(np.searchsorted(block_ends, len(unfinished), side="right"))
+            self.index = self.index[:blocks]
+            self.pcm = unfinished[: int(block_ends[blocks - 1]) if blocks else 0]
+            self.recovered = True
+            print(f"{timestamp()} Recovered {blocks} blocks from unfinished recording {path}", flush=True)
+        if int(self.index["samples"].sum()) * 2 != len(self.pcm):
+            raise ValueError(f"{path}{CAPTURE_INDEX_SUFFIX} does not match the recorded audio")
+
+    @property
+    def duration_s(self):
+        if not len(self.index):
+            return 0.0
+        return float(self.index["t"][-1]) + int(self.index["samples"][-1]) / self.sample_rate
+
+    def blocks(self):
+        """Yield ``(seconds, pcm_bytes)`` for every recorded block, in order."""
+        pcm = memoryview(self.pcm)
+        offset = 0
+        for seconds, samples in self.index.tolist():
+            end = offset + samples * 2
+            yield seconds, bytes(pcm[offset:end])
+            offset = end
+
+
+def replay_capture(publish, recording, speed=1.0, clock=time.perf_counter, sleep=time.sleep):
+    """Call ``publish`` with each recorded block at its offset divided by ``speed``.
+
+    Returns the worst lag behind the recorded schedule, in milliseconds.
+    """
+    started_at = clock()
+    worst_lag_ms = 0.0
+    for seconds, block in recording.blocks():
+        delay = started_at + seconds / speed - clock()
+        if delay > 0:
+            sleep(delay)
+        else:
+            worst_lag_ms = max(worst_lag_ms, -delay * 1000)
+        publish(block)
+    return worst_lag_ms
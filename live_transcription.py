@@ -1,32 +1,52 @@
+import collections
 import collections.abc
+import math
+import os
+import queue
 import sys
 import threading
+import time
 import warnings
 from datetime import datetime
 
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 
+try:
+    import soundcard as sc
+except (ImportError, OSError):
+    # No usable audio backend (for example no PulseAudio on a headless box);
+    # the file, pipe and synthetic audio sources still work.
+    sc = None
 
-_numpy_fromstring = np.fromstring
-
-
-def _fromstring_compat(data, dtype=float, count=-1, sep="", **kwargs):
-    if sep == "":
-        try:
-            return np.frombuffer(data, dtype=dtype, count=count if count >= 0 else -1).copy()
-        except TypeError:
-            pass
-    return _numpy_fromstring(data, dtype=dtype, count=count, sep=sep, **kwargs)
-
-
-np.fromstring = _fromstring_compat
+try:
+    import soundcard.mediafoundation as _sc_mediafoundation
+except (ImportError, OSError):
+    _sc_mediafoundation = None
 
-import soundcard as sc
-import soundcard.mediafoundation as _sc_mediafoundation
+from audio_sources import (
+    FileAudioSource,
+    MonitorAudioSource,
+    PCM16Converter,
+    PCM16Downmixer,
+    PipeAudioSource,
+    SyntheticAudioSource,
+)
 
-from azure_realtime import AzureRealtimeAnswerSession
+from azure_realtime import AzureRealtimeAnswerSession, HedgedAnswerCoordinator, hedge_session_options
 from azure_realtime import CHUNK_SIZE as AZURE_CHUNK_SIZE
 from azure_realtime import SAMPLE_RATE as AZURE_SAMPLE_RATE
+from azure_realtime import (
+    SPECULATIVE_SILENCE_MS,
+    VAD_PREFIX_PADDING_MS,
+    VAD_SILENCE_MS,
+    parse_bool_env,
+    parse_float_env,
+    parse_int_env,
+    percentile,
+)
+
+from capture_recording import CaptureRecorder, capture_path
 
 try:
     import pyaudio
@@ -34,11 +54,12 @@ except ImportError:
     pyaudio = None
 
 
-warnings.filterwarnings(
-    "ignore",
-    message="data discontinuity in recording",
-    category=sc.mediafoundation.SoundcardRuntimeWarning,
-)
+if _sc_mediafoundation is not None:
+    warnings.filterwarnings(
+        "ignore",
+        message="data discontinuity in recording",
+        category=_sc_mediafoundation.SoundcardRuntimeWarning,
+    )
 
 
 def timestamp():
@@ -46,7 +67,7 @@ def timestamp():
 
 
 def _patch_soundcard_waveformatex_recorder():
-    if not sys.platform.startswith("win"):
+    if not sys.platform.startswith("win") or _sc_mediafoundation is None:
         return
 
     try:
@@ -75,14 +96,19 @@ def _patch_soundcard_waveformatex_recorder():
                     "must be a combination of `range(0, x)`."
                 )
 
-            if blocksize is None:
-                blocksize = self.deviceperiod[0] * samplerate
-
             pp_mix_format = ffi.new("WAVEFORMATEXTENSIBLE**")
             hr = self._ptr[0][0].lpVtbl.GetMixFormat(self._ptr[0], pp_mix_format)
             com.check_error(hr)
 
             fmt = pp_mix_format[0][0].Format
+            if samplerate is None:
+                # Native capture: keep the engine's mix rate so WASAPI does no
+                # rate conversion, with the same buffer duration as the 24 kHz path.
+                samplerate = int(fmt.nSamplesPerSec)
+                if blocksize is None:
+                    blocksize = samplerate * CHUNK * 2 // RATE
+            if blocksize is None:
+                blocksize = self.deviceperiod[0] * samplerate
             is_extensible_float = (
                 fmt.wFormatTag == 0xFFFE
                 and fmt.cbSize == 22
@@ -146,14 +172,544 @@ _patch_soundcard_waveformatex_recorder()
 FORMAT = pyaudio.paInt16 if pyaudio else None
 RATE = AZURE_SAMPLE_RATE
 CHUNK = AZURE_CHUNK_SIZE
+SILENCE_GATE_ENABLED = parse_bool_env("AUDIO_SILENCE_GATE")
+SILENCE_GATE_THRESHOLD_DB = parse_float_env("AUDIO_SILENCE_GATE_THRESHOLD_DB", 50.0)
+SILENCE_GATE_HANGOVER_MS = parse_int_env("AUDIO_SILENCE_GATE_HANGOVER_MS", VAD_SILENCE_MS + 250)
+SILENCE_GATE_KEEPALIVE_MS = parse_int_env("AUDIO_SILENCE_GATE_KEEPALIVE_MS", 1000)
+NOISE_SUPPRESSION_ENABLED = parse_bool_env("AUDIO_NOISE_SUPPRESSION")
+NOISE_SUPPRESSION_DB = parse_float_env("AUDIO_NOISE_SUPPRESSION_DB", 18.0)
+AGC_ENABLED = parse_bool_env("AUDIO_AGC")
+AGC_TARGET_DB = parse_float_env("AUDIO_AGC_TARGET_DB", 20.0)
+AGC_MAX_GAIN_DB = parse_float_env("AUDIO_AGC_MAX_GAIN_DB", 20.0)
+CAPTURE_RECORD_DIR = os.getenv("AUDIO_CAPTURE_RECORD_DIR", "").strip()
+CAPTURE_NATIVE_FORMAT = parse_bool_env("AUDIO_CAPTURE_NATIVE_FORMAT")
+AUDIO_SOURCE = os.getenv("AUDIO_SOURCE", "desktop").strip()
+AUDIO_SOURCE_REALTIME = parse_bool_env("AUDIO_SOURCE_REALTIME", True)
+RESAMPLER_TAPS_PER_PHASE = 16
+CAPTURE_TIMING_WINDOW = 1024
+PYAUDIO_QUEUE_BLOCKS = 50
+
+
+class LoopbackBlockReader:
+    """Read fixed-size float blocks from a soundcard WASAPI recorder into one reused array.
+
+    Packets flagged as a data discontinuity are counted in ``discontinuities``, except the always-flagged first one.
+    """
+
+    def __init__(self, recorder, frames):
+        self.recorder = recorder
+        self.frames = frames
+        self.channels = len(set(recorder.channelmap))
+        self._block = np.empty((frames, self.channels), dtype=np.float32)
+        self._flat = self._block.reshape(-1)
+        self._carry = np.empty(0, dtype=np.float32)
+        self._carried = 0
+        self._first_packet = True
+        self.discontinuities = 0
+
+    def read(self):
+        """Return the next ``frames x channels`` block. The array is overwritten by the next call."""
+        flat = self._flat
+        filled = min(self._carried, len(flat))
+        flat[:filled] = self._carry[:filled]
+        self._carried -= filled
+        if self._carried:
+            self._carry[: self._carried] = self._carry[filled : filled + self._carried]
+        while filled < len(flat):
+            filled += self._read_packet(flat[filled:])
+        return self._block
+
+    def _read_packet(self, destination):
+        recorder = self.recorder
+        if recorder._capture_available_frames() == 0:
+            return self._wait_for_packet(destination)
+
+        recorder._idle_start_time = None
+        data_ptr, frames, flags = recorder._capture_buffer()
+        if data_ptr == _sc_mediafoundation._ffi.NULL:
+            raise RuntimeError("Could not create capture buffer")
+        if frames <= 0:
+            return 0
+        if flags & _sc_mediafoundation._ole32.AUDCLNT_BUFFERFLAGS_DATA_DISCONTINUITY and not self._first_packet:
+            self.discontinuities += 1
+        self._first_packet = False
+        try:
+            packet = None
+            if not flags & _sc_mediafoundation._ole32.AUDCLNT_BUFFERFLAGS_SILENT:
+                buffer = _sc_mediafoundation._ffi.buffer(data_ptr, frames * self.channels * 4)
+                packet = np.frombuffer(buffer, dtype=np.float32)
+            return self._take(packet, frames * self.channels, destination)
+        finally:
+            recorder._capture_release(frames)
+
+    def _wait_for_packet(self, destination):
+        # Some devices report silence by delivering no packets at all; after four
+        # device periods without data the elapsed time is returned as zeros.
+        recorder = self.recorder
+        if recorder._idle_start_time is None:
+            recorder._idle_start_time = time.perf_counter_ns()
+        default_period, minimum_period = recorder.deviceperiod
+        time.sleep(minimum_period / 4)
+        elapsed_ns = time.perf_counter_ns() - recorder._idle_start_time
+        if elapsed_ns / 1_000_000_000 <= default_period * 4:
+            return 0
+        recorder._idle_start_time += elapsed_ns
+        frames = int(recorder.samplerate * elapsed_ns / 1_000_000_000)
+        return self._take(None, frames * self.channels, destination)
+
+    def _take(self, packet, samples, destination):
+        """Copy ``samples`` values (zeros when ``packet`` is None) into ``destination``, carrying the overrun."""
+        taken = min(samples, len(destination))
+        extra = samples - taken
+        if packet is None:
+            destination[:taken] = 0
+        else:
+            destination[:taken] = packet[:taken]
+        if extra:
+            if len(self._carry) < extra:
+                self._carry = np.empty(extra, dtype=np.float32)
+            if packet is None:
+                self._carry[:extra] = 0
+            else:
+                self._carry[:extra] = packet[taken:]
+            self._carried = extra
+        return taken
+
+
+class CaptureTiming:
+    """Rolling per-block timings of the capture loop, published as ``metrics["capture"]``.
+
+    ``lag_ms`` is wall-clock time since capture started minus the audio time delivered.
+    """
+
+    def __init__(self, window=CAPTURE_TIMING_WINDOW):
+        self.window = window
+        self.blocks = 0
+        self.stalls = 0
+        self.discontinuities = 0
+        self.audio_seconds = 0.0
+        self._started_at = None
+        self._samples = {name: collections.deque(maxlen=window) for name in ("read_ms", "convert_ms", "lag_ms")}
+        self._max = dict.fromkeys(self._samples, 0.0)
+
+    def _add(self, name, value_ms):
+        self._samples[name].append(value_ms)
+        self._max[name] = max(self._max[name], value_ms)
+
+    def record(self, audio_seconds, read_ms=None, convert_ms=None, now=None):
+        """Fold in one block of ``audio_seconds`` that was complete at ``now``."""
+        now = time.perf_counter() if now is None else now
+        if self._started_at is None:
+            self._started_at = now - audio_seconds
+        self.blocks += 1
+        self.audio_seconds += audio_seconds
+        if read_ms is not None:
+            self._add("read_ms", read_ms)
+            if read_ms > 2000 * audio_seconds:
+                self.stalls += 1
+        if convert_ms is not None:
+            self._add("convert_ms", convert_ms)
+        self._add("lag_ms", (now - self._started_at - self.audio_seconds) * 1000)
+
+    def summary(self):
+        metrics = {
+            "blocks": self.blocks,
+            "audio_seconds": self.audio_seconds,
+            "stalls": self.stalls,
+            "discontinuities": self.discontinuities,
+        }
+        for name, samples in self._samples.items():
+            if samples:
+                metrics[name] = {
+                    "last": samples[-1],
+                    "p50": percentile(samples, 0.50),
+                    "p95": percentile(samples, 0.95),
+                    "p99": percentile(samples, 0.99),
+                    "max": self._max[name],
+                }
+        return metrics
+
+    def format_report(self):
+        parts = [f"Capture over {self.audio_seconds:.1f}s ({self.blocks} blocks):"]
+        for name, stats in self.summary().items():
+            if isinstance(stats, dict):
+                parts.append(f"{name} p50={stats['p50']:.1f} p99={stats['p99']:.1f} max={stats['max']:.1f}")
+        parts.append(f"{self.stalls} stalls, {self.discontinuities} discontinuities")
+        return " ".join(parts)
+
+
+class PolyphaseResampler:
+    """Downmix float capture frames and resample them to mono PCM16, carrying filter state across blocks."""
+
+    def __init__(self, in_rate, out_rate=RATE, channels=1, taps_per_phase=RESAMPLER_TAPS_PER_PHASE):
+        in_rate, out_rate = int(in_rate), int(out_rate)
+        divisor = math.gcd(in_rate, out_rate)
+        self.in_rate = in_rate
+        self.out_rate = out_rate
+        self.channels = max(1, int(channels))
+        self.up = out_rate // divisor
+        self.down = in_rate // divisor
+        self.taps = math.ceil(taps_per_phase * max(self.up, self.down) / self.up)
+        self._downmix = np.full(self.channels, 1.0 / self.channels, dtype=np.float32)
+        self._converter = PCM16Converter(self.channels)
+        self._history = np.zeros(self.taps, dtype=np.float32)
+        self._position = 0
+        self._tap_offsets = np.arange(self.taps)
+        length = self.up * self.taps
+        cutoff = 0.95 / max(self.up, self.down)
+        n = np.arange(length) - (length - 1) / 2
+        prototype = cutoff * np.sinc(cutoff * n) * np.kaiser(length, 8.0) * self.up
+        # branch[p][j] weights input sample k - j for outputs whose upsampled phase is p.
+        self._branches = prototype.reshape(self.taps, self.up).T.astype(np.float32)
+
+    def process(self, frames):
+        frames = np.asarray(frames, dtype=np.float32)
+        if self.up == self.down:
+            return self._converter.convert(frames)
+        mono = frames @ self._downmix if frames.ndim > 1 else frames.reshape(-1)
+
+        buffer = np.concatenate((self._history, mono))
+        block = len(mono)
+        last = (block - 1) * self.up
+        count = 0 if self._position > last else (last - self._position) // self.down + 1
+        positions = self._position + self.down * np.arange(count)
+        base, phase = np.divmod(positions, self.up)
+        indices = self.taps + base[:, None] - self._tap_offsets
+        output = np.einsum("nj,nj->n", buffer[indices], self._branches[phase])
+        self._position += self.down * count - block * self.up
+        self._history = buffer[len(buffer) - self.taps :]
+        return self._converter.convert(output)
+
+
+def _level_threshold(threshold_db):
+    return 32768.0 * 10 ** (-abs(threshold_db) / 20)
+
+
+def _is_speech_block(samples, threshold):
+    """Classify a PCM16 block by RMS level, using zero crossings for quiet fricatives."""
+    if not len(samples):
+        return False
+    level = np.sqrt(np.mean(np.square(samples, dtype=np.float32)))
+    if level >= threshold:
+        return True
+    if level < threshold * 0.5:
+        return False
+    crossings = np.count_nonzero(np.signbit(samples[1:]) != np.signbit(samples[:-1]))
+    return crossings / len(samples) >= 0.25
+
+
+class SilenceGate:
+    """Suppress sustained silence before upload, flushing a pre-roll ahead of each speech onset."""
+
+    def __init__(
+        self,
+        sample_rate=RATE,
+        threshold_db=SILENCE_GATE_THRESHOLD_DB,
+        hangover_ms=SILENCE_GATE_HANGOVER_MS,
+        preroll_ms=VAD_PREFIX_PADDING_MS,
+        keepalive_ms=SILENCE_GATE_KEEPALIVE_MS,
+    ):
+        self.sample_rate = sample_rate
+        self.threshold = _level_threshold(threshold_db)
+        self.hangover_ms = max(hangover_ms, VAD_SILENCE_MS)
+        self.preroll_ms = max(preroll_ms, VAD_PREFIX_PADDING_MS)
+        self.keepalive_ms = keepalive_ms
+        self._preroll = collections.deque()
+        self._preroll_ms = 0.0
+        self._silence_ms = self.hangover_ms
+        self._since_keepalive_ms = 0.0
+        self.passed_ms = 0.0
+        self.suppressed_ms = 0.0
+        self.keepalive_blocks = 0
+
+    def process(self, pcm_bytes):
+        samples = np.frombuffer(pcm_bytes, dtype=np.int16)
+        block_ms = len(samples) * 1000 / self.sample_rate
+
+        if _is_speech_block(samples, self.threshold):
+            released = [block for block, _ms in self._preroll]
+            released.append(pcm_bytes)
+            self.passed_ms += self._preroll_ms + block_ms
+            self.suppressed_ms -= self._preroll_ms
+            self._preroll.clear()
+            self._preroll_ms = 0.0
+            self._silence_ms = 0.0
+            return released
+
+        self._silence_ms += block_ms
+        if self._silence_ms <= self.hangover_ms:
+            self.passed_ms += block_ms
+            return [pcm_bytes]
+
+        self._since_keepalive_ms += block_ms
+        self._preroll.append((pcm_bytes, block_ms))
+        self._preroll_ms += block_ms
+        self.suppressed_ms += block_ms
+        released = []
+        if self._since_keepalive_ms >= self.keepalive_ms:
+            # Send the oldest pre-roll block so the keepalive never overtakes audio still held back.
+            self._since_keepalive_ms = 0.0
+            keepalive, keepalive_ms = self._preroll.popleft()
+            self._preroll_ms -= keepalive_ms
+            self.suppressed_ms -= keepalive_ms
+            self.passed_ms += keepalive_ms
+            self.keepalive_blocks += 1
+            released.append(keepalive)
+        while self._preroll and self._preroll_ms - self._preroll[0][1] >= self.preroll_ms:
+            _block, dropped_ms = self._preroll.popleft()
+            self._preroll_ms -= dropped_ms
+        return released
+
+    def get_metrics(self):
+        total_ms = self.passed_ms + self.suppressed_ms
+        return {
+            "passed_ms": self.passed_ms,
+            "suppressed_ms": self.suppressed_ms,
+            "suppressed_ratio": self.suppressed_ms / total_ms if total_ms else 0.0,
+            "keepalive_blocks": self.keepalive_blocks,
+        }
+
+
+class SpectralNoiseGate:
+    """Attenuate stationary background noise (fans, hum, line hiss) per frequency bin.
+
+    Bins near a minimum-statistics noise floor are cut by up to ``reduction_db``; the output lags one 256-sample hop.
+    """
 
+    FFT_SIZE = 512
+    SUBWINDOWS = 8
+    SUBWINDOW_FRAMES = 24
+    MINIMUM_BIAS = 3.0
+    OPEN_DB = 10.0
+    CLOSED_DB = 4.0
+    RELEASE_MS = 60.0
+    RUMBLE_HZ = 80.0
 
-def _float_audio_to_pcm16_bytes(audio_data):
-    if len(audio_data.shape) > 1 and audio_data.shape[1] > 1:
-        audio_data = np.mean(audio_data, axis=1)
-    audio_data = np.asarray(audio_data, dtype=np.float32).flatten()
-    audio_data = np.clip(audio_data, -1.0, 1.0)
-    return (audio_data * 32767).astype(np.int16).tobytes()
+    def __init__(self, sample_rate=RATE, reduction_db=NOISE_SUPPRESSION_DB):
+        self.sample_rate = sample_rate
+        self.hop = self.FFT_SIZE // 2
+        self.window = np.sqrt(0.5 - 0.5 * np.cos(2 * np.pi * np.arange(self.FFT_SIZE) / self.FFT_SIZE))
+        self.floor_gain = 10 ** (-abs(reduction_db) / 20)
+        self.release = math.exp(-self.hop / sample_rate * 1000 / self.RELEASE_MS)
+        self._closed = 10 ** (self.CLOSED_DB / 10)
+        self._open = 10 ** (self.OPEN_DB / 10)
+        self._rumble_bins = int(self.RUMBLE_HZ * self.FFT_SIZE / sample_rate) + 1
+        bins = self.FFT_SIZE // 2 + 1
+        self._input = np.zeros(self.hop)
+        self._output = np.zeros(0)
+        self._overlap = np.zeros(self.hop)
+        self._smoothed = None
+        self._minima = np.empty((self.SUBWINDOWS, bins))
+        self._frames = 0
+        self._gain = np.ones(bins)
+        self._smoothing = np.empty((0, 0))
+        self._carry = None
+        self.passed_ratio = 1.0
+
+    def _smooth(self, power):
+        count = len(power)
+        if self._smoothed is None:
+            self._smoothed = power[0].copy()
+            self._minima[:] = power[0]
+        if len(self._smoothing) != count:
+            lags = np.subtract.outer(np.arange(count), np.arange(count))
+            self._smoothing = np.where(lags >= 0, 0.3 * 0.7 ** np.maximum(lags, 0), 0.0)
+            self._carry = 0.7 ** np.arange(1, count + 1)[:, None]
+        smoothed = self._smoothing @ power + self._carry * self._smoothed
+        self._smoothed = smoothed[-1].copy()
+        return smoothed
+
+    def _noise(self, smoothed):
+        noise = np.empty_like(smoothed)
+        # One pass per minimum-statistics subwindow the frames span, not per frame.
+        start = 0
+        while start < len(smoothed):
+            offset = self._frames % self.SUBWINDOW_FRAMES
+            end = min(len(smoothed), start + self.SUBWINDOW_FRAMES - offset)
+            if offset == 0:
+                self._minima = np.roll(self._minima, 1, axis=0)
+                self._minima[0] = smoothed[start]
+            running = np.minimum.accumulate(np.minimum(smoothed[start:end], self._minima[0]), axis=0)
+            np.minimum(running, self._minima[1:].min(axis=0), out=noise[start:end])
+            self._minima[0] = running[-1]
+            self._frames += end - start
+            start = end
+        return noise * self.MINIMUM_BIAS + 1e-3
+
+    def _gains(self, power):
+        smoothed = self._smooth(power)
+        gate = np.clip((smoothed / self._noise(smoothed) - self._closed) / (self._open - self._closed), 0.0, 1.0)
+        gate[:, : self._rumble_bins] = 0.0
+        gate[:, 1:-1] = 0.25 * gate[:, :-2] + 0.5 * gate[:, 1:-1] + 0.25 * gate[:, 2:]
+        self.passed_ratio = float(np.mean(gate[-1]))
+        # gain[n] = max(target[n], gain[n - 1] * release), unrolled as a running maximum in the log domain.
+        decay = np.log(self.release) * np.arange(1, len(gate) + 1)[:, None]
+        target = np.log(self.floor_gain + (1 - self.floor_gain) * gate) - decay
+        gains = np.exp(np.maximum.accumulate(np.maximum(target, np.log(self._gain)), axis=0) + decay)
+        self._gain = gains[-1].copy()
+        return gains
+
+    def process(self, pcm_bytes):
+        samples = np.frombuffer(pcm_bytes, dtype=np.int16)
+        self._input = np.concatenate((self._input, samples))
+        count = (len(self._input) - self.hop) // self.hop
+        if count:
+            frames = sliding_window_view(self._input[: (count + 1) * self.hop], self.FFT_SIZE)[:: self.hop] * self.window
+            spectrum = np.fft.rfft(frames, axis=1)
+            spectrum *= self._gains(spectrum.real**2 + spectrum.imag**2)
+            frames = np.fft.irfft(spectrum, n=self.FFT_SIZE, axis=1) * self.window
+            output = frames[:, : self.hop].copy()
+            output[0] += self._overlap
+            output[1:] += frames[:-1, self.hop :]
+            self._overlap = frames[-1, self.hop :].copy()
+            self._output = np.concatenate((self._output, output.reshape(-1)))
+            self._input = self._input[count * self.hop :]
+        if len(self._output) < len(samples):
+            # Blocks that are not a multiple of the hop lag by up to one more hop.
+            self._output = np.concatenate((np.zeros(len(samples) - len(self._output)), self._output))
+        emitted, self._output = self._output[: len(samples)], self._output[len(samples) :]
+        return np.clip(emitted, -32768, 32767).astype(np.int16).tobytes()
+
+    def get_metrics(self):
+        return {"passed_ratio": self.passed_ratio}
+
+
+class AutomaticGainControl:
+    """Bring speech to ``target_db`` below full scale without boosting background noise.
+
+    The gain adapts only on blocks well above the tracked noise floor and is ramped across each block.
+    """
+
+    SPEECH_ABOVE_FLOOR_DB = 10.0
+    NOISE_HEADROOM_DB = 25.0
+    FLOOR_RISE_DB_PER_S = 3.0
+    SPEECH_FLOOR_RISE_DB_PER_S = 1.5
+    RISE_DB_PER_S = 10.0
+    FALL_DB_PER_S = 40.0
+
+    def __init__(self, sample_rate=RATE, target_db=AGC_TARGET_DB, max_gain_db=AGC_MAX_GAIN_DB):
+        self.sample_rate = sample_rate
+        self.target_db = -abs(target_db)
+        self.max_gain_db = abs(max_gain_db)
+        self.gain_db = 0.0
+        self.floor_db = None
+        self.speech_blocks = 0
+        self.limited_blocks = 0
+
+    def process(self, pcm_bytes):
+        samples = np.frombuffer(pcm_bytes, dtype=np.int16).astype(np.float32)
+        if not len(samples):
+            return pcm_bytes
+        block_s = len(samples) / self.sample_rate
+        level = float(np.sqrt(np.mean(np.square(samples))))
+        level_db = 20 * math.log10(max(level, 1.0) / 32768)
+        if self.floor_db is None or level_db < self.floor_db:
+            self.floor_db = level_db
+        speech = level_db >= self.floor_db + self.SPEECH_ABOVE_FLOOR_DB
+        rise_db_per_s = self.SPEECH_FLOOR_RISE_DB_PER_S if speech else self.FLOOR_RISE_DB_PER_S
+        self.floor_db = min(level_db, self.floor_db + rise_db_per_s * block_s)
+
+        previous_gain = 10 ** (self.gain_db / 20)
+        if speech:
+            self.speech_blocks += 1
+            wanted_db = min(self.max_gain_db, max(-self.max_gain_db, self.target_db - level_db))
+            step = wanted_db - self.gain_db
+            self.gain_db += min(self.RISE_DB_PER_S * block_s, max(-self.FALL_DB_PER_S * block_s, step))
+        self.gain_db = min(self.gain_db, max(0.0, self.target_db - self.NOISE_HEADROOM_DB - self.floor_db))
+        gain = 10 ** (self.gain_db / 20)
+        peak = float(np.max(np.abs(samples)))
+        if peak * max(gain, previous_gain) > 32767:
+            self.limited_blocks += 1
+            gain = min(gain, 32767 / peak)
+            previous_gain = min(previous_gain, gain)
+            self.gain_db = 20 * math.log10(gain)
+        samples *= np.linspace(previous_gain, gain, len(samples), dtype=np.float32)
+        return np.clip(samples, -32768, 32767).astype(np.int16).tobytes()
+
+    def get_metrics(self):
+        return {
+            "gain_db": self.gain_db,
+            "noise_floor_dbfs": self.floor_db,
+            "speech_blocks": self.speech_blocks,
+            "limited_blocks": self.limited_blocks,
+        }
+
+
+class EndOfTurnPredictor:
+    """Predict the interviewer's end of turn before server VAD confirms it.
+
+    ``process`` returns ``"end"`` once ``predict_ms`` of silence follows at least
+    ``min_speech_ms`` of speech, and ``"resume"`` if speech returns after that.
+    """
+
+    def __init__(
+        self,
+        sample_rate=RATE,
+        threshold_db=SILENCE_GATE_THRESHOLD_DB,
+        predict_ms=SPECULATIVE_SILENCE_MS,
+        min_speech_ms=300,
+    ):
+        self.sample_rate = sample_rate
+        self.threshold = _level_threshold(threshold_db)
+        self.predict_ms = predict_ms
+        self.min_speech_ms = min_speech_ms
+        self._speech_ms = 0.0
+        self._silence_ms = 0.0
+        self._predicted = False
+
+    def process(self, pcm_bytes):
+        samples = np.frombuffer(pcm_bytes, dtype=np.int16)
+        block_ms = len(samples) * 1000 / self.sample_rate
+
+        if _is_speech_block(samples, self.threshold):
+            self._speech_ms += block_ms
+            self._silence_ms = 0.0
+            if self._predicted:
+                self._predicted = False
+                return "resume"
+            return None
+
+        if self._speech_ms < self.min_speech_ms:
+            self._speech_ms = 0.0
+            return None
+        self._silence_ms += block_ms
+        if not self._predicted and self._silence_ms >= self.predict_ms:
+            self._predicted = True
+            return "end"
+        if self._silence_ms >= VAD_SILENCE_MS:
+            self._speech_ms = 0.0
+            self._predicted = False
+        return None
+
+
+def create_audio_source(spec, realtime=True):
+    """Build the ``AudioSource`` named by an ``AUDIO_SOURCE`` spec, or None for desktop loopback capture.
+
+    Specs are ``desktop``, ``file:PATH``, ``pipe:-`` or ``pipe:PATH``, ``synthetic``, and ``monitor[:DEVICE]``.
+    """
+    kind, _, argument = (spec or "desktop").strip().partition(":")
+    kind = kind.lower()
+    if kind in ("", "desktop"):
+        return None
+    if kind == "file":
+        if not argument:
+            raise ValueError("file audio source needs a path, for example file:interview.wav")
+        return FileAudioSource(argument, realtime=realtime)
+    if kind == "pipe":
+        return PipeAudioSource(argument or "-")
+    if kind == "synthetic":
+        return SyntheticAudioSource(realtime=realtime)
+    if kind == "monitor":
+        return MonitorAudioSource(argument or None)
+    raise ValueError(f"Unknown audio source {spec!r}; expected desktop, file:, pipe:, synthetic or monitor")
+
+
+def _configured_audio_source():
+    try:
+        return create_audio_source(AUDIO_SOURCE, realtime=AUDIO_SOURCE_REALTIME)
+    except ValueError as exc:
+        print(f"{timestamp()} Ignoring AUDIO_SOURCE: {exc}. Capturing desktop audio.", flush=True)
+        return None
 
 
 class LiveAudioManager:
@@ -163,20 +719,44 @@ class LiveAudioManager:
         session_reset_callback=None,
         status_callback=None,
         instructions_provider=None,
+        answer_preview_callback=None,
+        audio_source=None,
+        session_options=None,
     ):
         self.answer_update_callback = answer_update_callback
+        self.answer_preview_callback = answer_preview_callback
         self.session_reset_callback = session_reset_callback
         self.status_callback = status_callback
         self.instructions_provider = instructions_provider
         self.realtime_session = None
+        self.hedge_session = None
+        self.hedge = None
         self.desktop_capture_running = False
         self.capture_thread = None
+        self.silence_gate = SilenceGate() if SILENCE_GATE_ENABLED else None
+        self.noise_gate = SpectralNoiseGate() if NOISE_SUPPRESSION_ENABLED else None
+        self.agc = AutomaticGainControl() if AGC_ENABLED else None
+        self._preprocess_us = collections.deque(maxlen=CAPTURE_TIMING_WINDOW)
+        self.turn_predictor = None
+        self.recorder = None
+        self.capture_stats = collections.Counter()
+        self.capture_timing = CaptureTiming()
+        self.audio_source = audio_source if audio_source is not None else _configured_audio_source()
+        self.session_options = dict(session_options or {})
 
     def start(self):
         if self.realtime_session is not None:
             return False
 
         print(f"{timestamp()} Starting desktop audio Realtime answering", flush=True)
+        hedge_options = hedge_session_options()
+        primary_options = {**self.session_options, "answer_preview_callback": self.answer_preview_callback}
+        if hedge_options is not None:
+            self.hedge = HedgedAnswerCoordinator(answer_preview_callback=self.answer_preview_callback)
+            primary_options.update(
+                answer_preview_callback=self.hedge.preview_callback(0),
+                answer_gate=self.hedge.admit_answer,
+            )
         self.realtime_session = AzureRealtimeAnswerSession(
             answer_update_callback=self.answer_update_callback,
             session_reset_callback=self.session_reset_callback,
@@ -184,29 +764,144 @@ class LiveAudioManager:
             instructions_provider=self.instructions_provider,
             sample_rate=RATE,
             chunk_size=CHUNK,
+            **primary_options,
         )
         if not self.realtime_session.start():
             self.realtime_session = None
+            self.hedge = None
             return False
+        if self.hedge is not None:
+            self.hedge.attach(self.realtime_session)
+            self._start_hedge_session(hedge_options)
+        if getattr(self.realtime_session, "speculative_response", False):
+            self.turn_predictor = EndOfTurnPredictor()
+        if CAPTURE_RECORD_DIR:
+            self._start_recorder(CAPTURE_RECORD_DIR)
 
         self.desktop_capture_running = True
-        self.capture_thread = threading.Thread(target=self.capture_desktop_audio, daemon=True)
+        if self.audio_source is None:
+            self.capture_thread = threading.Thread(target=self.capture_desktop_audio, daemon=True)
+        else:
+            self.capture_thread = threading.Thread(
+                target=self.capture_from_source, args=(self.audio_source,), daemon=True
+            )
         self.capture_thread.start()
         return True
 
+    def _start_hedge_session(self, hedge_options):
+        options = {
+            **self.session_options,
+            **hedge_options,
+            "answer_preview_callback": self.hedge.preview_callback(1),
+            "answer_gate": self.hedge.admit_answer,
+        }
+        session = AzureRealtimeAnswerSession(
+            answer_update_callback=self.answer_update_callback,
+            instructions_provider=self.instructions_provider,
+            sample_rate=RATE,
+            chunk_size=CHUNK,
+            **options,
+        )
+        if not session.start():
+            print(f"{timestamp()} Hedged Realtime session did not start; answering from one deployment", flush=True)
+            return
+        self.hedge_session = session
+        label = self.hedge.attach(session)
+        print(f"{timestamp()} Hedging Realtime answers with {label}", flush=True)
+
+    def _start_recorder(self, directory):
+        path = capture_path(directory)
+        try:
+            self.recorder = CaptureRecorder(path, RATE)
+        except OSError as exc:
+            print(f"{timestamp()} Could not record desktop audio to {path}: {exc}", flush=True)
+            return
+        print(f"{timestamp()} Recording desktop audio blocks to {path}", flush=True)
+
+    def _sessions(self):
+        return [session for session in (self.realtime_session, self.hedge_session) if session is not None]
+
     def set_auto_answer_enabled(self, enabled):
-        if self.realtime_session:
-            self.realtime_session.set_auto_answer_enabled(enabled)
+        for session in self._sessions():
+            session.set_auto_answer_enabled(enabled)
 
     def refresh_instructions(self):
-        if self.realtime_session:
-            self.realtime_session.refresh_instructions()
+        for session in self._sessions():
+            session.refresh_instructions()
 
     def reset_context(self):
-        if self.realtime_session:
-            self.realtime_session.reset_context()
+        for session in self._sessions():
+            session.reset_context()
+
+    def get_metrics(self):
+        metrics = self.realtime_session.get_metrics() if self.realtime_session else {}
+        if self.hedge is not None:
+            metrics["hedge"] = self.hedge.get_metrics()
+        if self.silence_gate is not None:
+            metrics["silence_gate"] = self.silence_gate.get_metrics()
+        if self._preprocess_us:
+            preprocess = {
+                "blocks": len(self._preprocess_us),
+                "p50_us": percentile(self._preprocess_us, 0.50),
+                "p99_us": percentile(self._preprocess_us, 0.99),
+            }
+            if self.noise_gate is not None:
+                preprocess["noise_gate"] = self.noise_gate.get_metrics()
+            if self.agc is not None:
+                preprocess["agc"] = self.agc.get_metrics()
+            metrics["preprocess"] = preprocess
+        if self.capture_stats or self.capture_timing.blocks:
+            metrics["capture"] = {**self.capture_stats, **self.capture_timing.summary()}
+        return metrics
+
+    def _publish_audio(self, audio_bytes):
+        sessions = [session for session in self._sessions() if session.running]
+        if not sessions:
+            return
+        if self.recorder is not None:
+            self.recorder.write(audio_bytes)
+        if self.noise_gate is not None or self.agc is not None:
+            started_at = time.perf_counter()
+            if self.noise_gate is not None:
+                audio_bytes = self.noise_gate.process(audio_bytes)
+            if self.agc is not None:
+                audio_bytes = self.agc.process(audio_bytes)
+            self._preprocess_us.append((time.perf_counter() - started_at) * 1e6)
+        if self.turn_predictor is not None:
+            prediction = self.turn_predictor.process(audio_bytes)
+            for session in sessions:
+                if prediction == "end":
+                    session.predict_end_of_turn()
+                elif prediction == "resume":
+                    session.retract_end_of_turn()
+        blocks = [audio_bytes] if self.silence_gate is None else self.silence_gate.process(audio_bytes)
+        for block in blocks:
+            for session in sessions:
+                session.add_audio_chunk(block)
+
+    def capture_from_source(self, source):
+        """Publish blocks read from ``source`` until it ends or capture is stopped."""
+        try:
+            with source:
+                print(f"{timestamp()} Capturing audio from {source.name}", flush=True)
+                timing = self.capture_timing
+                while self.desktop_capture_running:
+                    read_started = time.perf_counter()
+                    block = source.read()
+                    if block is None:
+                        print(f"{timestamp()} Audio source {source.name} ended", flush=True)
+                        return
+                    read_done = time.perf_counter()
+                    timing.record(len(block) / 2 / source.sample_rate, (read_done - read_started) * 1000, now=read_done)
+                    self._publish_audio(block)
+        except Exception as exc:
+            print(f"{timestamp()} Audio source {source.name} failed: {exc}", flush=True)
 
     def capture_desktop_audio(self):
+        if sc is None:
+            print(f"{timestamp()} soundcard has no audio backend. Falling back to PyAudio.", flush=True)
+            self.try_pyaudio_fallback()
+            return
         try:
             loopback_mics = sc.all_microphones(include_loopback=True)
             if not loopback_mics:
@@ -221,19 +916,39 @@ class LiveAudioManager:
             )
             print(f"{timestamp()} Using desktop loopback device: {loopback_mic.name}", flush=True)
 
-            adjusted_blocksize = CHUNK * 2
-            with loopback_mic.recorder(
-                samplerate=RATE,
-                channels=1,
-                blocksize=adjusted_blocksize,
-            ) as recorder:
+            if CAPTURE_NATIVE_FORMAT and sys.platform.startswith("win"):
+                # Capture the engine mix format unchanged and convert it here in
+                # one pass instead of letting WASAPI downmix and resample.
+                recorder_context = loopback_mic.recorder(samplerate=None)
+            else:
+                recorder_context = loopback_mic.recorder(samplerate=RATE, channels=1, blocksize=CHUNK * 2)
+            with recorder_context as recorder:
+                resampler = PolyphaseResampler(recorder.samplerate, RATE, len(recorder.channelmap))
+                reader = LoopbackBlockReader(recorder, round(CHUNK * recorder.samplerate / RATE))
+                if resampler.in_rate != RATE or resampler.channels > 1:
+                    print(
+                        f"{timestamp()} Capturing {resampler.channels} channel(s) at {resampler.in_rate} Hz, "
+                        f"resampling to {RATE} Hz mono",
+                        flush=True,
+                    )
+                timing = self.capture_timing
+                block_seconds = reader.frames / recorder.samplerate
                 consecutive_errors = 0
                 while self.desktop_capture_running:
                     try:
-                        audio_data = recorder.record(CHUNK)
-                        audio_bytes = _float_audio_to_pcm16_bytes(audio_data)
-                        if self.realtime_session and self.realtime_session.running:
-                            self.realtime_session.add_audio_chunk(audio_bytes)
+                        read_started = time.perf_counter()
+                        block = reader.read()
+                        read_done = time.perf_counter()
+                        pcm = resampler.process(block)
+                        converted = time.perf_counter()
+                        timing.discontinuities = reader.discontinuities
+                        timing.record(
+                            block_seconds,
+                            (read_done - read_started) * 1000,
+                            (converted - read_done) * 1000,
+                            now=read_done,
+                        )
+                        self._publish_audio(pcm)
                         consecutive_errors = 0
                     except Exception as exc:
                         consecutive_errors += 1
@@ -273,6 +988,8 @@ class LiveAudioManager:
                 print(f"{timestamp()} No PyAudio loopback input was found.", flush=True)
                 return
 
+            downmixer = PCM16Downmixer(stereo_mix_channels, CHUNK)
+            blocks = queue.Queue(maxsize=PYAUDIO_QUEUE_BLOCKS)
             stream = audio.open(
                 format=FORMAT,
                 channels=stereo_mix_channels,
@@ -280,16 +997,21 @@ class LiveAudioManager:
                 input=True,
                 input_device_index=stereo_mix_index,
                 frames_per_buffer=CHUNK,
+                start=False,
+                stream_callback=self._pyaudio_callback(downmixer, blocks),
             )
+            stream.start_stream()
+            self.capture_stats["backend"] = "pyaudio"
             print(f"{timestamp()} Desktop audio capture started with PyAudio", flush=True)
 
-            while self.desktop_capture_running:
-                audio_chunk = stream.read(CHUNK, exception_on_overflow=False)
-                if stereo_mix_channels > 1:
-                    audio_array = np.frombuffer(audio_chunk, dtype=np.int16).reshape(-1, stereo_mix_channels)
-                    audio_chunk = np.mean(audio_array, axis=1, dtype=np.int16).tobytes()
-                if self.realtime_session and self.realtime_session.running:
-                    self.realtime_session.add_audio_chunk(audio_chunk)
+            timing = self.capture_timing
+            while self.desktop_capture_running and (stream.is_active() or not blocks.empty()):
+                try:
+                    pcm, block_seconds, convert_ms, captured_at = blocks.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                timing.record(block_seconds, convert_ms=convert_ms, now=captured_at)
+                self._publish_audio(pcm)
         except Exception as exc:
             print(f"{timestamp()} PyAudio fallback failed: {exc}", flush=True)
         finally:
@@ -302,14 +1024,49 @@ class LiveAudioManager:
             if audio is not None:
                 audio.terminate()
 
+    def _pyaudio_callback(self, downmixer, blocks):
+        """Build the PortAudio input callback: downmix each buffer and queue it for the capture thread to publish."""
+        stats = self.capture_stats
+        timing = self.capture_timing
+
+        def callback(in_data, frame_count, _time_info, status_flags):
+            started_at = time.perf_counter()
+            stats["callbacks"] += 1
+            if status_flags & pyaudio.paInputOverflow:
+                stats["input_overflows"] += 1
+                timing.discontinuities += 1
+            if status_flags & pyaudio.paInputUnderflow:
+                stats["input_underflows"] += 1
+            if not self.desktop_capture_running:
+                return None, pyaudio.paComplete
+            try:
+                pcm = downmixer.process(in_data)
+                convert_ms = (time.perf_counter() - started_at) * 1000
+                blocks.put_nowait((pcm, frame_count / RATE, convert_ms, started_at))
+            except queue.Full:
+                stats["queue_drops"] += 1
+                timing.discontinuities += 1
+            except Exception as exc:
+                stats["callback_errors"] += 1
+                print(f"{timestamp()} Skipped desktop audio block: {exc}", flush=True)
+            return None, pyaudio.paContinue
+
+        return callback
+
     def stop(self):
         self.desktop_capture_running = False
-        if self.realtime_session:
-            self.realtime_session.stop()
+        for session in self._sessions():
+            session.stop()
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
 
     def cleanup(self):
         self.stop()
-        if self.realtime_session:
-            self.realtime_session.cleanup()
-            self.realtime_session = None
+        for session in self._sessions():
+            session.cleanup()
+        self.realtime_session = None
+        self.hedge_session = None
+        if self.capture_timing.blocks:
+            print(f"{timestamp()} {self.capture_timing.format_report()}", flush=True)
         print(f"{timestamp()} Live desktop audio manager cleaned up", flush=True)
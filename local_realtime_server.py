@@ -0,0 +1,577 @@
+import asyncio
+import base64
+import collections
+import itertools
+import json
+import random
+import socket
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import websockets
+import websockets.asyncio.server
+
+
+DEFAULT_SAMPLE_RATE = 24000
+DEFAULT_ENERGY_THRESHOLD = 500.0
+AUDIO_TOKENS_PER_SECOND = 10
+UPLINK_SOCKET_BUFFER_BYTES = 4096
+UPLINK_PACKET_BYTES = 1400
+
+AnswerScript = Callable[[int], Tuple[str, str]]
+
+
+def default_answer_script(turn_index: int) -> Tuple[str, str]:
+    action = "reset" if turn_index == 1 else "append"
+    return action, f"Stand-in answer {turn_index}. This is a scripted realtime answer."
+
+
+@dataclass
+class StandInTurn:
+    index: int
+    item_id: str
+    audio_start_ms: int
+    audio_end_ms: int = 0
+    speech_stopped_at: Optional[float] = None
+    response_ids: List[str] = field(default_factory=list)
+
+
+class _RealtimeConnection:
+    def __init__(self, server, websocket):
+        self.server = server
+        self.websocket = websocket
+        self.session = {}
+        self.audio_ms = 0.0
+        self.audio_remainder = b""
+        self.in_speech = False
+        self.silence_ms = 0.0
+        self.current_turn = None
+        self.last_committed_turn = None
+        self.responses: Dict[str, asyncio.Task] = {}
+        self.pending_tasks = set()
+        self.opened_at = time.perf_counter()
+        self.first_audio_at = None
+        self.conversation: Dict[str, int] = collections.OrderedDict()
+
+    def _turn_detection(self):
+        audio = self.session.get("audio") or {}
+        return (audio.get("input") or {}).get("turn_detection") or {}
+
+    def _silence_ms(self):
+        if self.server.vad_silence_ms is not None:
+            return self.server.vad_silence_ms
+        return self._turn_detection().get("silence_duration_ms", 500)
+
+    def _prefix_padding_ms(self):
+        if self.server.vad_prefix_padding_ms is not None:
+            return self.server.vad_prefix_padding_ms
+        return self._turn_detection().get("prefix_padding_ms", 300)
+
+    async def send(self, event):
+        event.setdefault("event_id", self.server._next_id("event"))
+        self.server.sent_counts[event["type"]] += 1
+        payload = json.dumps(event, separators=(",", ":"))
+        if self.server.record_events:
+            self.server.sent_events.append(payload)
+        await self.websocket.send(payload)
+
+    def prompt_tokens(self, request=None):
+        """Approximate input tokens of a response: instructions plus the conversation or its own ``input``."""
+        instructions = len(str(self.session.get("instructions") or "")) // 4
+        if (request or {}).get("conversation") != "none":
+            return instructions + sum(self.conversation.values())
+        tokens = instructions
+        for item in request.get("input") or []:
+            if item.get("type") == "item_reference":
+                tokens += self.conversation.get(item.get("id"), 0)
+                continue
+            for content in item.get("content") or []:
+                samples = len(content.get("audio", "")) * 3 // 8
+                tokens += samples * AUDIO_TOKENS_PER_SECOND // self.server.sample_rate
+        return tokens
+
+    async def _add_item(self, item, tokens, done=True):
+        self.conversation[item["id"]] = tokens
+        await self.send({"type": "conversation.item.added", "item": dict(item)})
+        if done:
+            await self.send({"type": "conversation.item.done", "item": dict(item)})
+
+    async def _add_audio_item(self, turn):
+        if turn is None or turn.item_id in self.conversation:
+            return
+        audio_ms = max(0, turn.audio_end_ms - turn.audio_start_ms)
+        item = {"id": turn.item_id, "type": "message", "role": "user", "content": [{"type": "input_audio"}]}
+        await self._add_item(item, audio_ms * AUDIO_TOKENS_PER_SECOND // 1000)
+
+    def _schedule(self, delay_ms, coroutine_factory):
+        async def delayed():
+            if delay_ms:
+                await asyncio.sleep(delay_ms / 1000)
+            await coroutine_factory()
+
+        task = asyncio.create_task(delayed())
+        self.pending_tasks.add(task)
+        task.add_done_callback(self.pending_tasks.discard)
+
+    async def serve(self):
+        await self.send(
+            {
+                "type": "session.created",
+                "session": {"id": self.server._next_id("sess"), "type": "realtime"},
+            }
+        )
+        try:
+            async for raw_message in self.websocket:
+                if self.server.receive_delay_ms:
+                    await asyncio.sleep(self.server.receive_delay_ms / 1000)
+                await self.handle_client_event(raw_message)
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            for task in list(self.responses.values()) + list(self.pending_tasks):
+                task.cancel()
+
+    async def handle_client_event(self, raw_message):
+        event = json.loads(raw_message)
+        event_type = event.get("type", "")
+        self.server.received_counts[event_type] += 1
+        self.server.received_bytes[event_type] += len(raw_message)
+        if event_type != "input_audio_buffer.append":
+            self.server.received_at[event_type].append(time.perf_counter())
+
+        if event_type == "input_audio_buffer.append":
+            if self.first_audio_at is None:
+                self.first_audio_at = time.perf_counter()
+            await self._handle_audio(base64.b64decode(event.get("audio", "")))
+        elif event_type == "session.update":
+            self.session.update(event.get("session") or {})
+            await self.send({"type": "session.updated", "session": self.session})
+        elif event_type == "response.create":
+            self._start_response(event.get("response") or {})
+        elif event_type == "response.cancel":
+            self._cancel_responses(event.get("response_id"))
+        elif event_type == "conversation.item.create":
+            item = dict(event.get("item") or {})
+            item.setdefault("id", self.server._next_id("item"))
+            await self._add_item(item, len(json.dumps(item)) // 4)
+        elif event_type == "conversation.item.delete":
+            item_id = event.get("item_id")
+            if self.conversation.pop(item_id, None) is None:
+                await self.send(
+                    {
+                        "type": "error",
+                        "error": {"type": "invalid_request_error", "message": f"Item {item_id!r} does not exist"},
+                    }
+                )
+            else:
+                await self.send({"type": "conversation.item.deleted", "item_id": item_id})
+        elif event_type == "input_audio_buffer.commit":
+            turn = self.current_turn or self.last_committed_turn
+            self.last_committed_turn = turn
+            item_id = turn.item_id if turn else self.server._next_id("item")
+            await self.send({"type": "input_audio_buffer.committed", "item_id": item_id})
+            await self._add_audio_item(turn)
+        else:
+            await self.send(
+                {
+                    "type": "error",
+                    "error": {
+                        "type": "invalid_request_error",
+                        "message": f"Stand-in server does not support {event_type!r}",
+                    },
+                }
+            )
+
+    async def _handle_audio(self, audio):
+        audio = self.audio_remainder + audio
+        frame_bytes = self.server.frame_samples * 2
+        usable = len(audio) - len(audio) % frame_bytes
+        self.audio_remainder = audio[usable:]
+        if not usable:
+            return
+        frames = np.frombuffer(audio[:usable], dtype=np.int16).reshape(-1, self.server.frame_samples)
+        energies = np.sqrt(np.mean(np.square(frames, dtype=np.float64), axis=1))
+        frame_ms = self.server.frame_samples * 1000 / self.server.sample_rate
+        for energy in energies:
+            self._vad_frame(energy >= self.server.energy_threshold, frame_ms)
+
+    def _vad_frame(self, voiced, frame_ms):
+        frame_start_ms = self.audio_ms
+        self.audio_ms += frame_ms
+
+        if voiced:
+            self.silence_ms = 0.0
+            if not self.in_speech:
+                self.in_speech = True
+                self.server.turn_count += 1
+                turn = StandInTurn(
+                    index=self.server.turn_count,
+                    item_id=self.server._next_id("item"),
+                    audio_start_ms=int(max(0.0, frame_start_ms - self._prefix_padding_ms())),
+                )
+                self.current_turn = turn
+                self.server.turns.append(turn)
+                self._schedule(
+                    self.server.vad_event_delay_ms,
+                    lambda: self.send(
+                        {
+                            "type": "input_audio_buffer.speech_started",
+                            "audio_start_ms": turn.audio_start_ms,
+                            "item_id": turn.item_id,
+                        }
+                    ),
+                )
+            return
+
+        if not self.in_speech:
+            return
+        self.silence_ms += frame_ms
+        if self.silence_ms < self._silence_ms():
+            return
+
+        turn = self.current_turn
+        self.in_speech = False
+        self.current_turn = None
+        self.last_committed_turn = turn
+        turn.audio_end_ms = int(self.audio_ms)
+
+        async def stopped():
+            turn.speech_stopped_at = time.perf_counter()
+            await self.send(
+                {
+                    "type": "input_audio_buffer.speech_stopped",
+                    "audio_end_ms": turn.audio_end_ms,
+                    "item_id": turn.item_id,
+                }
+            )
+            await self.send({"type": "input_audio_buffer.committed", "item_id": turn.item_id})
+            await self._add_audio_item(turn)
+
+        self._schedule(self.server.vad_event_delay_ms, stopped)
+
+    def _start_response(self, request):
+        response_id = self.server._next_id("resp")
+        turn = self.last_committed_turn
+        if request.get("conversation") == "none":
+            # Out-of-band responses answer the audio they carry, usually the turn still in progress.
+            turn = self.current_turn or turn
+        if turn is not None:
+            turn.response_ids.append(response_id)
+        task = asyncio.create_task(self._run_response(response_id, request, turn))
+        self.responses[response_id] = task
+        task.add_done_callback(lambda _task: self.responses.pop(response_id, None))
+
+    def _cancel_responses(self, response_id=None):
+        for active_id, task in list(self.responses.items()):
+            if response_id is None or response_id == active_id:
+                task.cancel()
+
+    async def _run_response(self, response_id, request, turn):
+        server = self.server
+        metadata = request.get("metadata") or {}
+        response = {
+            "id": response_id,
+            "object": "realtime.response",
+            "status": "in_progress",
+            "metadata": metadata,
+            "output": [],
+        }
+        created = False
+        out_of_band = request.get("conversation") == "none"
+        prompt_tokens = self.prompt_tokens(request)
+        server.prompt_tokens.append(prompt_tokens)
+        try:
+            prefill_ms = prompt_tokens * server.prefill_us_per_token / 1000
+            await asyncio.sleep((server.response_delay_ms + prefill_ms + server._response_jitter_ms()) / 1000)
+            await self.send({"type": "response.created", "response": dict(response)})
+            created = True
+
+            action, text = server.answer_script(turn.index if turn else 0)
+            if turn is not None:
+                server.answer_turns[text.strip()] = turn
+            arguments = json.dumps({"action": action, "text": text})
+            item_id = server._next_id("item")
+            call_id = server._next_id("call")
+            item = {
+                "id": item_id,
+                "type": "function_call",
+                "status": "in_progress",
+                "call_id": call_id,
+                "name": request.get("tool_choice", {}).get("name") or "update_visible_answer",
+                "arguments": "",
+            }
+            await self.send(
+                {
+                    "type": "response.output_item.added",
+                    "response_id": response_id,
+                    "output_index": 0,
+                    "item": dict(item),
+                }
+            )
+            if not out_of_band:
+                await self._add_item(item, 0, done=False)
+            await asyncio.sleep(server.first_delta_delay_ms / 1000)
+            for start in range(0, len(arguments), server.delta_chars):
+                await self.send(
+                    {
+                        "type": "response.function_call_arguments.delta",
+                        "response_id": response_id,
+                        "item_id": item_id,
+                        "output_index": 0,
+                        "call_id": call_id,
+                        "delta": arguments[start : start + server.delta_chars],
+                    }
+                )
+                if server.delta_interval_ms:
+                    await asyncio.sleep(server.delta_interval_ms / 1000)
+            await self.send(
+                {
+                    "type": "response.function_call_arguments.done",
+                    "response_id": response_id,
+                    "item_id": item_id,
+                    "output_index": 0,
+                    "call_id": call_id,
+                    "name": item["name"],
+                    "arguments": arguments,
+                }
+            )
+            item.update(status="completed", arguments=arguments)
+            await self.send(
+                {
+                    "type": "response.output_item.done",
+                    "response_id": response_id,
+                    "output_index": 0,
+                    "item": dict(item),
+                }
+            )
+            if item_id in self.conversation:
+                self.conversation[item_id] = len(arguments) // 4
+                await self.send({"type": "conversation.item.done", "item": dict(item)})
+            response.update(
+                status="completed",
+                output=[item],
+                usage={"input_tokens": prompt_tokens, "output_tokens": len(arguments) // 4},
+            )
+            await self.send({"type": "response.done", "response": response})
+        except asyncio.CancelledError:
+            if created:
+                response["status"] = "cancelled"
+                try:
+                    await self.send({"type": "response.done", "response": response})
+                except websockets.ConnectionClosed:
+                    pass
+            raise
+
+
+def _uplink_connection_class(uplink_kbps):
+    class UplinkConnection(websockets.asyncio.server.ServerConnection):
+        """Delivers client bytes no faster than ``uplink_kbps``, like a slow last mile."""
+
+        def connection_made(self, transport):
+            super().connection_made(transport)
+            self.link_busy = False
+            self.recv_messages.resume = self._resume_after_queue
+            sock = transport.get_extra_info("socket")
+            if sock is not None:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, UPLINK_SOCKET_BUFFER_BYTES)
+
+        def data_received(self, data):
+            self.link_busy = True
+            self.transport.pause_reading()
+            delay = 0.0
+            for start in range(0, len(data), UPLINK_PACKET_BYTES):
+                packet = data[start : start + UPLINK_PACKET_BYTES]
+                delay += len(packet) * 8 / (uplink_kbps * 1000)
+                last = start + UPLINK_PACKET_BYTES >= len(data)
+                self.loop.call_later(delay, self._deliver, packet, last)
+
+        def _deliver(self, packet, last):
+            if self.transport.is_closing():
+                return
+            super().data_received(packet)
+            if last:
+                self.link_busy = False
+                if not self.recv_messages.paused:
+                    self.transport.resume_reading()
+
+        def _resume_after_queue(self):
+            if not self.link_busy:
+                self.transport.resume_reading()
+
+    return UplinkConnection
+
+
+class LocalRealtimeServer:
+    """Local WebSocket stand-in for the Azure Realtime events used by the answer session.
+
+    Turns come from a deterministic 10 ms energy VAD in audio time; delays, jitter and uplink rate are scriptable.
+    """
+
+    def __init__(
+        self,
+        host="127.0.0.1",
+        port=0,
+        sample_rate=DEFAULT_SAMPLE_RATE,
+        energy_threshold=DEFAULT_ENERGY_THRESHOLD,
+        vad_silence_ms=None,
+        vad_prefix_padding_ms=None,
+        vad_event_delay_ms=0,
+        response_delay_ms=80,
+        first_delta_delay_ms=40,
+        delta_interval_ms=5,
+        delta_chars=16,
+        receive_delay_ms=0,
+        uplink_kbps=0,
+        handshake_delay_ms=0,
+        prefill_us_per_token=0,
+        response_jitter_ms=0,
+        seed=None,
+        record_events=False,
+        answer_script: Optional[AnswerScript] = None,
+    ):
+        self.host = host
+        self.port = port
+        self.sample_rate = sample_rate
+        self.frame_samples = max(1, sample_rate // 100)
+        self.energy_threshold = energy_threshold
+        self.vad_silence_ms = vad_silence_ms
+        self.vad_prefix_padding_ms = vad_prefix_padding_ms
+        self.vad_event_delay_ms = vad_event_delay_ms
+        self.response_delay_ms = response_delay_ms
+        self.first_delta_delay_ms = first_delta_delay_ms
+        self.delta_interval_ms = delta_interval_ms
+        self.delta_chars = max(1, int(delta_chars))
+        self.receive_delay_ms = receive_delay_ms
+        self.uplink_kbps = uplink_kbps
+        self.handshake_delay_ms = handshake_delay_ms
+        self.prefill_us_per_token = prefill_us_per_token
+        self.response_jitter_ms = response_jitter_ms
+        self._rng = random.Random(seed)
+        self.answer_script = answer_script or default_answer_script
+
+        self.turns: List[StandInTurn] = []
+        self.turn_count = 0
+        self.answer_turns: Dict[str, StandInTurn] = {}
+        self.received_counts = collections.Counter()
+        self.received_bytes = collections.Counter()
+        self.received_at: Dict[str, List[float]] = collections.defaultdict(list)
+        self.sent_counts = collections.Counter()
+        self.prompt_tokens: List[int] = []
+        self.record_events = record_events
+        self.sent_events: List[str] = []
+        self.connections = set()
+        self.connection_count = 0
+        self.connection_history: List[_RealtimeConnection] = []
+
+        self.loop = None
+        self._server = None
+        self._thread = None
+        self._ready = threading.Event()
+        self._stop_future = None
+        self._ids = itertools.count(1)
+
+    @property
+    def url(self):
+        return f"ws://{self.host}:{self.port}/openai/v1/realtime"
+
+    def _next_id(self, prefix):
+        return f"{prefix}_{next(self._ids)}"
+
+    def _response_jitter_ms(self):
+        if not self.response_jitter_ms:
+            return 0.0
+        return self._rng.expovariate(1 / self.response_jitter_ms)
+
+    def turn_for_answer(self, text):
+        return self.answer_turns.get(str(text or "").strip())
+
+    async def _handle_connection(self, websocket, *_args):
+        connection = _RealtimeConnection(self, websocket)
+        self.connections.add(connection)
+        self.connection_history.append(connection)
+        self.connection_count += 1
+        try:
+            await connection.serve()
+        finally:
+            self.connections.discard(connection)
+
+    async def _process_request(self, *_args):
+        if self.handshake_delay_ms:
+            await asyncio.sleep(self.handshake_delay_ms / 1000)
+        return None
+
+    async def _drop_connections(self, limit):
+        oldest_first = sorted(self.connections, key=lambda connection: connection.opened_at)
+        dropped = oldest_first if limit is None else oldest_first[:limit]
+        for connection in dropped:
+            connection.websocket.transport.abort()
+        return len(dropped)
+
+    def drop_connections(self, limit=None, timeout=5.0):
+        """Abort open client connections without a close handshake, oldest first."""
+        future = asyncio.run_coroutine_threadsafe(self._drop_connections(limit), self.loop)
+        return future.result(timeout)
+
+    async def _serve(self):
+        self._stop_future = self.loop.create_future()
+        options = {}
+        serve = websockets.serve
+        if self.uplink_kbps:
+            serve = websockets.asyncio.server.serve
+            options["create_connection"] = _uplink_connection_class(self.uplink_kbps)
+        async with serve(
+            self._handle_connection,
+            self.host,
+            self.port,
+            max_size=None,
+            process_request=self._process_request,
+            **options,
+        ) as server:
+            self._server = server
+            if self.uplink_kbps:
+                for sock in server.sockets:
+                    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, UPLINK_SOCKET_BUFFER_BYTES)
+            self.port = server.sockets[0].getsockname()[1]
+            self._ready.set()
+            await self._stop_future
+
+    def start(self, timeout=5.0):
+        if self._thread is not None:
+            return self
+
+        def run_server_loop():
+            self.loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self.loop)
+            try:
+                self.loop.run_until_complete(self._serve())
+            finally:
+                self._ready.set()
+                self.loop.close()
+
+        self._thread = threading.Thread(target=run_server_loop, daemon=True)
+        self._thread.start()
+        if not self._ready.wait(timeout) or self._server is None:
+            raise RuntimeError("Local Realtime stand-in server did not start")
+        return self
+
+    def stop(self, timeout=5.0):
+        if self._thread is None:
+            return
+        if self.loop and not self.loop.is_closed():
+            try:
+                self.loop.call_soon_threadsafe(
+                    lambda: self._stop_future.done() or self._stop_future.set_result(None)
+                )
+            except RuntimeError:
+                pass
+        self._thread.join(timeout)
+        self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *_exc_info):
+        self.stop()
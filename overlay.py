@@ -648,6 +648,17 @@ def render_basic_answer_html(answer):
     )
 
 
+def render_answer_preview_html(answer, action, preview):
+    preview_html = html.escape(str(preview or "")).replace("\n", "<br>")
+    preview_html = (
+        f"<div style='margin-bottom: 0px; line-height: 1.2; color: {UI['muted']}; font-style: italic;'>"
+        f"{preview_html} &hellip;</div>"
+    )
+    if action == "reset" or not str(answer or "").strip():
+        return f"<div style='margin-bottom: 0px;'>{preview_html}</div>"
+    return f"{render_answer_html(answer)}<div style='margin-top: 0.6em;'>{preview_html}</div>"
+
+
 def manual_answer_metadata(mode):
     mode = str(mode or "").lower()
     if mode == "code":
@@ -1565,6 +1576,7 @@ class DraggableOverlay(QtWidgets.QWidget):
         self.current_manual_answer = ""
         self.current_manual_mode = ""
         self.last_suggested_answer = ""
+        self.answer_preview = None
 
         self.dragging = False
         self.resizing = False
@@ -1930,6 +1942,9 @@ class DraggableOverlay(QtWidgets.QWidget):
         else:
             self.interviewer_suggestion_button.setToolTip("Auto-answer disabled")
             self.interviewer_suggestion_button.setIcon(_icon("auto", UI["muted_dim"]))
+            if self.answer_preview is not None:
+                self.answer_preview = None
+                self._render_current_answer_basic()
             print(f"[{datetime.now().strftime('%H:%M:%S')}] Interviewer questions will not be auto-answered", flush=True)
         self._apply_button_style(self.interviewer_suggestion_button)
         self.auto_answer_toggled_signal.emit(bool(checked))
@@ -2325,6 +2340,7 @@ class DraggableOverlay(QtWidgets.QWidget):
     @Slot(str)
     def clear_conversation_display(self, message: str = ""):
         """Clear the current answer without adding synthetic turns."""
+        self.answer_preview = None
         self.current_answer = ""
         self.current_answer_origin = ""
         self.current_manual_answer = ""
@@ -2651,22 +2667,30 @@ class DraggableOverlay(QtWidgets.QWidget):
     @Slot(str, str)
     def apply_realtime_answer_update(self, action, text):
         """Commit one validated append/reset/no_update operation to the visible answer."""
+        had_preview = self.answer_preview is not None
+        self.answer_preview = None
         if not self.show_interviewer_suggestions:
             print(
                 f"[{datetime.now().strftime('%H:%M:%S')}] Ignoring realtime answer while Auto-Answer is disabled",
                 flush=True,
             )
+            if had_preview:
+                self._render_current_answer_basic()
             return
 
         action = str(action or "")
         text = str(text or "").strip()
         if action == "no_update":
+            if had_preview:
+                self._render_current_answer_basic()
             return
         if action not in {"append", "reset"} or not text:
             print(
                 f"[{datetime.now().strftime('%H:%M:%S')}] Ignoring invalid realtime UI update",
                 flush=True,
             )
+            if had_preview:
+                self._render_current_answer_basic()
             return
 
         if action == "append":
@@ -2674,6 +2698,8 @@ class DraggableOverlay(QtWidgets.QWidget):
             if visible_answer and text.startswith(visible_answer):
                 text = text[len(visible_answer):].lstrip()
             if not text:
+                if had_preview:
+                    self._render_current_answer_basic()
                 return
             self.current_answer = f"{visible_answer}\n\n{text}" if visible_answer else text
         else:
@@ -2687,6 +2713,25 @@ class DraggableOverlay(QtWidgets.QWidget):
             flush=True,
         )
 
+    @Slot(str, str)
+    def show_realtime_answer_preview(self, action, text):
+        """Show streaming answer text as provisional until the matching update is committed."""
+        action = str(action or "")
+        if not self.show_interviewer_suggestions:
+            return
+        text = str(text or "").strip()
+        if action not in {"append", "reset"} or not text:
+            return
+        self.answer_preview = (action, text)
+        self.update_conversation_signal.emit(render_answer_preview_html(self.current_answer, action, text))
+
+    @Slot()
+    def clear_realtime_answer_preview(self):
+        """Drop the provisional answer text and show the committed answer again."""
+        if self.answer_preview is not None:
+            self.answer_preview = None
+            self._render_current_answer_basic()
+
 # ----------------------------------------------------------------
 # Main entry point.
 if __name__ == "__main__":
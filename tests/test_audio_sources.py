@@ -0,0 +1,142 @@
+import os
+import tempfile
+import time
+import types
+import unittest
+import wave
+from unittest.mock import patch
+
+import numpy as np
+
+from audio_sources import (
+    FileAudioSource,
+    MonitorAudioSource,
+    PipeAudioSource,
+    SyntheticAudioSource,
+    synthetic_speech,
+)
+from azure_realtime import CHUNK_SIZE, SAMPLE_RATE
+
+
+def read_all(source):
+    blocks = []
+    with source:
+        while (block := source.read()) is not None:
+            blocks.append(block)
+    return blocks
+
+
+class AudioSourceTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def test_raw_file_is_split_into_blocks_with_a_short_final_block(self):
+        pcm = np.arange(250, dtype=np.int16).tobytes() + b"\x01"
+        with open(self.path("talk.pcm"), "wb") as raw_file:
+            raw_file.write(pcm)
+
+        blocks = read_all(FileAudioSource(self.path("talk.pcm"), realtime=False, block_frames=100))
+
+        self.assertEqual([len(block) for block in blocks], [200, 200, 100])
+        self.assertEqual(b"".join(blocks), pcm[:-1])
+
+    def test_stereo_wav_is_downmixed_and_can_loop(self):
+        stereo = np.array([[1000, 3000], [-2000, -4000]] * 50, dtype=np.int16)
+        with wave.open(self.path("talk.wav"), "wb") as wav_file:
+            wav_file.setnchannels(2)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(24000)
+            wav_file.writeframes(stereo.tobytes())
+
+        source = FileAudioSource(self.path("talk.wav"), loop=True, realtime=False, block_frames=60)
+        with source:
+            blocks = [source.read() for _ in range(4)]
+
+        mono = np.frombuffer(b"".join(blocks), dtype=np.int16)
+        self.assertEqual(len(mono), 200)
+        self.assertEqual(mono[:4].tolist(), [2000, -3000, 2000, -3000])
+        self.assertEqual(mono[100:104].tolist(), [2000, -3000, 2000, -3000])
+
+    def test_wav_at_another_rate_is_rejected(self):
+        with wave.open(self.path("talk.wav"), "wb") as wav_file:
+            wav_file.setnchannels(1)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(16000)
+            wav_file.writeframes(bytes(320))
+
+        with self.assertRaisesRegex(ValueError, "24000 Hz"):
+            FileAudioSource(self.path("talk.wav")).open()
+
+    def test_realtime_source_returns_blocks_no_faster_than_they_play(self):
+        source = SyntheticAudioSource(turns=1, speech_ms=60, pause_ms=0, block_frames=480)
+
+        started_at = time.perf_counter()
+        blocks = read_all(source)
+        elapsed = time.perf_counter() - started_at
+
+        self.assertEqual(len(blocks), 3)
+        self.assertGreaterEqual(elapsed, 0.055)
+
+    def test_synthetic_source_streams_the_benchmark_speech(self):
+        blocks = read_all(SyntheticAudioSource(turns=3, realtime=False, block_frames=1000))
+
+        self.assertEqual(b"".join(blocks), synthetic_speech(turns=3))
+        self.assertTrue(all(len(block) == 2000 for block in blocks[:-1]))
+
+    def test_pipe_source_reads_whole_blocks_until_end_of_stream(self):
+        pcm = np.arange(150, dtype=np.int16).tobytes()
+        with open(self.path("capture.fifo"), "wb") as writer:
+            writer.write(pcm)
+
+        source = PipeAudioSource(self.path("capture.fifo"), block_frames=100)
+        blocks = read_all(source)
+
+        self.assertEqual([len(block) for block in blocks], [200, 100])
+        self.assertEqual(b"".join(blocks), pcm)
+        self.assertFalse(source.realtime)
+
+    def test_monitor_source_records_mono_blocks_from_the_default_output_monitor(self):
+        recorded = np.full((CHUNK_SIZE, 1), 0.5, dtype=np.float32)
+        recorder = types.SimpleNamespace(entered=False, exited=False)
+
+        class FakeRecorder:
+            def __enter__(self):
+                recorder.entered = True
+                return self
+
+            def __exit__(self, *_exc_info):
+                recorder.exited = True
+
+            def record(self, frames):
+                return recorded[:frames]
+
+        requests = []
+
+        def get_microphone(name, include_loopback=False):
+            requests.append((name, include_loopback))
+            return types.SimpleNamespace(
+                name=f"Monitor of {name}",
+                recorder=lambda **kwargs: requests.append(kwargs) or FakeRecorder(),
+            )
+
+        fake_soundcard = types.SimpleNamespace(
+            default_speaker=lambda: types.SimpleNamespace(name="Built-in Audio Analog Stereo"),
+            get_microphone=get_microphone,
+        )
+        with patch("audio_sources.sc", fake_soundcard):
+            with MonitorAudioSource() as source:
+                block = source.read()
+
+        self.assertEqual(requests[0], ("Built-in Audio Analog Stereo", True))
+        self.assertEqual(requests[1], {"samplerate": SAMPLE_RATE, "channels": 1, "blocksize": CHUNK_SIZE})
+        self.assertEqual(source.name, "monitor Monitor of Built-in Audio Analog Stereo")
+        self.assertEqual(np.frombuffer(block, dtype=np.int16).tolist(), [16383] * CHUNK_SIZE)
+        self.assertTrue(recorder.entered and recorder.exited)
+
+
+if __name__ == "__main__":
+    unittest.main()
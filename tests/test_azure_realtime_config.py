@@ -1,8 +1,11 @@
+import base64
 import json
 import os
 import asyncio
+import tracemalloc
+import types
 import unittest
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
 import azure_realtime
 
@@ -19,6 +22,82 @@ class FakeWebSocket:
         self.closed = True
 
 
+class GatedAudioWebSocket(FakeWebSocket):
+    def __init__(self):
+        super().__init__()
+        self.audio_gate = asyncio.Event()
+
+    async def send(self, payload):
+        if "input_audio_buffer.append" in payload:
+            await self.audio_gate.wait()
+        await super().send(payload)
+
+
+class LowatSocket:
+    def __init__(self):
+        self.options = []
+
+    def setsockopt(self, level, option, value):
+        self.options.append((level, option, value))
+
+
+class LowatTransport:
+    def __init__(self):
+        self.sock = LowatSocket()
+        self.write_limit = None
+
+    def get_extra_info(self, name):
+        return self.sock if name == "socket" else None
+
+    def set_write_buffer_limits(self, high=None, low=None):
+        self.write_limit = high
+
+
+class DiscardingWebSocket:
+    async def send(self, payload, text=None):
+        return None
+
+    async def close(self):
+        return None
+
+
+class ReplayWebSocket(FakeWebSocket):
+    def __init__(self, raw_messages):
+        super().__init__()
+        self.raw_messages = list(raw_messages)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self.raw_messages:
+            raise StopAsyncIteration
+        return self.raw_messages.pop(0)
+
+
+class TextFrameWebSocket(FakeWebSocket):
+    def __init__(self):
+        super().__init__()
+        self.frame_types = []
+
+    async def send(self, payload, text=None):
+        self.frame_types.append((type(payload).__name__, text))
+        await super().send(bytes(payload) if isinstance(payload, memoryview) else payload)
+
+
+class CongestedWebSocket(FakeWebSocket):
+    """Records each message when written, then holds audio sends until the uplink drains."""
+
+    def __init__(self):
+        super().__init__()
+        self.uplink_drained = asyncio.Event()
+
+    async def send(self, payload, text=None):
+        await super().send(bytes(payload) if isinstance(payload, memoryview) else payload)
+        if text:
+            await self.uplink_drained.wait()
+
+
 class AzureRealtimeConfigTests(unittest.TestCase):
     def test_vad_env_parsers_use_defaults_for_missing_or_invalid_values(self):
         with patch.dict(os.environ, {}, clear=True):
@@ -67,6 +146,145 @@ class AzureRealtimeConfigTests(unittest.TestCase):
         self.assertIsNone(session.api_key)
         self.assertIsNone(session.url)
 
+    def test_audio_append_encoder_matches_the_json_event_and_reuses_its_buffer(self):
+        encoder = azure_realtime.AudioAppendEncoder(4)
+        for chunk in (b"", b"\x01", b"\x01\x02\x03\x04", bytes(range(256)) * 3, b"\xff\xfe"):
+            with self.subTest(size=len(chunk)):
+                event = json.loads(bytes(encoder.encode(chunk)))
+                self.assertEqual(
+                    event,
+                    {
+                        "type": "input_audio_buffer.append",
+                        "audio": base64.b64encode(chunk).decode("ascii"),
+                    },
+                )
+
+        first = encoder.encode(b"\x01\x02")
+        second = encoder.encode(b"\x03\x04")
+        self.assertIs(first.obj, second.obj)
+
+    def test_audio_backlog_evicts_the_oldest_audio_and_counts_dropped_time(self):
+        backlog = azure_realtime.AudioBacklog(max_ms=1, sample_rate=4000)
+        for chunk in (b"\x01\x01\x01\x01", b"\x02\x02\x02\x02", b"\x03\x03\x03\x03"):
+            backlog.put_nowait(chunk)
+
+        self.assertEqual(backlog.qsize(), 2)
+        self.assertEqual(backlog.oldest_audio_ms, 0.5)
+        self.assertEqual(backlog.dropped_ms, 0.5)
+        self.assertEqual(backlog.get_nowait(), b"\x02\x02\x02\x02")
+        self.assertEqual(backlog.backlog_ms, 0.5)
+        self.assertEqual(backlog.take_dropped_ms(), 0.5)
+        self.assertEqual(backlog.take_dropped_ms(), 0)
+
+    def connect_with_lowat(self, socket_module, **options):
+        with patch.dict(os.environ, {"AZURE_OPENAI_REALTIME_API_KEY": "key", "AZURE_OPENAI_REALTIME_DEPLOYMENT": "d"}):
+            session = azure_realtime.AzureRealtimeAnswerSession(coalesce_max_ms=500, **options)
+        websocket = types.SimpleNamespace(transport=LowatTransport())
+        with (
+            patch("azure_realtime._connect_websocket", AsyncMock(return_value=websocket)),
+            patch.object(azure_realtime, "socket", socket_module),
+        ):
+            asyncio.run(session._connect())
+        return session, websocket.transport
+
+    def test_priority_control_caps_coalesced_appends_at_the_send_low_water_mark(self):
+        lowat_socket = types.SimpleNamespace(IPPROTO_TCP=6, TCP_NOTSENT_LOWAT=25)
+        capped, transport = self.connect_with_lowat(lowat_socket, send_lowat_bytes=8192)
+        uncapped, _transport = self.connect_with_lowat(lowat_socket, priority_control=False)
+
+        self.assertEqual(capped.coalesce_max_bytes, 6144)
+        self.assertTrue(capped.get_metrics()["control"]["send_bounded"])
+        self.assertEqual(transport.sock.options, [(6, 25, 8192)])
+        self.assertEqual(transport.write_limit, 0)
+        self.assertEqual(uncapped.coalesce_max_bytes, 24000)
+
+    def test_appends_keep_their_cap_where_the_socket_cannot_bound_unsent_bytes(self):
+        lowat_socket = types.SimpleNamespace(IPPROTO_TCP=6, TCP_NOTSENT_LOWAT=25)
+        unsupported, transport = self.connect_with_lowat(types.SimpleNamespace(IPPROTO_TCP=6), send_lowat_bytes=8192)
+        disabled, disabled_transport = self.connect_with_lowat(lowat_socket, send_lowat_bytes=0)
+
+        for session, session_transport in ((unsupported, transport), (disabled, disabled_transport)):
+            self.assertEqual(session.coalesce_max_bytes, 24000)
+            self.assertFalse(session.get_metrics()["control"]["send_bounded"])
+            self.assertIsNone(session_transport.write_limit)
+        self.assertEqual(disabled_transport.sock.options, [])
+
+    def test_event_loop_uses_uvloop_only_when_chosen_and_installed(self):
+        fake_uvloop = type("FakeUvloop", (), {"new_event_loop": staticmethod(lambda: "uvloop-loop")})
+        with patch.object(azure_realtime, "uvloop", fake_uvloop):
+            self.assertEqual(azure_realtime.resolve_event_loop("auto"), "uvloop")
+            self.assertEqual(azure_realtime.resolve_event_loop("asyncio"), "asyncio")
+            self.assertEqual(azure_realtime.new_event_loop("uvloop"), "uvloop-loop")
+        with patch.object(azure_realtime, "uvloop", None):
+            self.assertEqual(azure_realtime.resolve_event_loop("auto"), "asyncio")
+            self.assertEqual(azure_realtime.resolve_event_loop("uvloop"), "asyncio")
+            self.assertEqual(azure_realtime.resolve_event_loop("trio"), "asyncio")
+            loop = azure_realtime.new_event_loop("uvloop")
+            self.assertIsInstance(loop, asyncio.AbstractEventLoop)
+            loop.close()
+
+    def test_reconnect_delay_uses_full_jitter_under_a_capped_exponential_ceiling(self):
+        ceilings = [
+            azure_realtime.reconnect_delay(attempt, base_ms=250, max_ms=1000, rng=lambda: 1.0)
+            for attempt in range(6)
+        ]
+
+        self.assertEqual(ceilings, [0.0, 0.25, 0.5, 1.0, 1.0, 1.0])
+        self.assertEqual(azure_realtime.reconnect_delay(3, base_ms=250, max_ms=1000, rng=lambda: 0.5), 0.5)
+
+    def test_answer_preview_parser_streams_text_across_split_escapes(self):
+        arguments = json.dumps({"action": "append", "text": "Use \"LRU\"\nthen caf\u00e9 \U0001F600 done."})
+        parser = azure_realtime.AnswerPreviewParser()
+        texts = []
+        for index in range(0, len(arguments), 3):
+            if parser.feed(arguments[index : index + 3]):
+                texts.append(parser.text)
+
+        self.assertFalse(parser.failed)
+        self.assertEqual(parser.action, "append")
+        self.assertTrue(parser.text_complete)
+        self.assertEqual(parser.text, "Use \"LRU\"\nthen caf\u00e9 \U0001F600 done.")
+        self.assertEqual(texts, sorted(texts, key=len))
+
+        broken = azure_realtime.AnswerPreviewParser()
+        self.assertFalse(broken.feed('["not an object"]'))
+        self.assertTrue(broken.failed)
+
+    def test_event_type_is_sniffed_only_from_a_leading_type_field(self):
+        self.assertEqual(azure_realtime.sniff_event_type('{"type":"rate_limits.updated","event_id":"e1"}'), "rate_limits.updated")
+        self.assertEqual(azure_realtime.sniff_event_type(b'{ "type": "response.done" }'), "response.done")
+        self.assertIsNone(azure_realtime.sniff_event_type('{"event_id":"e1","type":"response.done"}'))
+        self.assertIsNone(azure_realtime.sniff_event_type('{"type":"odd\\"type"}'))
+
+    def test_server_event_decoder_falls_back_to_the_stdlib_parser(self):
+        raw = '{"type":"response.done","response":{"id":"resp-1"}}'
+        with patch.object(azure_realtime, "orjson", None):
+            self.assertEqual(azure_realtime.decode_server_event(raw), json.loads(raw))
+        self.assertEqual(azure_realtime.decode_server_event(raw.encode("utf-8")), json.loads(raw))
+
+    def test_latency_histograms_fold_consecutive_turn_stages(self):
+        histograms = azure_realtime.LatencyHistograms(window=2)
+        histograms.record_turn({"speech_stopped": 1.0, "response_requested": 1.01, "response_created": 1.11, "ui_applied": 1.5})
+        histograms.record_turn({"speech_stopped": 2.0, "response_requested": 2.03})
+        histograms.record_turn({"speech_stopped": 3.0, "response_requested": 3.05})
+        histograms.record_turn({})
+
+        summary = histograms.summary()
+        self.assertEqual(
+            list(summary),
+            [
+                "speech_stopped->response_requested",
+                "response_requested->response_created",
+                "response_created->ui_applied",
+                "speech_stopped->ui_applied",
+            ],
+        )
+        self.assertEqual(summary["speech_stopped->response_requested"]["count"], 2)
+        self.assertAlmostEqual(summary["speech_stopped->response_requested"]["p50"], 40.0)
+        self.assertAlmostEqual(summary["speech_stopped->ui_applied"]["p99"], 500.0)
+        self.assertEqual(histograms.turns, 3)
+        self.assertIn("response_created->ui_applied", histograms.format_report())
+
     def test_answer_update_validation(self):
         self.assertEqual(
             azure_realtime.validate_answer_update('{"action":"append","text":" More detail. "}'),
@@ -87,6 +305,110 @@ class AzureRealtimeConfigTests(unittest.TestCase):
                 azure_realtime.validate_answer_update(payload)
 
 
+class RecordingHedgeSession:
+    def __init__(self, deployment, host):
+        self.realtime_deployment = deployment
+        self.url = f"wss://{host}/openai/v1/realtime?model={deployment}"
+        self.superseded = []
+        self.stopped_at = None
+
+    def current_turn_stopped_at(self):
+        return self.stopped_at
+
+    def supersede_turn(self, stopped_before, action, text):
+        self.superseded.append((stopped_before, action, text))
+
+
+def stopped_turn(token, stopped_at):
+    turn = azure_realtime.TurnState(token)
+    turn.marks["speech_stopped"] = stopped_at
+    return turn
+
+
+class HedgedAnswerCoordinatorTests(unittest.TestCase):
+    def make_coordinator(self, previews=None):
+        now = [0.0]
+        coordinator = azure_realtime.HedgedAnswerCoordinator(
+            answer_preview_callback=(lambda action, text: previews.append((action, text))) if previews is not None else None,
+            turn_window_ms=1000,
+            clock=lambda: now[0],
+        )
+        east = RecordingHedgeSession("gpt-realtime", "east.openai.azure.com")
+        west = RecordingHedgeSession("gpt-realtime", "west.openai.azure.com")
+        coordinator.attach(east)
+        coordinator.attach(west)
+        return coordinator, east, west, now
+
+    def test_first_answer_for_a_turn_wins_and_the_other_session_is_superseded(self):
+        coordinator, east, west, now = self.make_coordinator()
+
+        now[0] = 10.4
+        self.assertTrue(coordinator.admit_answer(west, stopped_turn("turn-1", 10.1), "reset", "West answer."))
+        now[0] = 10.9
+        self.assertFalse(coordinator.admit_answer(east, stopped_turn("turn-1", 10.0), "reset", "East answer."))
+
+        self.assertEqual(east.superseded, [(11.1, "reset", "West answer.")])
+        now[0] = 11.3
+        self.assertTrue(coordinator.admit_answer(west, stopped_turn("turn-2", 10.9), "append", "Quick follow-up."))
+        self.assertEqual(west.superseded, [])
+        metrics = coordinator.get_metrics()
+        self.assertEqual(metrics["rounds"], 2)
+        west_stats = metrics["deployments"]["gpt-realtime@west.openai.azure.com"]
+        east_stats = metrics["deployments"]["gpt-realtime@east.openai.azure.com"]
+        self.assertEqual((west_stats["wins"], west_stats["win_rate"]), (2, 1.0))
+        self.assertAlmostEqual(west_stats["p50_ms"], 350.0)
+        self.assertEqual((east_stats["answers"], east_stats["wins"], east_stats["late"]), (1, 0, 1))
+        self.assertAlmostEqual(east_stats["p50_ms"], 900.0)
+
+    def test_answers_for_an_older_turn_are_stale_once_a_newer_turn_has_won(self):
+        coordinator, east, west, now = self.make_coordinator()
+
+        now[0] = 20.5
+        self.assertTrue(coordinator.admit_answer(east, stopped_turn("turn-1", 20.0), "reset", "Newer answer."))
+        now[0] = 21.0
+        self.assertFalse(coordinator.admit_answer(west, stopped_turn("turn-1", 15.0), "append", "Old answer."))
+        now[0] = 26.0
+        self.assertTrue(coordinator.admit_answer(west, stopped_turn("turn-2", 25.0), "append", "Next answer."))
+
+        deployments = coordinator.get_metrics()["deployments"]
+        self.assertEqual(deployments["gpt-realtime@west.openai.azure.com"]["stale"], 1)
+        self.assertEqual(coordinator.rounds, 2)
+
+    def test_only_the_first_session_to_preview_a_round_is_shown(self):
+        previews = []
+        coordinator, east, west, now = self.make_coordinator(previews)
+        east_preview = coordinator.preview_callback(0)
+        west_preview = coordinator.preview_callback(1)
+
+        west_preview("append", "West")
+        east_preview("append", "East")
+        east_preview(azure_realtime.PREVIEW_DISCARD, "")
+        west_preview("append", "West words")
+        now[0] = 1.0
+        coordinator.admit_answer(west, stopped_turn("turn-1", 0.5), "append", "West words done.")
+        east.stopped_at = 2.5
+        east_preview("append", "East next")
+
+        self.assertEqual(previews, [("append", "West"), ("append", "West words"), ("append", "East next")])
+
+    def test_a_session_still_previewing_a_round_it_lost_is_not_shown(self):
+        previews = []
+        coordinator, east, west, now = self.make_coordinator(previews)
+        east_preview = coordinator.preview_callback(0)
+        west_preview = coordinator.preview_callback(1)
+        east.stopped_at, west.stopped_at = 0.4, 0.5
+
+        west_preview("append", "West words")
+        now[0] = 1.0
+        coordinator.admit_answer(west, stopped_turn("turn-1", 0.5), "append", "West words done.")
+        east_preview("append", "East words")
+        east_preview(azure_realtime.PREVIEW_DISCARD, "")
+        west.stopped_at = 3.0
+        west_preview("append", "West next")
+
+        self.assertEqual(previews, [("append", "West words"), ("append", "West next")])
+
+
 class AzureRealtimeProtocolTests(unittest.IsolatedAsyncioTestCase):
     def setUp(self):
         self.env_patch = patch.dict(
@@ -120,6 +442,10 @@ class AzureRealtimeProtocolTests(unittest.IsolatedAsyncioTestCase):
         session.websocket = FakeWebSocket()
         return session
 
+    def start_turn(self, session, response_id):
+        session._current_turn_token = session._next_turn_token()
+        session._bind_response(session._turns[session._current_turn_token], response_id)
+
     async def test_session_config_is_text_only_audio_conversation_with_forced_tool(self):
         session = self.make_session()
         await session.configure_session()
@@ -153,8 +479,46 @@ class AzureRealtimeProtocolTests(unittest.IsolatedAsyncioTestCase):
             ["session.update", "response.create"],
         )
         response = session.websocket.messages[-1]["response"]
-        self.assertEqual(response["output_modalities"], ["text"])
-        self.assertEqual(response["tool_choice"]["name"], "update_visible_answer")
+        self.assertEqual(response["metadata"]["client_turn_id"], "turn-1")
+        self.assertNotIn("instructions", response)
+        self.assertNotIn("tools", response)
+
+    async def test_session_update_is_sent_only_when_the_effective_config_changes(self):
+        instructions = ["first instructions"]
+        session = azure_realtime.AzureRealtimeAnswerSession(instructions_provider=lambda: instructions[0])
+        session.websocket = FakeWebSocket()
+        session.auto_answer_enabled = True
+
+        for item_id in ("audio-1", "audio-2"):
+            await session.handle_server_event({"type": "input_audio_buffer.speech_stopped", "item_id": item_id})
+        self.assertEqual(
+            [message["type"] for message in session.websocket.messages],
+            ["session.update", "response.create", "response.create"],
+        )
+
+        instructions[0] = "instructions with a new resume"
+        self.assertTrue(await session.configure_session())
+        self.assertFalse(await session.configure_session())
+        updates = [m for m in session.websocket.messages if m["type"] == "session.update"]
+        self.assertEqual(len(updates), 2)
+        self.assertEqual(updates[-1]["session"]["instructions"], "instructions with a new resume")
+
+        session._forget_session_config()
+        await session._create_response(session._next_turn_token())
+        self.assertEqual(
+            [message["type"] for message in session.websocket.messages[-2:]],
+            ["session.update", "response.create"],
+        )
+
+    async def test_response_create_carries_overrides_only_when_they_differ_from_the_session(self):
+        session = self.make_session()
+        unconfigured = session._response_create_event("turn-1", 0)["response"]
+        self.assertEqual(unconfigured["instructions"], "test interview instructions")
+        self.assertEqual(unconfigured["tools"], [azure_realtime.ANSWER_UPDATE_TOOL])
+
+        await session.configure_session()
+        configured = session._response_create_event("turn-1", 0)["response"]
+        self.assertEqual(set(configured), {"conversation", "metadata"})
 
     async def test_audio_still_streams_while_auto_answer_is_disabled(self):
         session = self.make_session()
@@ -175,12 +539,142 @@ class AzureRealtimeProtocolTests(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(session.websocket.messages[0]["type"], "input_audio_buffer.append")
         self.assertNotIn("response.create", [message["type"] for message in session.websocket.messages])
 
+    async def test_queued_audio_backlog_is_coalesced_up_to_the_byte_cap(self):
+        session = azure_realtime.AzureRealtimeAnswerSession(
+            instructions_provider=lambda: "instructions",
+            coalesce_max_ms=1000,
+            coalesce_max_bytes=10,
+        )
+        session.websocket = FakeWebSocket()
+        session.running = True
+        session.audio_queue = asyncio.Queue()
+        for chunk in (b"\x01\x01", b"\x02\x02", b"\x03\x03", b"\x04\x04", b"\x05\x05", b"\x06\x06"):
+            await session.audio_queue.put(chunk)
+
+        task = asyncio.create_task(session.send_audio_to_azure())
+        for _ in range(10):
+            if len(session.websocket.messages) == 2:
+                break
+            await asyncio.sleep(0)
+        session.running = False
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+        sent_audio = [base64.b64decode(message["audio"]) for message in session.websocket.messages]
+        self.assertEqual(sent_audio, [b"\x01\x01\x02\x02\x03\x03\x04\x04\x05\x05", b"\x06\x06"])
+        metrics = session.get_metrics()["audio"]
+        self.assertEqual(metrics["chunks_per_send"], {5: 1, 1: 1})
+        self.assertEqual(metrics["coalesced_sends"], 1)
+        self.assertEqual(metrics["max_chunks_per_send"], 5)
+
+    async def test_backlog_drops_surface_in_session_metrics(self):
+        session = self.make_session()
+        session.audio_queue = azure_realtime.AudioBacklog(max_ms=100, sample_rate=24000)
+        for _ in range(5):
+            session.audio_queue.put_nowait(bytes(2400))
+
+        audio = session.get_metrics()["audio"]
+
+        self.assertEqual(audio["dropped_chunks"], 3)
+        self.assertEqual(audio["dropped_ms"], 150.0)
+        self.assertEqual(audio["backlog_ms"], 100.0)
+
+    async def test_audio_ring_wakes_a_parked_reader_once_at_the_watermark(self):
+        ring = azure_realtime.AudioRing(capacity_bytes=64, watermark_bytes=8, max_wait_ms=5000)
+        backlog = azure_realtime.AudioBacklog(max_ms=1000, sample_rate=24000, ring=ring, chunk_bytes=4)
+        reader = asyncio.create_task(backlog.get())
+        await asyncio.sleep(0)
+
+        await asyncio.to_thread(ring.write, b"\x01\x01")
+        await asyncio.sleep(0.01)
+        self.assertFalse(reader.done())
+        for chunk in (b"\x02\x02", b"\x03\x03", b"\x04\x04"):
+            await asyncio.to_thread(ring.write, chunk)
+
+        self.assertEqual(await asyncio.wait_for(reader, 1.0), b"\x01\x01\x02\x02")
+        self.assertEqual(backlog.get_nowait(), b"\x03\x03\x04\x04")
+        self.assertTrue(backlog.empty())
+        self.assertEqual((ring.wakeups, ring.timer_wakeups), (2, 0))
+
+    async def test_audio_ring_sends_a_partial_block_after_the_wait_timer(self):
+        ring = azure_realtime.AudioRing(capacity_bytes=64, watermark_bytes=8, max_wait_ms=10)
+        backlog = azure_realtime.AudioBacklog(max_ms=1000, sample_rate=24000, ring=ring, chunk_bytes=4)
+        ring.write(b"\x01\x01")
+
+        self.assertEqual(await asyncio.wait_for(backlog.get(), 1.0), b"\x01\x01")
+        self.assertEqual(ring.timer_wakeups, 1)
+
+    async def test_audio_ring_overrun_drops_the_oldest_audio_into_backlog_accounting(self):
+        ring = azure_realtime.AudioRing(capacity_bytes=8, watermark_bytes=4)
+        backlog = azure_realtime.AudioBacklog(max_ms=1000, sample_rate=2000, ring=ring, chunk_bytes=4)
+        for chunk in (b"\x01\x01\x01\x01", b"\x02\x02\x02\x02", b"\x03\x03\x03\x03"):
+            ring.write(chunk)
+
+        self.assertEqual(backlog.backlog_ms, 2.0)
+        self.assertEqual(backlog.get_nowait(), b"\x02\x02\x02\x02")
+        self.assertEqual(backlog.get_nowait(), b"\x03\x03\x03\x03")
+        self.assertEqual((backlog.dropped_chunks, backlog.dropped_ms), (1, 1.0))
+
+    async def test_audio_is_sent_as_a_text_frame_from_the_encoder_buffer(self):
+        session = self.make_session()
+        session.websocket = TextFrameWebSocket()
+
+        await session._send_audio(b"\x01\x02\x03")
+        await session._send_event({"type": "response.cancel"})
+
+        self.assertEqual(session.websocket.frame_types, [("memoryview", True), ("str", None)])
+        self.assertEqual(session.websocket.messages[0]["audio"], "AQID")
+
+    async def test_control_events_overtake_audio_waiting_behind_a_congested_uplink(self):
+        session = self.make_session()
+        session.websocket = CongestedWebSocket()
+        session._create_send_lanes()
+
+        first_audio = asyncio.create_task(session._send_audio(b"\x01\x01"))
+        await asyncio.sleep(0)
+        second_audio = asyncio.create_task(session._send_audio(b"\x02\x02"))
+        await asyncio.sleep(0)
+        await asyncio.wait_for(session._send_event({"type": "response.cancel"}), 1.0)
+        await session._send_event({"type": "response.create"})
+        session.websocket.uplink_drained.set()
+        await asyncio.gather(first_audio, second_audio)
+
+        sent = [message["type"] for message in session.websocket.messages]
+        self.assertEqual(
+            sent,
+            ["input_audio_buffer.append", "response.cancel", "response.create", "input_audio_buffer.append"],
+        )
+        self.assertEqual(base64.b64decode(session.websocket.messages[-1]["audio"]), b"\x02\x02")
+        control = session.get_metrics()["control"]
+        self.assertEqual(control["sends"], 2)
+        self.assertEqual(control["overtakes"], 2)
+
+    async def test_shared_send_lock_makes_control_events_wait_behind_audio(self):
+        session = azure_realtime.AzureRealtimeAnswerSession(
+            instructions_provider=lambda: "instructions",
+            priority_control=False,
+        )
+        session.websocket = CongestedWebSocket()
+        session._create_send_lanes()
+
+        first_audio = asyncio.create_task(session._send_audio(b"\x01\x01"))
+        await asyncio.sleep(0)
+        cancel = asyncio.create_task(session._send_event({"type": "response.cancel"}))
+        await asyncio.sleep(0)
+        self.assertFalse(cancel.done())
+        session.websocket.uplink_drained.set()
+        await asyncio.gather(first_audio, cancel)
+
+        self.assertEqual(
+            [message["type"] for message in session.websocket.messages],
+            ["input_audio_buffer.append", "response.cancel"],
+        )
+
     async def test_completed_function_call_is_applied_and_acknowledged_without_followup(self):
         updates = []
         session = self.make_session(updates)
         session.auto_answer_enabled = True
-        session._current_turn_token = "turn-1"
-        session._response_turns["resp-1"] = "turn-1"
+        self.start_turn(session, "resp-1")
 
         await session.handle_server_event(
             {
@@ -213,14 +707,99 @@ class AzureRealtimeProtocolTests(unittest.IsolatedAsyncioTestCase):
         output = json.loads(session.websocket.messages[0]["item"]["output"])
         self.assertEqual(output, {"status": "applied", "action": "append"})
 
+    async def test_streaming_arguments_preview_completed_words_and_commit_on_done(self):
+        updates = []
+        previews = []
+        session = self.make_session(updates)
+        session.answer_preview_callback = lambda action, text: previews.append((action, text))
+        session.auto_answer_enabled = True
+        self.start_turn(session, "resp-1")
+
+        for delta in ('{"action":"reset","te', 'xt":"Use a hash', ' map for O(1)', ' lookups."}'):
+            await session.handle_server_event(
+                {
+                    "type": "response.function_call_arguments.delta",
+                    "response_id": "resp-1",
+                    "call_id": "call-1",
+                    "delta": delta,
+                }
+            )
+        await session.handle_server_event(
+            {
+                "type": "response.function_call_arguments.done",
+                "response_id": "resp-1",
+                "call_id": "call-1",
+                "name": "update_visible_answer",
+                "arguments": "",
+            }
+        )
+        await session.handle_server_event({"type": "response.done", "response": {"id": "resp-1", "status": "completed"}})
+
+        self.assertEqual(
+            previews,
+            [("reset", "Use a"), ("reset", "Use a hash map for"), ("reset", "Use a hash map for O(1) lookups.")],
+        )
+        self.assertEqual(updates, [("reset", "Use a hash map for O(1) lookups.")])
+
+    async def test_new_speech_discards_the_streaming_preview(self):
+        updates = []
+        previews = []
+        session = self.make_session(updates)
+        session.answer_preview_callback = lambda action, text: previews.append((action, text))
+        session.auto_answer_enabled = True
+        self.start_turn(session, "resp-1")
+
+        await session.handle_server_event(
+            {
+                "type": "response.function_call_arguments.delta",
+                "response_id": "resp-1",
+                "call_id": "call-1",
+                "delta": '{"action":"append","text":"Stale preview text',
+            }
+        )
+        await session.handle_server_event({"type": "input_audio_buffer.speech_started"})
+        await session.handle_server_event(
+            {
+                "type": "response.function_call_arguments.delta",
+                "response_id": "resp-1",
+                "call_id": "call-1",
+                "delta": ' that keeps streaming."}',
+            }
+        )
+
+        self.assertEqual(previews, [("append", "Stale preview"), (azure_realtime.PREVIEW_DISCARD, "")])
+        self.assertEqual(updates, [])
+
+    async def test_unhandled_event_types_are_skipped_before_decoding(self):
+        decoded = []
+
+        def decoder(raw_message):
+            decoded.append(raw_message)
+            return json.loads(raw_message)
+
+        session = self.make_session([])
+        session.event_decoder = decoder
+        session.websocket = ReplayWebSocket(
+            [
+                '{"type":"rate_limits.updated","rate_limits":[]}',
+                '{"type":"response.output_item.added","item":{"id":"item-1"}}',
+                '{"event_id":"e3","type":"input_audio_buffer.speech_started"}',
+                '{"type":"input_audio_buffer.speech_stopped","item_id":"item-1"}',
+            ]
+        )
+
+        await session.process_responses()
+
+        self.assertEqual(len(decoded), 2)
+        self.assertEqual(session.get_metrics()["events"], {"decoded": 2, "skipped": 2})
+        self.assertFalse(session._server_in_speech)
+
     async def test_invalid_call_retries_once_without_updating_ui(self):
         updates = []
         statuses = []
         session = self.make_session(updates, statuses)
         session.auto_answer_enabled = True
-        session._current_turn_token = "turn-1"
-        session._response_turns["resp-1"] = "turn-1"
-        session._retry_counts["turn-1"] = 0
+        self.start_turn(session, "resp-1")
 
         await session.handle_server_event(
             {
@@ -243,7 +822,7 @@ class AzureRealtimeProtocolTests(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(len(response_creates), 1)
         self.assertEqual(response_creates[0]["response"]["metadata"]["attempt"], "1")
 
-        session._response_turns["resp-2"] = "turn-1"
+        session._bind_response(session._turns["turn-1"], "resp-2")
         await session.handle_server_event(
             {
                 "type": "response.function_call_arguments.done",
@@ -268,9 +847,8 @@ class AzureRealtimeProtocolTests(unittest.IsolatedAsyncioTestCase):
         updates = []
         session = self.make_session(updates)
         session.auto_answer_enabled = True
-        session._current_turn_token = "turn-1"
+        self.start_turn(session, "resp-1")
         session._active_response_id = "resp-1"
-        session._response_turns["resp-1"] = "turn-1"
 
         await session.handle_server_event(
             {"type": "input_audio_buffer.speech_started", "item_id": "audio-2"}
@@ -295,9 +873,8 @@ class AzureRealtimeProtocolTests(unittest.IsolatedAsyncioTestCase):
         session = self.make_session([])
         session.audio_queue = asyncio.Queue()
         await session.audio_queue.put(b"old audio")
-        session._current_turn_token = "turn-1"
+        self.start_turn(session, "resp-1")
         session._active_response_id = "resp-1"
-        session._response_turns["resp-1"] = "turn-1"
 
         await session._reset_connection()
 
@@ -315,7 +892,7 @@ class AzureRealtimeProtocolTests(unittest.IsolatedAsyncioTestCase):
         connections = [FakeWebSocket(), FakeWebSocket()]
         connection_runs = 0
 
-        async def fake_connect(_url, _api_key):
+        async def fake_connect(_url, _api_key, _send_lowat_bytes=None):
             return connections.pop(0)
 
         async def fake_run_connection():
@@ -337,12 +914,219 @@ class AzureRealtimeProtocolTests(unittest.IsolatedAsyncioTestCase):
 
         self.assertEqual(resets, [True])
 
+    async def test_reconnect_replays_committed_answers_instead_of_clearing_the_ui(self):
+        resets = []
+        session = azure_realtime.AzureRealtimeAnswerSession(
+            session_reset_callback=lambda: resets.append(True),
+            instructions_provider=lambda: "instructions",
+        )
+        session.websocket = FakeWebSocket()
+        await session._apply_answer_update("resp-1", None, "reset", "Use a hash map.")
+        await session._apply_answer_update("resp-2", None, "no_update", "")
+        await session._apply_answer_update("resp-3", None, "append", "Lookups stay O(1).")
+        replacement = FakeWebSocket()
+
+        async def fake_connect(_url, _api_key, _send_lowat_bytes=None):
+            return replacement
+
+        async def fake_run_connection():
+            session.running = False
+
+        session._connected_once = True
+        session.running = True
+        with (
+            patch("azure_realtime._connect_websocket", side_effect=fake_connect),
+            patch.object(session, "_run_connection", side_effect=fake_run_connection),
+        ):
+            await session.run()
+
+        items = [message["item"] for message in replacement.messages if message["type"] == "conversation.item.create"]
+        self.assertEqual(resets, [])
+        self.assertEqual([item["type"] for item in items], ["function_call", "function_call_output"] * 2)
+        self.assertEqual(
+            [json.loads(item["arguments"]) for item in items if item["type"] == "function_call"],
+            [{"action": "reset", "text": "Use a hash map."}, {"action": "append", "text": "Lookups stay O(1)."}],
+        )
+        self.assertEqual(items[0]["call_id"], items[1]["call_id"])
+        self.assertNotIn("input_audio_buffer.append", [message["type"] for message in replacement.messages])
+
+    async def test_rehydration_keeps_the_newest_answers_within_the_token_budget(self):
+        session = azure_realtime.AzureRealtimeAnswerSession(
+            instructions_provider=lambda: "instructions",
+            rehydrate_max_tokens=60,
+        )
+        for action, text in (("reset", "a" * 160), ("append", "b" * 40), ("append", "c" * 40)):
+            session._log_answer_update(action, text)
+
+        self.assertEqual(session._rehydration_entries(), [("append", "b" * 40), ("append", "c" * 40)])
+
+        session._log_answer_update("reset", "New topic.")
+        self.assertEqual(session._rehydration_entries(), [("reset", "New topic.")])
+
+    async def test_reconnect_keeps_backing_off_instead_of_giving_up(self):
+        session = azure_realtime.AzureRealtimeAnswerSession(
+            instructions_provider=lambda: "instructions",
+            reconnect_base_ms=100,
+            reconnect_max_ms=400,
+        )
+        failures = 6
+        delays = []
+
+        async def fake_connect(_url, _api_key, _send_lowat_bytes=None):
+            nonlocal failures
+            if failures:
+                failures -= 1
+                raise OSError("connection refused")
+            return FakeWebSocket()
+
+        async def fake_run_connection():
+            session.running = False
+
+        async def record_delay(seconds):
+            delays.append(seconds)
+
+        session.running = True
+        with (
+            patch("azure_realtime._connect_websocket", side_effect=fake_connect),
+            patch("azure_realtime.random.random", return_value=1.0),
+            patch.object(session, "_run_connection", side_effect=fake_run_connection),
+            patch("azure_realtime.asyncio.sleep", side_effect=record_delay),
+        ):
+            await session.run()
+
+        self.assertEqual(delays, [0.1, 0.2, 0.4, 0.4, 0.4, 0.4])
+        self.assertEqual(session.get_metrics()["connection"]["failed_attempts"], 6)
+        self.assertEqual(session.get_metrics()["connection"]["connects"], 1)
+
+    async def test_dropped_connection_fails_over_to_the_configured_standby(self):
+        session = azure_realtime.AzureRealtimeAnswerSession(
+            instructions_provider=lambda: "instructions",
+            standby_connection=True,
+        )
+        active, standby, replacement = FakeWebSocket(), FakeWebSocket(), FakeWebSocket()
+        connections = [active, standby, replacement]
+        used = []
+
+        async def fake_connect(_url, _api_key, _send_lowat_bytes=None):
+            return connections.pop(0)
+
+        async def fake_run_connection():
+            used.append(session.websocket)
+            if len(used) == 1:
+                await session._standby_task
+            else:
+                session.running = False
+
+        session.running = True
+        with (
+            patch("azure_realtime._connect_websocket", side_effect=fake_connect),
+            patch.object(session, "_run_connection", side_effect=fake_run_connection),
+        ):
+            await session.run()
+
+        metrics = session.get_metrics()["connection"]
+        self.assertEqual(used, [active, standby])
+        self.assertEqual([message["type"] for message in standby.messages], ["session.update"])
+        self.assertEqual(metrics["standby_promotions"], 1)
+        self.assertEqual(metrics["drops"], 1)
+        self.assertIsNone(session._standby)
+        self.assertIsNone(session._standby_task)
+
+    async def speculate_and_finish_function_call(self, session):
+        session.speculative_response = True
+        session.auto_answer_enabled = True
+        await session.handle_server_event({"type": "input_audio_buffer.speech_started"})
+        await session._start_speculative_response()
+        turn_token = session._current_turn_token
+        session._bind_response(session._turns[turn_token], "resp-1")
+        await session.handle_server_event(
+            {
+                "type": "response.function_call_arguments.done",
+                "response_id": "resp-1",
+                "call_id": "call-1",
+                "name": "update_visible_answer",
+                "arguments": '{"action":"reset","text":"Early answer."}',
+            }
+        )
+        await session.handle_server_event({"type": "response.done", "response": {"id": "resp-1", "status": "completed"}})
+        return turn_token
+
+    async def test_speculative_response_is_out_of_band_and_carries_the_audio_queued_before_it(self):
+        session = self.make_session()
+        session.websocket = GatedAudioWebSocket()
+        session.running = True
+        session.speculative_response = True
+        session.auto_answer_enabled = True
+        session.coalesce_max_bytes = 4800
+        session.audio_queue = azure_realtime.AudioBacklog(max_ms=1000, sample_rate=24000)
+        chunks = [bytes([value + 1]) * 4800 for value in range(3)]
+        for chunk in chunks:
+            session.audio_queue.put_nowait(chunk)
+        await session.configure_session()
+        await session.handle_server_event(
+            {"type": "conversation.item.added", "item": {"id": "item-1", "type": "message", "role": "user"}}
+        )
+        await session.handle_server_event({"type": "input_audio_buffer.speech_started"})
+        session.websocket.messages.clear()
+
+        sender = asyncio.create_task(session.send_audio_to_azure())
+        await asyncio.sleep(0)
+        speculation = asyncio.create_task(session._start_speculative_response())
+        await asyncio.sleep(0)
+        session.websocket.audio_gate.set()
+        await asyncio.wait_for(speculation, 1.0)
+        session.running = False
+        sender.cancel()
+        await asyncio.gather(sender, return_exceptions=True)
+
+        types_sent = [message["type"] for message in session.websocket.messages]
+        self.assertEqual(types_sent, ["input_audio_buffer.append"] * 3 + ["response.create"])
+        response = session.websocket.messages[-1]["response"]
+        self.assertEqual(response["conversation"], "none")
+        self.assertEqual(response["input"][0], {"type": "item_reference", "id": "item-1"})
+        audio = response["input"][-1]["content"][0]["audio"]
+        self.assertEqual(base64.b64decode(audio), b"".join(chunks))
+
+    async def test_speculative_response_is_held_until_server_confirms_the_stop(self):
+        updates = []
+        session = self.make_session(updates)
+
+        await self.speculate_and_finish_function_call(session)
+        self.assertEqual(updates, [])
+        self.assertEqual([message["type"] for message in session.websocket.messages], ["session.update", "response.create"])
+        self.assertEqual(session.websocket.messages[-1]["response"]["conversation"], "none")
+
+        await session.handle_server_event({"type": "input_audio_buffer.speech_stopped"})
+
+        self.assertEqual(updates, [("reset", "Early answer.")])
+        self.assertEqual([m["type"] for m in session.websocket.messages].count("response.create"), 1)
+        added = [m["item"]["type"] for m in session.websocket.messages if m["type"] == "conversation.item.create"]
+        self.assertEqual(added, ["function_call", "function_call_output"])
+        self.assertIsNone(session._current_turn_token)
+        speculation = session.get_metrics()["speculation"]
+        self.assertEqual((speculation["attempts"], speculation["hits"], speculation["hit_rate"]), (1, 1, 1.0))
+
+    async def test_speculative_response_is_discarded_when_speech_resumes(self):
+        updates = []
+        session = self.make_session(updates)
+
+        turn_token = await self.speculate_and_finish_function_call(session)
+        await session._abandon_speculation()
+        await session.handle_server_event({"type": "input_audio_buffer.speech_stopped"})
+
+        self.assertEqual(updates, [])
+        self.assertIn({"type": "response.cancel"}, session.websocket.messages)
+        sent = [message["type"] for message in session.websocket.messages]
+        self.assertNotIn("input_audio_buffer.commit", sent)
+        self.assertNotIn("conversation.item.create", sent)
+        self.assertNotIn(turn_token, session._turns)
+        self.assertNotEqual(session._current_turn_token, turn_token)
+        self.assertEqual(session.get_metrics()["speculation"]["misses"], 1)
+
     async def test_freeform_text_is_treated_as_protocol_error_and_retried(self):
         session = self.make_session([])
         session.auto_answer_enabled = True
-        session._current_turn_token = "turn-1"
-        session._response_turns["resp-1"] = "turn-1"
-        session._retry_counts["turn-1"] = 0
+        self.start_turn(session, "resp-1")
 
         await session.handle_server_event(
             {
@@ -362,6 +1146,224 @@ class AzureRealtimeProtocolTests(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(len(response_creates), 1)
         self.assertEqual(response_creates[0]["response"]["metadata"]["attempt"], "1")
 
+    async def test_answered_turn_records_latency_for_every_stage(self):
+        session = self.make_session([])
+        session.auto_answer_enabled = True
+        session._last_audio_enqueue_at = 0.5
+        session._audio_flushed_at = (0.5, 0.6)
+        await session.handle_server_event({"type": "input_audio_buffer.speech_stopped"})
+        turn_token = session._current_turn_token
+        arguments = '{"action":"reset","text":"Timed answer."}'
+        for event in (
+            {"type": "response.created", "response": {"id": "resp-1", "metadata": {"client_turn_id": turn_token}}},
+            {"type": "response.function_call_arguments.delta", "response_id": "resp-1", "call_id": "call-1", "delta": arguments},
+            {
+                "type": "response.function_call_arguments.done",
+                "response_id": "resp-1",
+                "call_id": "call-1",
+                "name": "update_visible_answer",
+                "arguments": arguments,
+            },
+            {"type": "response.done", "response": {"id": "resp-1", "status": "completed"}},
+        ):
+            await session.handle_server_event(event)
+
+        latency = session.get_metrics()["latency"]
+        stages = azure_realtime.SPAN_STAGES
+        expected = [f"{start}->{end}" for start, end in zip(stages, stages[1:])] + ["speech_stopped->ui_applied"]
+        self.assertEqual(list(latency), expected)
+        self.assertTrue(all(stats["count"] == 1 for stats in latency.values()))
+        self.assertAlmostEqual(latency["audio_enqueued->audio_sent"]["p50"], 100.0)
+
+    async def test_latency_spans_can_be_disabled(self):
+        session = self.make_session([])
+        session.latency_spans = False
+        session.auto_answer_enabled = True
+        await session.handle_server_event({"type": "input_audio_buffer.speech_stopped"})
+        await session.handle_server_event(
+            {"type": "response.done", "response": {"id": "resp-1", "status": "cancelled", "metadata": {"client_turn_id": "turn-1"}}}
+        )
+
+        self.assertEqual(session.get_metrics()["latency"], {})
+
+    async def test_superseded_answer_is_not_shown_and_the_winner_is_adopted_as_context(self):
+        updates = []
+        session = self.make_session(updates)
+        session.auto_answer_enabled = True
+        session.answer_gate = lambda _session, _turn, _action, _text: False
+        self.start_turn(session, "resp-1")
+        await session.handle_server_event(
+            {
+                "type": "response.function_call_arguments.done",
+                "response_id": "resp-1",
+                "call_id": "call-1",
+                "name": "update_visible_answer",
+                "arguments": '{"action":"reset","text":"Slow answer."}',
+            }
+        )
+        await session.handle_server_event({"type": "response.done", "response": {"id": "resp-1", "status": "completed"}})
+        await session._supersede_turn(0.0, "reset", "Fast answer.")
+
+        self.assertEqual(updates, [])
+        outputs = [json.loads(m["item"]["output"]) for m in session.websocket.messages if m["item"]["type"] == "function_call_output"]
+        self.assertEqual(outputs[0], {"status": "superseded", "action": "reset"})
+        self.assertEqual(outputs[1], {"status": "applied", "action": "reset"})
+        self.assertNotIn("response.create", [m["type"] for m in session.websocket.messages])
+        self.assertEqual(session._answer_log, [("reset", "Fast answer.")])
+
+    async def test_superseding_cancels_the_losing_turn_still_in_flight(self):
+        session = self.make_session([])
+        self.start_turn(session, "resp-1")
+        session._active_response_id = "resp-1"
+        session._turns[session._current_turn_token].marks["speech_stopped"] = 5.0
+
+        await session._supersede_turn(6.0, "append", "Winner.")
+
+        self.assertEqual(session.websocket.messages[0], {"type": "response.cancel", "response_id": "resp-1"})
+        self.assertIsNone(session._current_turn_token)
+
+    async def add_conversation_items(self, session, *items):
+        for item in items:
+            await session.handle_server_event({"type": "conversation.item.added", "item": item})
+
+    def audio_item(self, item_id):
+        return {"id": item_id, "type": "message", "role": "user", "content": [{"type": "input_audio"}]}
+
+    def answer_items(self, index, text):
+        arguments = json.dumps({"action": "append", "text": text})
+        return (
+            {"id": f"fc-{index}", "type": "function_call", "call_id": f"call-{index}", "arguments": arguments},
+            {"id": f"out-{index}", "type": "function_call_output", "call_id": f"call-{index}", "output": "{}"},
+        )
+
+    async def test_idle_session_deletes_old_audio_and_answer_history_beyond_the_budget(self):
+        session = self.make_session()
+        session.context_audio_turns = 2
+        session.context_history_max_tokens = 120
+        await self.add_conversation_items(
+            session,
+            *self.answer_items(1, "First answer " * 20),
+            *self.answer_items(2, "Second answer " * 10),
+            *self.answer_items(3, "Third answer " * 10),
+            self.audio_item("audio-1"),
+            self.audio_item("audio-2"),
+            self.audio_item("audio-3"),
+        )
+
+        deleted = [m["item_id"] for m in session.websocket.messages if m["type"] == "conversation.item.delete"]
+        self.assertEqual(deleted, ["fc-1", "out-1", "fc-2", "out-2", "audio-1"])
+        self.assertEqual(list(session._conversation), ["fc-3", "out-3", "audio-2", "audio-3"])
+        for item_id in deleted:
+            await session.handle_server_event({"type": "conversation.item.deleted", "item_id": item_id})
+        conversation = session.get_metrics()["conversation"]
+        self.assertEqual((conversation["items"], conversation["audio_items"], conversation["deleted"]), (4, 2, 5))
+
+    async def test_conversation_is_pruned_only_after_the_in_flight_response_finishes(self):
+        session = self.make_session([])
+        session.context_audio_turns = 1
+        self.start_turn(session, "resp-1")
+        await self.add_conversation_items(session, self.audio_item("audio-1"), self.audio_item("audio-2"))
+        await session.handle_server_event(
+            {"type": "conversation.item.done", "item": self.answer_items(9, "late")[0]}
+        )
+        self.assertEqual(list(session._conversation), ["audio-1", "audio-2"])
+
+        await session.handle_server_event({"type": "response.done", "response": {"id": "resp-1", "status": "cancelled"}})
+
+        self.assertEqual(
+            [m for m in session.websocket.messages if m["type"] == "conversation.item.delete"],
+            [{"type": "conversation.item.delete", "item_id": "audio-1"}],
+        )
+
+    async def test_context_pruning_can_be_disabled(self):
+        session = self.make_session()
+        session.context_pruning = False
+        session.context_audio_turns = 1
+        await self.add_conversation_items(session, *(self.audio_item(f"audio-{index}") for index in range(5)))
+
+        self.assertEqual(session.websocket.messages, [])
+        self.assertEqual(session.get_metrics()["conversation"]["audio_items"], 5)
+
+
+class AzureRealtimeSoakTests(unittest.IsolatedAsyncioTestCase):
+    async def drive_turn(self, session, index):
+        response_id = f"resp-{index}"
+        await session.handle_server_event({"type": "input_audio_buffer.speech_started"})
+        await session.handle_server_event({"type": "input_audio_buffer.speech_stopped"})
+        if index % 7 == 0:
+            return
+        turn_token = session._current_turn_token
+        await session.handle_server_event(
+            {
+                "type": "response.created",
+                "response": {"id": response_id, "metadata": {"client_turn_id": turn_token}},
+            }
+        )
+        if index % 5 == 0:
+            await session.handle_server_event({"type": "input_audio_buffer.speech_started"})
+            await session.handle_server_event(
+                {"type": "response.done", "response": {"id": response_id, "status": "cancelled"}}
+            )
+            return
+        call_id = f"call-{index}"
+        action = "reset" if index % 11 == 0 else "append"
+        arguments = json.dumps({"action": action, "text": f"Answer {index} with enough words to be realistic."})
+        for start in range(0, len(arguments), 16):
+            await session.handle_server_event(
+                {
+                    "type": "response.function_call_arguments.delta",
+                    "response_id": response_id,
+                    "call_id": call_id,
+                    "delta": arguments[start : start + 16],
+                }
+            )
+        await session.handle_server_event(
+            {
+                "type": "response.function_call_arguments.done",
+                "response_id": response_id,
+                "call_id": call_id,
+                "name": "update_visible_answer",
+                "arguments": "",
+            }
+        )
+        await session.handle_server_event(
+            {"type": "response.done", "response": {"id": response_id, "status": "completed"}}
+        )
+
+    async def test_thousands_of_turns_keep_per_turn_state_and_memory_flat(self):
+        with patch.dict(
+            os.environ,
+            {
+                "AZURE_OPENAI_REALTIME_API_KEY": "test-key",
+                "AZURE_OPENAI_REALTIME_ENDPOINT": "https://realtime.openai.azure.com",
+                "AZURE_OPENAI_REALTIME_DEPLOYMENT": "gpt-realtime-2.1-mini",
+            },
+            clear=True,
+        ):
+            session = azure_realtime.AzureRealtimeAnswerSession(
+                answer_update_callback=lambda action, text: None,
+                instructions_provider=lambda: "test interview instructions",
+            )
+        session.websocket = DiscardingWebSocket()
+        session.auto_answer_enabled = True
+
+        for index in range(1, 301):
+            await self.drive_turn(session, index)
+        session_code = [tracemalloc.Filter(True, azure_realtime.__file__, all_frames=True)]
+        tracemalloc.start(8)
+        try:
+            baseline = tracemalloc.take_snapshot().filter_traces(session_code)
+            for index in range(301, 2301):
+                await self.drive_turn(session, index)
+            current = tracemalloc.take_snapshot().filter_traces(session_code)
+        finally:
+            tracemalloc.stop()
+        growth = sum(stat.size_diff for stat in current.compare_to(baseline, "filename"))
+
+        self.assertLessEqual(len(session._turns), azure_realtime.TURN_STATE_RETENTION)
+        self.assertLessEqual(len(session._response_turns), 1)
+        self.assertLess(growth, 32 * 1024)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,102 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from capture_recording import CAPTURE_FLUSH_BLOCKS, CAPTURE_INDEX_SUFFIX, CaptureRecorder, CaptureRecording, replay_capture
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class RecordingSession:
+    def __init__(self, clock):
+        self.clock = clock
+        self.chunks = []
+
+    def add_audio_chunk(self, chunk):
+        self.chunks.append((self.clock(), chunk))
+
+
+class CaptureRecordingTests(unittest.TestCase):
+    def setUp(self):
+        self.scratch = tempfile.TemporaryDirectory()
+        self.addCleanup(self.scratch.cleanup)
+        self.path = os.path.join(self.scratch.name, "captures", "capture.wav")
+
+    def record(self, timed_blocks):
+        clock = FakeClock()
+        with CaptureRecorder(self.path, 24000, clock=clock) as recorder:
+            for seconds, block in timed_blocks:
+                clock.now = 10.0 + seconds
+                recorder.write(block)
+        return recorder
+
+    def test_recording_round_trips_block_boundaries_and_offsets(self):
+        blocks = [
+            (0.0, np.arange(1024, dtype=np.int16).tobytes()),
+            (0.5, np.full(240, -7, dtype=np.int16).tobytes()),
+            (0.5, np.full(480, 9, dtype=np.int16).tobytes()),
+        ]
+        recorder = self.record(blocks)
+
+        recording = CaptureRecording(self.path)
+
+        self.assertEqual((recorder.blocks, recorder.samples), (3, 1744))
+        self.assertEqual(recording.sample_rate, 24000)
+        self.assertEqual(list(recording.blocks()), blocks)
+        self.assertAlmostEqual(recording.duration_s, 0.52)
+
+    def test_sidecar_that_does_not_match_the_audio_is_rejected(self):
+        self.record([(0.0, bytes(2048)), (0.1, bytes(2048))])
+        with open(self.path + CAPTURE_INDEX_SUFFIX, "r+b") as index_file:
+            index_file.truncate(12)
+
+        with self.assertRaises(ValueError):
+            CaptureRecording(self.path)
+
+    def test_recording_of_a_killed_session_replays_up_to_its_last_flushed_block(self):
+        blocks = [(index * 0.01, np.full(240, index, dtype=np.int16).tobytes()) for index in range(75)]
+        crashed = os.path.join(self.scratch.name, "crashed.wav")
+        clock = FakeClock()
+        recorder = CaptureRecorder(self.path, 24000, clock=clock)
+        for seconds, block in blocks:
+            clock.now = seconds
+            recorder.write(block)
+        for suffix in ("", CAPTURE_INDEX_SUFFIX):
+            with open(self.path + suffix, "rb") as source, open(crashed + suffix, "wb") as copy:
+                copy.write(source.read())
+        recorder.close()
+
+        recording = CaptureRecording(crashed)
+
+        recovered = list(recording.blocks())
+        self.assertTrue(recording.recovered)
+        self.assertGreaterEqual(len(recovered), CAPTURE_FLUSH_BLOCKS)
+        self.assertEqual(recovered, blocks[: len(recovered)])
+        self.assertFalse(CaptureRecording(self.path).recovered)
+
+    def test_replay_feeds_blocks_on_the_recorded_schedule_scaled_by_speed(self):
+        self.record([(0.0, bytes(480)), (0.2, bytes(480)), (0.2, bytes(480)), (1.0, bytes(480))])
+        clock = FakeClock()
+        session = RecordingSession(clock)
+
+        lag_ms = replay_capture(session.add_audio_chunk, CaptureRecording(self.path), speed=2.0, clock=clock, sleep=clock.sleep)
+
+        self.assertEqual([round(at, 6) for at, _chunk in session.chunks], [0.0, 0.1, 0.1, 0.5])
+        self.assertEqual(lag_ms, 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
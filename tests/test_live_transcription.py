@@ -1,9 +1,43 @@
+import os
+import queue
+import tempfile
+import types
 import unittest
 from unittest.mock import patch
 
 import numpy as np
 
-from live_transcription import LiveAudioManager, _float_audio_to_pcm16_bytes
+import live_transcription
+from capture_recording import CaptureRecording, replay_capture
+from audio_sources import FileAudioSource, PipeAudioSource, SyntheticAudioSource, synthetic_speech
+from live_transcription import (
+    CHUNK,
+    RATE,
+    AutomaticGainControl,
+    CaptureTiming,
+    EndOfTurnPredictor,
+    LiveAudioManager,
+    LoopbackBlockReader,
+    PCM16Converter,
+    PCM16Downmixer,
+    PolyphaseResampler,
+    SilenceGate,
+    SpectralNoiseGate,
+    create_audio_source,
+)
+
+
+def float_audio_to_pcm16_bytes(audio_data):
+    if len(audio_data.shape) > 1 and audio_data.shape[1] > 1:
+        audio_data = np.mean(audio_data, axis=1)
+    audio_data = np.asarray(audio_data, dtype=np.float32).flatten()
+    audio_data = np.clip(audio_data, -1.0, 1.0)
+    return (audio_data * 32767).astype(np.int16).tobytes()
+
+
+def pcm_block(amplitude, samples=240, sample_rate=24000):
+    t = np.arange(samples) / sample_rate
+    return (np.sin(2 * np.pi * 200 * t) * amplitude).astype(np.int16).tobytes()
 
 
 class FakeRealtimeSession:
@@ -11,6 +45,8 @@ class FakeRealtimeSession:
 
     def __init__(self, **kwargs):
         self.kwargs = kwargs
+        self.url = kwargs.get("url", "wss://primary.openai.azure.com/openai/v1/realtime")
+        self.realtime_deployment = kwargs.get("deployment", "gpt-realtime")
         self.running = False
         self.enabled_values = []
         self.refresh_count = 0
@@ -35,6 +71,9 @@ class FakeRealtimeSession:
     def add_audio_chunk(self, chunk):
         self.audio_chunks.append(chunk)
 
+    def get_metrics(self):
+        return {"audio": {"sends": len(self.audio_chunks)}}
+
     def stop(self):
         self.running = False
 
@@ -44,14 +83,60 @@ class FakeRealtimeSession:
 
 
 class FakeThread:
-    def __init__(self, target=None, **_kwargs):
+    def __init__(self, target=None, args=(), **_kwargs):
         self.target = target
+        self.args = args
         self.started = False
 
     def start(self):
         self.started = True
 
 
+class FakePyAudioStream:
+    def __init__(self, callback, buffers):
+        self.callback = callback
+        self.buffers = buffers
+        self.active = False
+        self.closed = False
+
+    def start_stream(self):
+        self.active = True
+        for in_data, status in self.buffers:
+            self.callback(in_data, len(in_data) // 4, {}, status)
+        self.active = False
+
+    def is_active(self):
+        return self.active
+
+    def stop_stream(self):
+        self.active = False
+
+    def close(self):
+        self.closed = True
+
+
+def fake_pyaudio_module(buffers):
+    module = types.SimpleNamespace(paInputUnderflow=0x1, paInputOverflow=0x2, paContinue=0, paComplete=1)
+
+    class FakePyAudio:
+        def get_device_count(self):
+            return 1
+
+        def get_device_info_by_index(self, _index):
+            return {"name": "Stereo Mix (Realtek)", "maxInputChannels": 2}
+
+        def open(self, stream_callback=None, **kwargs):
+            module.open_kwargs = kwargs
+            module.stream = FakePyAudioStream(stream_callback, buffers)
+            return module.stream
+
+        def terminate(self):
+            pass
+
+    module.PyAudio = FakePyAudio
+    return module
+
+
 class LiveAudioManagerTests(unittest.TestCase):
     def setUp(self):
         FakeRealtimeSession.instances = []
@@ -73,9 +158,42 @@ class LiveAudioManagerTests(unittest.TestCase):
         session = FakeRealtimeSession.instances[0]
         self.assertIs(session, manager.realtime_session)
         self.assertIs(session.kwargs["answer_update_callback"], manager.answer_update_callback)
+        self.assertIs(session.kwargs["answer_preview_callback"], manager.answer_preview_callback)
         self.assertFalse(hasattr(manager, "mic_streamer"))
         self.assertTrue(manager.capture_thread.started)
 
+    def test_hedge_deployment_gets_its_own_gated_session_fed_the_same_audio(self):
+        manager = LiveAudioManager(
+            answer_update_callback=lambda action, text: None,
+            session_options={"url": "wss://east.openai.azure.com/openai/v1/realtime", "speculative_response": True},
+        )
+        manager.silence_gate = None
+        hedge_options = {"url": "wss://west.openai.azure.com/openai/v1/realtime", "api_key": "key", "deployment": "gpt-realtime"}
+
+        with (
+            patch("live_transcription.AzureRealtimeAnswerSession", FakeRealtimeSession),
+            patch("live_transcription.threading.Thread", FakeThread),
+            patch("live_transcription.hedge_session_options", return_value=hedge_options),
+        ):
+            self.assertTrue(manager.start())
+
+        primary, hedge = FakeRealtimeSession.instances
+        self.assertIs(manager.hedge_session, hedge)
+        self.assertEqual(hedge.kwargs["url"], hedge_options["url"])
+        self.assertTrue(hedge.kwargs["speculative_response"])
+        self.assertNotIn("status_callback", hedge.kwargs)
+        for session in (primary, hedge):
+            self.assertEqual(session.kwargs["answer_gate"], manager.hedge.admit_answer)
+        manager._publish_audio(pcm_block(8000))
+        manager.set_auto_answer_enabled(True)
+        self.assertEqual([len(primary.audio_chunks), len(hedge.audio_chunks)], [1, 1])
+        self.assertEqual(hedge.enabled_values, [True])
+        self.assertEqual(len(manager.get_metrics()["hedge"]["deployments"]), 2)
+
+        manager.cleanup()
+        self.assertTrue(hedge.cleaned)
+        self.assertIsNone(manager.hedge_session)
+
     def test_manager_forwards_toggle_resume_refresh_and_context_reset(self):
         manager = LiveAudioManager()
         manager.realtime_session = FakeRealtimeSession()
@@ -101,13 +219,460 @@ class LiveAudioManagerTests(unittest.TestCase):
         self.assertTrue(session.cleaned)
         self.assertIsNone(manager.realtime_session)
 
+    def test_audio_source_replaces_desktop_capture_and_feeds_the_session(self):
+        manager = LiveAudioManager(
+            audio_source=SyntheticAudioSource(turns=1, speech_ms=100, pause_ms=0, realtime=False),
+            session_options={"url": "ws://127.0.0.1:9/openai/v1/realtime", "api_key": "local"},
+        )
+        manager.silence_gate = None
+
+        with (
+            patch("live_transcription.AzureRealtimeAnswerSession", FakeRealtimeSession),
+            patch("live_transcription.threading.Thread", FakeThread),
+        ):
+            self.assertTrue(manager.start())
+
+        session = manager.realtime_session
+        self.assertEqual(session.kwargs["url"], "ws://127.0.0.1:9/openai/v1/realtime")
+        self.assertEqual(manager.capture_thread.target, manager.capture_from_source)
+        session.running = True
+        manager.capture_thread.target(*manager.capture_thread.args)
+        self.assertEqual(b"".join(session.audio_chunks), synthetic_speech(turns=1, speech_ms=100, pause_ms=0))
+        self.assertEqual(len(session.audio_chunks), 3)
+        capture = manager.get_metrics()["capture"]
+        self.assertEqual(capture["blocks"], 3)
+        self.assertAlmostEqual(capture["audio_seconds"], 0.1)
+        self.assertIn("read_ms", capture)
+
+    def test_audio_source_specs(self):
+        self.assertIsNone(create_audio_source("desktop"))
+        self.assertIsNone(create_audio_source(""))
+        source = create_audio_source(r"file:C:\audio\talk.wav", realtime=False)
+        self.assertIsInstance(source, FileAudioSource)
+        self.assertEqual(source.path, r"C:\audio\talk.wav")
+        self.assertFalse(source.realtime)
+        self.assertEqual(create_audio_source("pipe:-").path, "-")
+        self.assertIsInstance(create_audio_source("PIPE:/tmp/capture.fifo"), PipeAudioSource)
+        self.assertTrue(create_audio_source("synthetic").realtime)
+        self.assertEqual(create_audio_source("monitor:Speakers").device, "Speakers")
+        self.assertIsNone(create_audio_source("monitor").device)
+        for spec in ("file:", "microphone"):
+            with self.assertRaises(ValueError):
+                create_audio_source(spec)
+
+    def test_unusable_audio_source_spec_falls_back_to_desktop_capture(self):
+        with patch("live_transcription.AUDIO_SOURCE", "tape:deck"):
+            manager = LiveAudioManager()
+        self.assertIsNone(manager.audio_source)
+
+    def test_pyaudio_fallback_publishes_callback_buffers_and_counts_overflows(self):
+        stereo = np.array([[32767, 32767], [-32768, -32768], [100, -101]], dtype=np.int16).tobytes()
+        module = fake_pyaudio_module([(stereo, 0), (stereo, 0x2), (stereo, 0x1)])
+        manager = LiveAudioManager()
+        manager.realtime_session = FakeRealtimeSession()
+        manager.realtime_session.running = True
+        manager.desktop_capture_running = True
+
+        with patch.object(live_transcription, "pyaudio", module):
+            manager.try_pyaudio_fallback()
+
+        self.assertEqual((module.open_kwargs["channels"], module.open_kwargs["start"]), (2, False))
+        self.assertTrue(module.stream.closed)
+        chunks = manager.realtime_session.audio_chunks
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual(np.frombuffer(chunks[0], dtype=np.int16).tolist(), [32767, -32768, -1])
+        capture = manager.get_metrics()["capture"]
+        self.assertEqual(
+            {name: capture[name] for name in ("backend", "callbacks", "input_overflows", "input_underflows")},
+            {"backend": "pyaudio", "callbacks": 3, "input_overflows": 1, "input_underflows": 1},
+        )
+        self.assertEqual((capture["blocks"], capture["discontinuities"]), (3, 1))
+        self.assertIn("convert_ms", capture)
+
+    def test_pyaudio_callback_only_queues_blocks_and_counts_a_full_queue_as_a_drop(self):
+        module = fake_pyaudio_module([])
+        manager = LiveAudioManager()
+        manager.realtime_session = FakeRealtimeSession()
+        manager.realtime_session.running = True
+        manager.desktop_capture_running = True
+        blocks = queue.Queue(maxsize=1)
+        stereo = np.array([[100, 200], [300, 400]], dtype=np.int16).tobytes()
+
+        with patch.object(live_transcription, "pyaudio", module):
+            callback = manager._pyaudio_callback(PCM16Downmixer(2, 2), blocks)
+            self.assertEqual(callback(stereo, 2, {}, 0), (None, module.paContinue))
+            self.assertEqual(callback(stereo, 2, {}, 0), (None, module.paContinue))
+
+        self.assertEqual(manager.realtime_session.audio_chunks, [])
+        pcm, block_seconds, _convert_ms, _captured_at = blocks.get_nowait()
+        self.assertEqual(np.frombuffer(pcm, dtype=np.int16).tolist(), [150, 350])
+        self.assertEqual(block_seconds, 2 / RATE)
+        self.assertEqual(manager.capture_stats["queue_drops"], 1)
+        self.assertEqual(manager.capture_timing.discontinuities, 1)
+
+    def test_downmix_widens_before_averaging(self):
+        downmixer = PCM16Downmixer(channels=2, frames=2)
+        stereo = np.array([[30000, 30000], [-30000, -20000], [1, 2]], dtype=np.int16).tobytes()
+
+        pcm = np.frombuffer(downmixer.process(stereo), dtype=np.int16)
+
+        self.assertEqual(pcm.tolist(), [30000, -25000, 1])
+
     def test_float_desktop_audio_is_converted_to_mono_pcm16(self):
         stereo = np.array([[1.0, -1.0], [0.5, 0.5]], dtype=np.float32)
 
-        pcm = np.frombuffer(_float_audio_to_pcm16_bytes(stereo), dtype=np.int16)
+        pcm = np.frombuffer(PCM16Converter(channels=2, frames=2).convert(stereo), dtype=np.int16)
 
         self.assertEqual(pcm.tolist(), [0, 16383])
 
 
+class FakeWasapiRecorder:
+    """Serves float32 packets through the private ``_Recorder`` capture calls."""
+
+    def __init__(self, packets, channels=2):
+        self.packets = list(packets)
+        self.channelmap = list(range(channels))
+        self.samplerate = 24000
+        self.deviceperiod = (0.01, 0.003)
+        self._idle_start_time = None
+        self.released = []
+
+    def _capture_available_frames(self):
+        return len(self.packets[0][0]) if self.packets else 0
+
+    def _capture_buffer(self):
+        frames, flags = self.packets[0]
+        return frames.tobytes(), len(frames), flags
+
+    def _capture_release(self, frames):
+        self.released.append(frames)
+        self.packets.pop(0)
+
+
+FAKE_MEDIAFOUNDATION = types.SimpleNamespace(
+    _ffi=types.SimpleNamespace(NULL=None, buffer=lambda data, size: data[:size]),
+    _ole32=types.SimpleNamespace(AUDCLNT_BUFFERFLAGS_DATA_DISCONTINUITY=0x1, AUDCLNT_BUFFERFLAGS_SILENT=0x2),
+)
+
+
+class CaptureConversionTests(unittest.TestCase):
+    def test_converter_matches_the_allocating_conversion(self):
+        converter = PCM16Converter(channels=2, frames=4)
+        rng = np.random.default_rng(1)
+        for frames in (rng.uniform(-1.5, 1.5, (4, 2)), rng.uniform(-1, 1, (6, 2)), rng.uniform(-1, 1, (3, 1))):
+            frames = frames.astype(np.float32)
+            with self.subTest(shape=frames.shape):
+                self.assertEqual(converter.convert(frames), float_audio_to_pcm16_bytes(frames))
+
+    def test_converted_bytes_survive_the_next_block(self):
+        converter = PCM16Converter(channels=1, frames=2)
+
+        first = converter.convert(np.array([0.5, -0.5], dtype=np.float32))
+        converter.convert(np.array([1.0, 1.0], dtype=np.float32))
+
+        self.assertEqual(np.frombuffer(first, dtype=np.int16).tolist(), [16383, -16383])
+
+    def test_reader_splits_packets_into_blocks_and_zeroes_silent_packets(self):
+        stream = np.arange(20, dtype=np.float32).reshape(10, 2)
+        packets = [(stream[:3], 0), (stream[3:8], 0), (np.ones((2, 2), dtype=np.float32), 0x2), (stream[:2], 0)]
+        recorder = FakeWasapiRecorder(packets)
+
+        with patch.object(live_transcription, "_sc_mediafoundation", FAKE_MEDIAFOUNDATION):
+            reader = LoopbackBlockReader(recorder, frames=4)
+            blocks = [reader.read().copy() for _ in range(3)]
+
+        np.testing.assert_array_equal(blocks[0], stream[:4])
+        np.testing.assert_array_equal(blocks[1], stream[4:8])
+        np.testing.assert_array_equal(blocks[2], np.vstack((np.zeros((2, 2)), stream[:2])))
+        self.assertEqual(recorder.released, [3, 5, 2, 2])
+
+    def test_reader_counts_discontinuities_after_the_first_packet(self):
+        packet = np.zeros((2, 1), dtype=np.float32)
+        recorder = FakeWasapiRecorder([(packet, 0x1), (packet, 0), (packet, 0x1), (packet, 0x3)], channels=1)
+
+        with patch.object(live_transcription, "_sc_mediafoundation", FAKE_MEDIAFOUNDATION):
+            reader = LoopbackBlockReader(recorder, frames=4)
+            reader.read()
+            reader.read()
+
+        self.assertEqual(reader.discontinuities, 2)
+
+
+class CaptureTimingTests(unittest.TestCase):
+    def test_lag_tracks_wall_clock_ahead_of_delivered_audio(self):
+        timing = CaptureTiming()
+
+        timing.record(0.04, read_ms=40.0, convert_ms=0.5, now=10.04)
+        timing.record(0.04, read_ms=39.0, convert_ms=0.7, now=10.08)
+        timing.record(0.04, read_ms=150.0, convert_ms=0.6, now=10.23)
+
+        summary = timing.summary()
+        self.assertEqual((summary["blocks"], summary["stalls"]), (3, 1))
+        self.assertAlmostEqual(summary["audio_seconds"], 0.12)
+        self.assertAlmostEqual(summary["lag_ms"]["last"], 110.0)
+        self.assertAlmostEqual(summary["lag_ms"]["p50"], 0.0)
+        self.assertAlmostEqual(summary["read_ms"]["max"], 150.0)
+        self.assertAlmostEqual(summary["convert_ms"]["p50"], 0.6)
+        self.assertIn("1 stalls", timing.format_report())
+
+    def test_window_keeps_the_latest_blocks_and_the_all_time_maximum(self):
+        timing = CaptureTiming(window=2)
+
+        for read_ms in (90.0, 10.0, 20.0):
+            timing.record(0.05, read_ms=read_ms)
+
+        self.assertAlmostEqual(timing.summary()["read_ms"]["p99"], 19.9)
+        self.assertEqual(timing.summary()["read_ms"]["max"], 90.0)
+        self.assertNotIn("convert_ms", timing.summary())
+
+
+class PolyphaseResamplerTests(unittest.TestCase):
+    def tone(self, sample_rate, seconds=0.5, frequency=1000, channels=2):
+        t = np.arange(int(sample_rate * seconds)) / sample_rate
+        mono = (0.5 * np.sin(2 * np.pi * frequency * t)).astype(np.float32)
+        return np.repeat(mono[:, None], channels, axis=1)
+
+    def test_native_rates_resample_a_tone_to_24khz_mono(self):
+        for rate in (44100, 48000):
+            with self.subTest(rate=rate):
+                frames = self.tone(rate)
+                resampler = PolyphaseResampler(rate, 24000, channels=2)
+                pcm = np.frombuffer(resampler.process(frames), dtype=np.int16)
+
+                self.assertAlmostEqual(len(pcm), 12000, delta=1)
+                delay = (resampler.up * resampler.taps - 1) / 2 / resampler.down
+                expected = 0.5 * np.sin(2 * np.pi * 1000 * (np.arange(len(pcm)) - delay) / 24000) * 32767
+                self.assertLess(np.abs(pcm[200:-200] - expected[200:-200]).max(), 300)
+
+    def test_block_boundaries_do_not_change_the_output(self):
+        frames = self.tone(44100, frequency=3100)
+        whole = PolyphaseResampler(44100, 24000, channels=2).process(frames)
+
+        resampler = PolyphaseResampler(44100, 24000, channels=2)
+        split = b"".join(resampler.process(frames[start : start + 941]) for start in range(0, len(frames), 941))
+
+        self.assertEqual(split, whole)
+
+    def test_matching_rate_only_downmixes(self):
+        stereo = np.array([[1.0, -1.0], [0.5, 0.5]], dtype=np.float32)
+
+        pcm = PolyphaseResampler(24000, 24000, channels=2).process(stereo)
+
+        self.assertEqual(pcm, float_audio_to_pcm16_bytes(stereo))
+
+
+def level(pcm):
+    return float(np.sqrt(np.mean(np.square(np.frombuffer(pcm, dtype=np.int16), dtype=np.float64))))
+
+
+def process_blocks(stage, pcm, block_samples=CHUNK):
+    return b"".join(stage.process(pcm[start : start + block_samples * 2]) for start in range(0, len(pcm), block_samples * 2))
+
+
+class NoisePreprocessingTests(unittest.TestCase):
+    def noise(self, seconds, rms, seed=4):
+        samples = np.random.default_rng(seed).standard_normal(int(RATE * seconds)) * rms
+        return samples.astype(np.int16).tobytes()
+
+    def test_noise_gate_cuts_stationary_noise_and_keeps_a_tone_above_it(self):
+        noise = np.frombuffer(self.noise(4, 300), dtype=np.int16)
+        tone = (np.sin(2 * np.pi * 440 * np.arange(RATE) / RATE) * 3000).astype(np.int16)
+        mixed = noise.copy()
+        mixed[3 * RATE :] = np.clip(noise[3 * RATE :] + tone.astype(np.int32), -32768, 32767)
+
+        output = process_blocks(SpectralNoiseGate(), mixed.tobytes())
+
+        self.assertEqual(len(output), len(mixed) * 2)
+        noise_out = level(output[2 * RATE * 2 : 3 * RATE * 2])
+        tone_out = level(output[int(3.1 * RATE) * 2 :])
+        self.assertLess(noise_out, 300 * 10 ** (-12 / 20))
+        self.assertGreater(tone_out, level(tone.tobytes()) * 10 ** (-1 / 20))
+
+    def test_noise_gate_handles_blocks_that_are_not_a_multiple_of_the_hop(self):
+        pcm = self.noise(1, 300)
+
+        self.assertEqual(len(process_blocks(SpectralNoiseGate(), pcm, block_samples=1000)), len(pcm))
+
+    def test_agc_lifts_quiet_speech_but_holds_its_gain_through_noise(self):
+        agc = AutomaticGainControl(target_db=20, max_gain_db=20)
+        quiet = pcm_block(600, samples=CHUNK)
+        background = self.noise(CHUNK / RATE, 5)
+
+        for _ in range(10):
+            agc.process(background)
+        for _ in range(200):
+            lifted = agc.process(quiet)
+        gain_db = agc.gain_db
+        for _ in range(20):
+            agc.process(background)
+
+        self.assertAlmostEqual(20 * np.log10(level(lifted) / 32768), -20, delta=1.0)
+        self.assertEqual(agc.gain_db, gain_db)
+        self.assertGreater(agc.get_metrics()["speech_blocks"], 0)
+
+    def test_agc_keeps_the_background_under_the_target(self):
+        agc = AutomaticGainControl(target_db=20, max_gain_db=20)
+        background = self.noise(CHUNK / RATE, 100)
+
+        for _ in range(50):
+            agc.process(background)
+            agc.process(pcm_block(1500, samples=CHUNK))
+
+        self.assertLessEqual(agc.gain_db + agc.floor_db, -20 - AutomaticGainControl.NOISE_HEADROOM_DB + 1e-6)
+
+    def test_agc_never_drives_a_block_past_full_scale(self):
+        agc = AutomaticGainControl(target_db=3, max_gain_db=20)
+        agc.gain_db = 20.0
+        agc.floor_db = -90.0
+
+        output = np.frombuffer(agc.process(pcm_block(20000, samples=CHUNK)), dtype=np.int16)
+
+        self.assertLessEqual(int(np.max(np.abs(output.astype(np.int32)))), 32767)
+        self.assertEqual(agc.get_metrics()["limited_blocks"], 1)
+
+    def test_manager_preprocesses_blocks_before_publishing_them(self):
+        manager = LiveAudioManager()
+        manager.realtime_session = FakeRealtimeSession()
+        manager.realtime_session.running = True
+        manager.silence_gate = None
+        manager.noise_gate = SpectralNoiseGate()
+        manager.agc = AutomaticGainControl()
+
+        block = pcm_block(8000, samples=CHUNK)
+        manager._publish_audio(block)
+
+        self.assertEqual(len(manager.realtime_session.audio_chunks[0]), len(block))
+        self.assertNotEqual(manager.realtime_session.audio_chunks[0], block)
+        preprocess = manager.get_metrics()["preprocess"]
+        self.assertEqual(preprocess["blocks"], 1)
+        self.assertIn("gain_db", preprocess["agc"])
+        self.assertIn("passed_ratio", preprocess["noise_gate"])
+
+
+class SilenceGateTests(unittest.TestCase):
+    def make_gate(self):
+        return SilenceGate(sample_rate=24000, threshold_db=50, hangover_ms=400, preroll_ms=300, keepalive_ms=1000)
+
+    def test_silence_passes_through_the_hangover_then_is_suppressed(self):
+        gate = self.make_gate()
+        self.assertEqual(len(gate.process(pcm_block(8000))), 1)
+
+        passed = [gate.process(pcm_block(0)) for _ in range(60)]
+
+        self.assertTrue(all(len(blocks) == 1 for blocks in passed[:40]))
+        self.assertTrue(all(blocks == [] for blocks in passed[40:]))
+        self.assertEqual(gate.get_metrics()["suppressed_ms"], 200.0)
+
+    def test_speech_onset_flushes_the_preroll_ahead_of_the_speech_block(self):
+        gate = self.make_gate()
+        silence = [pcm_block(0) for _ in range(80)]
+        for block in silence:
+            gate.process(block)
+
+        released = gate.process(pcm_block(8000))
+
+        self.assertEqual(len(released), 31)
+        self.assertEqual(released[-1], pcm_block(8000))
+        self.assertGreaterEqual((len(released) - 1) * 10, 300)
+
+    def test_sustained_silence_sends_periodic_keepalive_blocks(self):
+        gate = self.make_gate()
+        sent = sum(len(gate.process(pcm_block(0))) for _ in range(340))
+
+        self.assertEqual(gate.keepalive_blocks, 3)
+        self.assertEqual(sent, 3)
+
+    def test_speech_right_after_a_keepalive_keeps_block_order_and_a_full_preroll(self):
+        gate = self.make_gate()
+        blocks = []
+        released = []
+        while not gate.keepalive_blocks:
+            blocks.append(np.array([len(blocks) % 40, len(blocks) // 40] + [0] * 238, dtype=np.int16).tobytes())
+            released += gate.process(blocks[-1])
+        blocks.append(pcm_block(8000))
+
+        onset = gate.process(blocks[-1])
+        released += onset
+
+        self.assertEqual(released, [block for block in blocks if block in released])
+        self.assertGreaterEqual((len(onset) - 1) * 10, 300)
+        self.assertEqual(onset[-1], pcm_block(8000))
+
+    def test_manager_publishes_only_gated_blocks(self):
+        manager = LiveAudioManager()
+        manager.realtime_session = FakeRealtimeSession()
+        manager.realtime_session.running = True
+        manager.silence_gate = self.make_gate()
+
+        manager._publish_audio(pcm_block(8000))
+        for _ in range(100):
+            manager._publish_audio(pcm_block(0))
+
+        self.assertEqual(len(manager.realtime_session.audio_chunks), 41)
+        self.assertIn("silence_gate", manager.get_metrics())
+
+    def test_manager_records_captured_blocks_before_preprocessing_and_the_gate(self):
+        scratch = tempfile.TemporaryDirectory()
+        self.addCleanup(scratch.cleanup)
+        manager = LiveAudioManager()
+        manager.realtime_session = FakeRealtimeSession()
+        manager.realtime_session.running = True
+        manager.silence_gate = self.make_gate()
+        manager.agc = types.SimpleNamespace(process=lambda block: (-np.frombuffer(block, dtype=np.int16)).tobytes())
+        manager._start_recorder(scratch.name)
+        path = manager.recorder.path
+        captured = [pcm_block(2000)] + [pcm_block(0)] * 100
+
+        for block in captured:
+            manager._publish_audio(block)
+        manager.stop()
+
+        recorded = [block for _seconds, block in CaptureRecording(path).blocks()]
+        self.assertEqual(recorded, captured)
+        self.assertEqual(manager.realtime_session.audio_chunks[0], manager.agc.process(captured[0]))
+        self.assertLess(len(manager.realtime_session.audio_chunks), len(captured))
+        self.assertIsNone(manager.recorder)
+        self.assertEqual(os.path.dirname(path), scratch.name)
+
+    def test_replaying_a_capture_through_the_manager_reproduces_the_uploaded_blocks(self):
+        scratch = tempfile.TemporaryDirectory()
+        self.addCleanup(scratch.cleanup)
+        live = LiveAudioManager()
+        live.realtime_session = FakeRealtimeSession()
+        live.realtime_session.running = True
+        live.silence_gate = self.make_gate()
+        live._start_recorder(scratch.name)
+        path = live.recorder.path
+        for block in [pcm_block(8000)] * 5 + [pcm_block(0)] * 150 + [pcm_block(8000)] * 5:
+            live._publish_audio(block)
+        live.stop()
+        replay = LiveAudioManager()
+        replay.realtime_session = FakeRealtimeSession()
+        replay.realtime_session.running = True
+        replay.silence_gate = self.make_gate()
+
+        replay_capture(replay._publish_audio, CaptureRecording(path), sleep=lambda _seconds: None)
+
+        self.assertEqual(replay.realtime_session.audio_chunks, live.realtime_session.audio_chunks)
+
+
+class EndOfTurnPredictorTests(unittest.TestCase):
+    def test_predicts_end_after_short_silence_and_reports_resumed_speech(self):
+        predictor = EndOfTurnPredictor(sample_rate=24000, threshold_db=50, predict_ms=150, min_speech_ms=300)
+        signals = [predictor.process(pcm_block(8000)) for _ in range(40)]
+        signals += [predictor.process(pcm_block(0)) for _ in range(20)]
+        signals.append(predictor.process(pcm_block(8000)))
+
+        self.assertEqual([signal for signal in signals if signal], ["end", "resume"])
+        self.assertEqual(signals.index("end"), 40 + 14)
+
+    def test_short_blips_do_not_predict_an_end_of_turn(self):
+        predictor = EndOfTurnPredictor(sample_rate=24000, threshold_db=50, predict_ms=150, min_speech_ms=300)
+        signals = [predictor.process(pcm_block(8000)) for _ in range(5)]
+        signals += [predictor.process(pcm_block(0)) for _ in range(30)]
+
+        self.assertEqual([signal for signal in signals if signal], [])
+
+
 if __name__ == "__main__":
     unittest.main()
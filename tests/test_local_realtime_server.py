@@ -0,0 +1,180 @@
+import threading
+import time
+import unittest
+
+import numpy as np
+
+from azure_realtime import AzureRealtimeAnswerSession, HedgedAnswerCoordinator
+from local_realtime_server import LocalRealtimeServer
+
+
+def tone(ms, amplitude=8000, sample_rate=24000):
+    t = np.arange(int(sample_rate * ms / 1000)) / sample_rate
+    return (np.sin(2 * np.pi * 180 * t) * amplitude).astype(np.int16).tobytes()
+
+
+def silence(ms, sample_rate=24000):
+    return bytes(int(sample_rate * ms / 1000) * 2)
+
+
+def chunks(pcm, chunk_size=1024):
+    for start in range(0, len(pcm), chunk_size * 2):
+        yield pcm[start : start + chunk_size * 2]
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+class LocalRealtimeServerTests(unittest.TestCase):
+    def start_session(self, server, updates, **session_options):
+        lock = threading.Lock()
+
+        def answer_update(action, text):
+            with lock:
+                updates.append((action, text))
+
+        session = AzureRealtimeAnswerSession(
+            answer_update_callback=answer_update,
+            instructions_provider=lambda: "test interview instructions",
+            url=server.url,
+            api_key="local-test",
+            deployment="local-realtime",
+            **session_options,
+        )
+        self.assertTrue(session.start())
+        self.addCleanup(session._thread.join, 5.0)
+        self.addCleanup(session.cleanup)
+        self.assertTrue(wait_for(lambda: session.websocket is not None and session.audio_queue is not None))
+        wait_for(lambda: server.received_counts["session.update"] >= 1)
+        return session
+
+    def test_speech_turn_produces_a_committed_answer_from_the_stand_in(self):
+        updates = []
+        with LocalRealtimeServer(response_delay_ms=0, first_delta_delay_ms=0, delta_interval_ms=0) as server:
+            session = self.start_session(server, updates)
+            session.set_auto_answer_enabled(True)
+            for chunk in chunks(tone(600) + silence(500)):
+                session.add_audio_chunk(chunk)
+
+            self.assertTrue(wait_for(lambda: updates))
+            self.assertEqual(len(server.turns), 1)
+            self.assertIsNotNone(server.turns[0].speech_stopped_at)
+            self.assertIs(server.turn_for_answer(updates[0][1]), server.turns[0])
+
+        self.assertEqual(updates[0][0], "reset")
+        self.assertEqual(server.received_counts["response.create"], 1)
+        self.assertEqual(server.received_counts["conversation.item.create"], 1)
+
+    def test_speculative_answer_is_out_of_band_and_joins_the_conversation_once_confirmed(self):
+        updates = []
+        with LocalRealtimeServer(response_delay_ms=0, first_delta_delay_ms=0, delta_interval_ms=0) as server:
+            session = self.start_session(server, updates, speculative_response=True)
+            session.set_auto_answer_enabled(True)
+            for chunk in chunks(tone(600) + silence(150)):
+                session.add_audio_chunk(chunk)
+            self.assertTrue(wait_for(lambda: session._server_in_speech))
+            session.predict_end_of_turn()
+            self.assertTrue(wait_for(lambda: server.received_counts["response.create"] == 1))
+            for chunk in chunks(silence(500)):
+                session.add_audio_chunk(chunk)
+
+            self.assertTrue(wait_for(lambda: updates))
+            self.assertTrue(wait_for(lambda: server.received_counts["conversation.item.create"] == 2))
+            conversation = list(server.connection_history[0].conversation)
+
+        self.assertEqual(server.received_counts["input_audio_buffer.commit"], 0)
+        self.assertEqual(server.sent_counts["error"], 0)
+        self.assertIs(server.turn_for_answer(updates[0][1]), server.turns[0])
+        self.assertEqual(conversation[0], server.turns[0].item_id)
+        self.assertEqual(len(conversation), 3)
+        self.assertEqual(session.get_metrics()["speculation"]["hits"], 1)
+
+    def test_new_speech_cancels_the_in_flight_stand_in_response(self):
+        updates = []
+        with LocalRealtimeServer(response_delay_ms=300) as server:
+            session = self.start_session(server, updates)
+            session.set_auto_answer_enabled(True)
+            for chunk in chunks(tone(400) + silence(450)):
+                session.add_audio_chunk(chunk)
+            self.assertTrue(wait_for(lambda: server.received_counts["response.create"] == 1))
+            for chunk in chunks(tone(200)):
+                session.add_audio_chunk(chunk)
+
+            self.assertTrue(wait_for(lambda: server.received_counts["response.cancel"] >= 1))
+            time.sleep(0.4)
+
+        self.assertEqual(updates, [])
+        self.assertEqual(len(server.turns), 2)
+
+    def test_long_interview_keeps_the_stand_in_conversation_bounded(self):
+        updates = []
+        with LocalRealtimeServer(response_delay_ms=0, first_delta_delay_ms=0, delta_interval_ms=0) as server:
+            session = self.start_session(server, updates, context_audio_turns=1, context_history_max_tokens=60)
+            session.set_auto_answer_enabled(True)
+            for turn in range(1, 5):
+                for chunk in chunks(tone(300) + silence(450)):
+                    session.add_audio_chunk(chunk)
+                self.assertTrue(wait_for(lambda: len(updates) == turn))
+            self.assertTrue(wait_for(lambda: server.received_counts["conversation.item.delete"] >= 3))
+            time.sleep(0.1)
+            conversation = server.connection_history[0].conversation
+
+        self.assertEqual(server.sent_counts["error"], 0)
+        self.assertEqual(len(server.prompt_tokens), 4)
+        self.assertEqual(set(conversation) & {turn.item_id for turn in server.turns}, {server.turns[-1].item_id})
+        self.assertLessEqual(server.prompt_tokens[-1], server.prompt_tokens[1] + 60)
+
+    def test_hedged_sessions_show_one_answer_per_turn_from_the_faster_deployment(self):
+        updates = []
+        coordinator = HedgedAnswerCoordinator()
+        with (
+            LocalRealtimeServer(response_delay_ms=400) as slow,
+            LocalRealtimeServer(response_delay_ms=0, first_delta_delay_ms=0, delta_interval_ms=0) as fast,
+        ):
+            sessions = [
+                self.start_session(server, updates, answer_gate=coordinator.admit_answer) for server in (slow, fast)
+            ]
+            for session in sessions:
+                coordinator.attach(session)
+                session.set_auto_answer_enabled(True)
+            for turn in range(1, 3):
+                for chunk in chunks(tone(300) + silence(800)):
+                    for session in sessions:
+                        session.add_audio_chunk(chunk)
+                self.assertTrue(wait_for(lambda: len(updates) == turn))
+            self.assertTrue(wait_for(lambda: slow.received_counts["response.cancel"] >= 1))
+            time.sleep(0.5)
+
+        self.assertEqual(len(updates), 2)
+        self.assertEqual(fast.sent_counts["response.done"], 2)
+        deployments = list(coordinator.get_metrics()["deployments"].values())
+        self.assertEqual([stats["wins"] for stats in deployments], [0, 2])
+        self.assertGreaterEqual(slow.received_counts["conversation.item.create"], 4)
+
+    def test_dropped_connection_resumes_audio_on_the_standby_connection(self):
+        updates = []
+        with LocalRealtimeServer() as server:
+            session = self.start_session(server, updates, standby_connection=True)
+            self.assertTrue(wait_for(lambda: session.get_metrics()["connection"]["standby_ready"]))
+            session.add_audio_chunk(silence(50))
+            self.assertTrue(wait_for(lambda: server.received_counts["input_audio_buffer.append"] >= 1))
+
+            self.assertEqual(server.drop_connections(limit=1), 1)
+            self.assertTrue(wait_for(lambda: session.get_metrics()["connection"]["standby_promotions"] == 1))
+            session.add_audio_chunk(silence(50))
+
+            self.assertTrue(wait_for(lambda: server.connection_history[1].first_audio_at is not None))
+            self.assertTrue(wait_for(lambda: session.get_metrics()["connection"]["standby_ready"]))
+
+        self.assertEqual(server.connection_count, 3)
+        self.assertEqual(server.received_counts["session.update"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -58,6 +58,7 @@ class OverlayHarness:
         self.current_manual_mode = ""
         self.show_interviewer_suggestions = show_auto
         self.last_suggested_answer = ""
+        self.answer_preview = None
         self.code_overlay_values = []
         self.code_overlay_modes = []
         self.code_overlay_cleared = False
@@ -146,6 +147,35 @@ class OverlaySingleAnswerTests(unittest.TestCase):
         self.assertEqual(overlay.current_answer, "Existing answer.\n\nOnly this sentence is new.")
         self.assertEqual(overlay.current_answer.count("Existing answer."), 1)
 
+    def test_streaming_preview_is_provisional_until_the_update_commits(self):
+        overlay = OverlayHarness(show_auto=True)
+        overlay.current_answer = "Existing answer."
+
+        DraggableOverlay.show_realtime_answer_preview(overlay, "append", "For invalidation, I")
+
+        preview_html = overlay.update_conversation_signal.values[-1]
+        self.assertIn("Existing answer.", preview_html)
+        self.assertIn("font-style: italic", preview_html)
+        self.assertEqual(overlay.current_answer, "Existing answer.")
+
+        DraggableOverlay.apply_realtime_answer_update(overlay, "append", "For invalidation, I would use TTLs.")
+
+        self.assertIsNone(overlay.answer_preview)
+        self.assertNotIn("font-style: italic", overlay.update_conversation_signal.values[-1])
+        self.assertEqual(overlay.current_answer, "Existing answer.\n\nFor invalidation, I would use TTLs.")
+
+    def test_discarded_preview_restores_the_committed_answer(self):
+        overlay = OverlayHarness(show_auto=True)
+        overlay.current_answer = "Existing answer."
+
+        DraggableOverlay.show_realtime_answer_preview(overlay, "reset", "A new")
+        self.assertNotIn("Existing answer.", overlay.update_conversation_signal.values[-1])
+        DraggableOverlay.clear_realtime_answer_preview(overlay)
+
+        self.assertIsNone(overlay.answer_preview)
+        self.assertIn("Existing answer.", overlay.update_conversation_signal.values[-1])
+        self.assertNotIn("A new", overlay.update_conversation_signal.values[-1])
+
     def test_auto_answer_disabled_ignores_realtime_update(self):
         overlay = OverlayHarness(show_auto=False)
         overlay.current_answer = "Existing manual answer."